@@ -0,0 +1,32 @@
+"""Add rendered subsets to view renders
+
+Revision ID: 1445cf7fc479
+Revises: f5ad1029c3ca
+Create Date: 2026-10-18 15:34:52.206481
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "1445cf7fc479"
+down_revision = "f5ad1029c3ca"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "view_render",
+        sa.Column("subset", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema="gerrydb",
+    )
+
+
+def downgrade() -> None:
+    # Subset renders can't be told apart from full renders without the column.
+    op.execute("DELETE FROM gerrydb.view_render WHERE subset IS NOT NULL")
+    op.drop_column("view_render", "subset", schema="gerrydb")
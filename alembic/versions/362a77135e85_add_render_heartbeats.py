@@ -0,0 +1,39 @@
+"""Add worker heartbeats to view and graph renders
+
+Revision ID: 362a77135e85
+Revises: 4e0aaf664a64
+Create Date: 2026-10-18 14:37:51.402816
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "362a77135e85"
+down_revision = "4e0aaf664a64"
+branch_labels = None
+depends_on = None
+
+RENDER_TABLES = ("view_render", "graph_render")
+
+
+def upgrade() -> None:
+    for table in RENDER_TABLES:
+        op.add_column(
+            table,
+            sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True),
+            schema="gerrydb",
+        )
+        op.add_column(
+            table,
+            sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+            schema="gerrydb",
+        )
+
+
+def downgrade() -> None:
+    for table in RENDER_TABLES:
+        op.drop_column(table, "attempts", schema="gerrydb")
+        op.drop_column(table, "heartbeat_at", schema="gerrydb")
@@ -0,0 +1,86 @@
+"""Add render job queue columns to view and graph renders
+
+Revision ID: 4e0aaf664a64
+Revises: 3e14966c308e
+Create Date: 2026-10-18 09:12:05.114023
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4e0aaf664a64"
+down_revision = "3e14966c308e"
+branch_labels = None
+depends_on = None
+
+RENDER_TABLES = ("view_render", "graph_render")
+
+
+def upgrade() -> None:
+    # `graph_render` predates migrations for graphs in some deployments.
+    if not sa.inspect(op.get_bind()).has_table("graph_render", schema="gerrydb"):
+        op.create_table(
+            "graph_render",
+            sa.Column("render_id", sa.UUID(), nullable=False),
+            sa.Column("graph_id", sa.Integer(), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.text("now()"),
+                nullable=False,
+            ),
+            sa.Column("created_by", sa.Integer(), nullable=False),
+            sa.Column("path", sa.Text(), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum(
+                    "PENDING",
+                    "RUNNING",
+                    "FAILED",
+                    "SUCCEEDED",
+                    name="graphrenderstatus",
+                ),
+                nullable=False,
+            ),
+            sa.ForeignKeyConstraint(
+                ["created_by"],
+                ["gerrydb.user.user_id"],
+            ),
+            sa.ForeignKeyConstraint(
+                ["graph_id"],
+                ["gerrydb.graph.graph_id"],
+            ),
+            sa.PrimaryKeyConstraint("render_id"),
+            schema="gerrydb",
+        )
+
+    for table in RENDER_TABLES:
+        op.alter_column(
+            table, "path", existing_type=sa.Text(), nullable=True, schema="gerrydb"
+        )
+        op.add_column(
+            table, sa.Column("error", sa.Text(), nullable=True), schema="gerrydb"
+        )
+        op.create_index(
+            op.f(f"ix_gerrydb_{table}_status"),
+            table,
+            ["status"],
+            unique=False,
+            schema="gerrydb",
+        )
+
+
+def downgrade() -> None:
+    for table in RENDER_TABLES:
+        op.drop_index(
+            op.f(f"ix_gerrydb_{table}_status"), table_name=table, schema="gerrydb"
+        )
+        op.drop_column(table, "error", schema="gerrydb")
+        # Unfinished renders have no path.
+        op.execute(f"DELETE FROM gerrydb.{table} WHERE path IS NULL")
+        op.alter_column(
+            table, "path", existing_type=sa.Text(), nullable=False, schema="gerrydb"
+        )
@@ -0,0 +1,30 @@
+"""Add manifests to view renders
+
+Revision ID: 78eec0a96df1
+Revises: 362a77135e85
+Create Date: 2026-10-18 15:02:44.817530
+
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "78eec0a96df1"
+down_revision = "362a77135e85"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "view_render",
+        sa.Column("manifest", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        schema="gerrydb",
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("view_render", "manifest", schema="gerrydb")
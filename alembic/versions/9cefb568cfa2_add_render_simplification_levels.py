@@ -0,0 +1,44 @@
+"""Add simplification levels to view and graph renders
+
+Revision ID: 9cefb568cfa2
+Revises: 1445cf7fc479
+Create Date: 2026-10-18 15:48:30.661094
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9cefb568cfa2"
+down_revision = "1445cf7fc479"
+branch_labels = None
+depends_on = None
+
+RENDER_TABLES = ("view_render", "graph_render")
+
+simplify_level = sa.Enum("FULL", "MEDIUM", "COARSE", name="simplifylevel")
+
+
+def upgrade() -> None:
+    simplify_level.create(op.get_bind(), checkfirst=True)
+    for table in RENDER_TABLES:
+        # Existing renders are of full geometries.
+        op.add_column(
+            table,
+            sa.Column(
+                "simplify", simplify_level, server_default="FULL", nullable=False
+            ),
+            schema="gerrydb",
+        )
+        op.alter_column(table, "simplify", server_default=None, schema="gerrydb")
+
+
+def downgrade() -> None:
+    for table in RENDER_TABLES:
+        # Simplified renders can't be told apart from full renders without
+        # the column.
+        op.execute(f"DELETE FROM gerrydb.{table} WHERE simplify != 'FULL'")
+        op.drop_column(table, "simplify", schema="gerrydb")
+    simplify_level.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,54 @@
+"""Add simplified GeoBin geometries
+
+Revision ID: c3f1d7a92b64
+Revises: 9cefb568cfa2
+Create Date: 2026-10-18 17:02:41.208417
+
+"""
+
+import geoalchemy2
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c3f1d7a92b64"
+down_revision = "9cefb568cfa2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "geo_bin_simplified",
+        sa.Column("geo_bin_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "level",
+            # Created with the `simplify` columns of renders.
+            postgresql.ENUM(
+                "FULL", "MEDIUM", "COARSE", name="simplifylevel", create_type=False
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "geography",
+            geoalchemy2.types.Geography(
+                srid=4269,
+                from_text="ST_GeogFromText",
+                name="geography",
+                spatial_index=False,
+            ),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(
+            ["geo_bin_id"],
+            ["gerrydb.geo_bin.geo_bin_id"],
+        ),
+        sa.PrimaryKeyConstraint("geo_bin_id", "level"),
+        schema="gerrydb",
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("geo_bin_simplified", schema="gerrydb")
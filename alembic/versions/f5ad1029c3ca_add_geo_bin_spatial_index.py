@@ -0,0 +1,35 @@
+"""Add a spatial index on GeoBin geographies for vector tiles
+
+Revision ID: f5ad1029c3ca
+Revises: 78eec0a96df1
+Create Date: 2026-10-18 15:21:09.573162
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f5ad1029c3ca"
+down_revision = "78eec0a96df1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_geo_bin_geography",
+        "geo_bin",
+        ["geography"],
+        unique=False,
+        schema="gerrydb",
+        postgresql_using="gist",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "idx_geo_bin_geography",
+        table_name="geo_bin",
+        schema="gerrydb",
+        postgresql_using="gist",
+    )
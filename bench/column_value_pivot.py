@@ -0,0 +1,178 @@
+"""Benchmarks pivoting column values into one row per geography.
+
+Compares the partition joins used by view renders (`_with_column_values()`,
+which left-joins each column's `column_value_<col_id>` partition on
+`geo_id`) with the `GROUP BY` pivot they replaced (one `max() FILTER`
+aggregate per column over the whole `column_value` table, joined to the
+geographies on their paths).
+
+Creates `--geographies` synthetic geographies and, for each of `--columns`,
+that many floating-point columns with a value for every geography, times
+both queries, checks that they return the same rows, then rolls back, so
+the database is left unchanged. Expects the `GERRYDB_DATABASE_URI`
+environment variable to be set to a PostgreSQL connection string with an
+initialized schema:
+
+    python -m bench.column_value_pivot --geographies 100000 --columns 10,100,1000
+"""
+
+# pragma: no cover
+import time
+import uuid
+
+import click
+from sqlalchemy import func, or_, select, text
+from sqlalchemy.sql import column
+
+from gerrydb_meta import crud, models, schemas
+from gerrydb_meta.crud.column import COLUMN_TYPE_TO_VALUE_COLUMN
+from gerrydb_meta.crud.view import _with_column_values
+from gerrydb_meta.db import Session
+from gerrydb_meta.enums import ColumnKind, ColumnType
+
+
+def _group_by_column_value_pivot(at, columns):
+    """The `GROUP BY` pivot previously used by `CRView.render()`."""
+    agg_selects = []
+    col_ids = []
+    for col in columns.values():
+        agg_selects.append(
+            func.max(column(COLUMN_TYPE_TO_VALUE_COLUMN[col.type]))
+            .filter(models.ColumnValue.col_id == col.col_id)
+            .label(col.canonical_ref.path)
+        )
+        col_ids.append(col.col_id)
+
+    return (
+        select(models.Geography.path, *agg_selects)
+        .select_from(models.ColumnValue)
+        .join(models.Geography, models.ColumnValue.geo_id == models.Geography.geo_id)
+        .where(
+            models.ColumnValue.col_id.in_(col_ids),
+            models.ColumnValue.valid_from <= at,
+            or_(
+                models.ColumnValue.valid_to.is_(None),
+                models.ColumnValue.valid_to >= at,
+            ),
+        )
+        .group_by(models.Geography.path)
+    )
+
+
+def _run(num_geos: int, num_columns: int) -> dict[str, float]:
+    """Times both pivots over synthetic columns, then rolls back."""
+    with Session() as db:
+        user = models.User(
+            email=f"bench-{uuid.uuid4().hex}@example.com", name="Benchmark"
+        )
+        db.add(user)
+        db.flush()
+        meta = models.ObjectMeta(
+            notes="column value pivot benchmark", created_by=user.user_id
+        )
+        db.add(meta)
+        db.flush()
+        namespace, _ = crud.namespace.create(
+            db=db,
+            obj_in=schemas.NamespaceCreate(
+                path=f"bench_{uuid.uuid4().hex[:16]}",
+                description="Column value pivot benchmark",
+                public=False,
+            ),
+            obj_meta=meta,
+        )
+        db.execute(
+            text(
+                "INSERT INTO gerrydb.geography (path, namespace_id, meta_id) "
+                "SELECT 'block_' || idx, :namespace_id, :meta_id "
+                "FROM generate_series(1, :num_geos) AS idx"
+            ),
+            {
+                "namespace_id": namespace.namespace_id,
+                "meta_id": meta.meta_id,
+                "num_geos": num_geos,
+            },
+        )
+        columns = {}
+        for idx in range(num_columns):
+            col, _ = crud.column.create(
+                db=db,
+                obj_in=schemas.ColumnCreate(
+                    canonical_path=f"col_{idx}",
+                    description=f"Benchmark column {idx}",
+                    kind=ColumnKind.COUNT,
+                    type=ColumnType.FLOAT,
+                ),
+                obj_meta=meta,
+                namespace=namespace,
+            )
+            columns[f"col_{idx}"] = col
+        db.execute(
+            text(
+                "INSERT INTO gerrydb.column_value "
+                "(col_id, geo_id, meta_id, valid_from, val_float) "
+                "SELECT col_id, geo_id, :meta_id, now(), geo_id * col_id "
+                "FROM unnest(CAST(:col_ids AS integer[])) AS col_id "
+                "CROSS JOIN gerrydb.geography WHERE namespace_id = :namespace_id"
+            ),
+            {
+                "meta_id": meta.meta_id,
+                "namespace_id": namespace.namespace_id,
+                "col_ids": [col.col_id for col in columns.values()],
+            },
+        )
+        db.execute(text("ANALYZE gerrydb.column_value"))
+        at = db.execute(select(func.now())).scalar()
+
+        geographies = select(models.Geography.path).where(
+            models.Geography.namespace_id == namespace.namespace_id
+        )
+        pivot = _group_by_column_value_pivot(at, columns).subquery("column_value")
+        queries = {
+            "group_by": geographies.add_columns(
+                *(pivot.c[alias] for alias in columns)
+            ).join(pivot, pivot.c.path == models.Geography.path),
+            "partition_joins": _with_column_values(
+                geographies, models.Geography.geo_id, at, columns
+            ),
+        }
+
+        timings = {}
+        results = {}
+        for name, query in queries.items():
+            start = time.perf_counter()
+            results[name] = sorted(tuple(row) for row in db.execute(query))
+            timings[name] = time.perf_counter() - start
+        db.rollback()
+
+    if len(results["partition_joins"]) != num_geos:
+        raise click.ClickException(
+            f"Partition joins returned {len(results['partition_joins'])} rows "
+            f"for {num_geos} geographies."
+        )
+    if results["partition_joins"] != results["group_by"]:
+        raise click.ClickException("Pivots returned different rows.")
+    return timings
+
+
+@click.command()
+@click.option("--geographies", default=100_000, show_default=True)
+@click.option(
+    "--columns",
+    default="10,100,1000",
+    show_default=True,
+    help="Comma-separated numbers of columns to pivot.",
+)
+def main(geographies: int, columns: str):
+    """Times the column value pivot with partition joins and with `GROUP BY`."""
+    click.echo(f"{'geographies':>12} {'columns':>8} {'group_by':>10} {'joins':>10}")
+    for num_columns in (int(count) for count in columns.split(",")):
+        timings = _run(geographies, num_columns)
+        click.echo(
+            f"{geographies:>12} {num_columns:>8} "
+            f"{timings['group_by']:>10.2f} {timings['partition_joins']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmarks GeoBin lookups by geometry hash.
+
+Compares the lookup used to find existing GeoBins during geography imports
+(`_geo_bin_lookup()`, a `bytea` join against `unnest()`) with the previous
+lookup, which compared hex-encoded hashes and so could not use the index on
+`geo_bin.geometry_hash`.
+
+Pads `geo_bin` with synthetic GeoBins (small squares on a grid) until it has
+at least `--rows` rows, looks up `--lookups` hashes (half of them present),
+prints each query's plan and timing, then rolls back, so the database is left
+unchanged. Expects the `GERRYDB_DATABASE_URI` environment variable to be set
+to a PostgreSQL connection string with an initialized schema:
+
+    python -m bench.geo_bin_lookup --rows 10000000
+"""
+
+# pragma: no cover
+import hashlib
+import time
+
+import click
+from sqlalchemy import func, select, text
+
+from gerrydb_meta import models
+from gerrydb_meta.crud.geography import _geo_bin_lookup
+from gerrydb_meta.db import Session
+
+_FILL_SQL = """
+INSERT INTO gerrydb.geo_bin (geography, internal_point)
+SELECT
+    ST_MakeEnvelope(x, y, x + 0.001, y + 0.001, 4269)::geography,
+    ST_SetSRID(ST_MakePoint(x + 0.0005, y + 0.0005), 4269)::geography
+FROM (
+    SELECT
+        -170 + (idx % 340000) * 0.001 AS x,
+        -80 + (idx / 340000) * 0.001 AS y
+    FROM generate_series(CAST(:start AS bigint), CAST(:stop AS bigint) - 1) AS idx
+) AS grid
+"""
+
+
+def _explain(db, stmt) -> tuple[float, str]:
+    """Runs `EXPLAIN ANALYZE` on a query, returning its time and plan."""
+    conn = db.connection()
+    compiled = stmt.compile(
+        dialect=conn.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    start = time.perf_counter()
+    plan = "\n".join(
+        row[0]
+        for row in conn.exec_driver_sql(
+            f"EXPLAIN ANALYZE {compiled.string}", compiled.params
+        )
+    )
+    return time.perf_counter() - start, plan
+
+
+@click.command()
+@click.option("--rows", default=10_000_000, show_default=True)
+@click.option("--lookups", default=2_000, show_default=True)
+@click.option("--fill-batch", default=1_000_000, show_default=True)
+def main(rows: int, lookups: int, fill_batch: int):
+    """Times GeoBin hash lookups against a large `geo_bin` table."""
+    with Session() as db:
+        num_bins = db.scalar(select(func.count()).select_from(models.GeoBin))
+        # Offset the grid by the existing row count to avoid (most) existing
+        # geometries; duplicates would violate the unique hash constraint.
+        for start in range(num_bins, rows, fill_batch):
+            db.execute(
+                text(_FILL_SQL),
+                {"start": start, "stop": min(start + fill_batch, rows)},
+            )
+            click.echo(f"Filled geo_bin to {min(start + fill_batch, rows)} rows.")
+        db.execute(text("ANALYZE gerrydb.geo_bin"))
+
+        present = [
+            bytes(hsh)
+            for hsh in db.scalars(
+                select(models.GeoBin.geometry_hash)
+                .order_by(func.random())
+                .limit(lookups // 2)
+            )
+        ]
+        missing = [
+            hashlib.md5(f"missing-{idx}".encode()).digest()
+            for idx in range(lookups - len(present))
+        ]
+        hashes = present + missing
+
+        hex_lookup = select(
+            models.GeoBin.geo_bin_id,
+            func.encode(models.GeoBin.geometry_hash, "hex"),
+        ).where(
+            func.encode(models.GeoBin.geometry_hash, "hex").in_(
+                [hsh.hex() for hsh in hashes]
+            )
+        )
+        for name, stmt in (
+            ("encode() IN", hex_lookup),
+            ("unnest() join", _geo_bin_lookup(hashes)),
+        ):
+            elapsed, plan = _explain(db, stmt)
+            click.echo(f"\n{name}: {elapsed:.3f}s for {len(hashes)} hashes\n{plan}")
+        db.rollback()
+
+
+if __name__ == "__main__":
+    main()
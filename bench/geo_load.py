@@ -0,0 +1,133 @@
+"""Benchmarks bulk geography loading: per-row inserts vs. `COPY` staging.
+
+Loads synthetic geographies (a grid of unit squares with internal points)
+into a scratch namespace with each loading path, then rolls back, so the
+database is left unchanged:
+
+  * `create_bulk`: `CRGeography.create_bulk()` with every geography at once
+    (the regular `POST /geographies/{namespace}` endpoint).
+  * `stream`: `CRGeography.create_bulk_stream()` in batches (the
+    `/geographies/{namespace}/stream` endpoint).
+  * `copy`: `CRGeography.copy_bulk()` in batches (the same endpoint with
+    `?bulk_load=true`).
+
+Expects the `GERRYDB_DATABASE_URI` environment variable to be set to a
+PostgreSQL connection string with an initialized schema:
+
+    python -m bench.geo_load --sizes 10000,100000,1000000
+"""
+
+# pragma: no cover
+import time
+import uuid
+from typing import Iterator
+
+import click
+import numpy as np
+import shapely
+
+from gerrydb_meta import crud, models, schemas
+from gerrydb_meta.db import Session
+
+MODES = ("create_bulk", "stream", "copy")
+
+
+def _batches(
+    num_geos: int, batch_size: int, offset: float
+) -> Iterator[list[schemas.GeographyCreate]]:
+    """Generates a grid of unit squares (shifted by `offset` degrees)."""
+    width = int(np.ceil(np.sqrt(num_geos)))
+    # Keep the grid within valid coordinates for geographies.
+    scale = min(1.0, 80 / width)
+    for start in range(0, num_geos, batch_size):
+        idx = np.arange(start, min(start + batch_size, num_geos))
+        x = (idx % width) * scale - 90 + offset
+        y = (idx // width) * scale - 40
+        geographies = shapely.to_wkb(
+            shapely.box(x, y, x + scale, y + scale), byte_order=1
+        )
+        points = shapely.to_wkb(
+            shapely.points(x + scale / 2, y + scale / 2), byte_order=1
+        )
+        yield [
+            schemas.GeographyCreate(
+                path=f"geo_{geo_idx}", geography=geography, internal_point=point
+            )
+            for geo_idx, geography, point in zip(idx, geographies, points)
+        ]
+
+
+def _run(mode: str, num_geos: int, batch_size: int) -> float:
+    """Loads `num_geos` geographies with a loading path, then rolls back."""
+    with Session() as db:
+        user = models.User(
+            email=f"bench-{uuid.uuid4().hex}@example.com", name="Benchmark"
+        )
+        db.add(user)
+        db.flush()
+        meta = models.ObjectMeta(notes="bulk load benchmark", created_by=user.user_id)
+        db.add(meta)
+        db.flush()
+        namespace, _ = crud.namespace.create(
+            db=db,
+            obj_in=schemas.NamespaceCreate(
+                path=f"bench_{uuid.uuid4().hex[:16]}",
+                description="Bulk load benchmark",
+                public=False,
+            ),
+            obj_meta=meta,
+        )
+        geo_import, _ = crud.geo_import.create(
+            db=db, obj_meta=meta, namespace=namespace
+        )
+        # Offset each run's grid so no geometries are shared with
+        # earlier (uncommitted) runs.
+        batches = _batches(num_geos, batch_size, offset=MODES.index(mode) * 0.25)
+        kwargs = dict(obj_meta=meta, geo_import=geo_import, namespace=namespace)
+
+        start = time.perf_counter()
+        if mode == "create_bulk":
+            crud.geography.create_bulk(
+                db=db,
+                objs_in=[obj for batch in batches for obj in batch],
+                **kwargs,
+            )
+        elif mode == "stream":
+            crud.geography.create_bulk_stream(db=db, batches=batches, **kwargs)
+        else:
+            crud.geography.copy_bulk(db=db, batches=batches, **kwargs)
+        elapsed = time.perf_counter() - start
+        db.rollback()
+    return elapsed
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default="10000,100000,1000000",
+    show_default=True,
+    help="Comma-separated numbers of geographies to load.",
+)
+@click.option(
+    "--modes",
+    default=",".join(MODES),
+    show_default=True,
+    help="Comma-separated loading paths to benchmark.",
+)
+@click.option("--batch-size", default=2_000, show_default=True)
+def main(sizes: str, modes: str, batch_size: int):
+    """Times each bulk geography loading path."""
+    click.echo(f"{'geographies':>12} {'mode':>12} {'seconds':>10} {'geos/s':>10}")
+    for num_geos in (int(size) for size in sizes.split(",")):
+        for mode in modes.split(","):
+            if mode not in MODES:
+                raise click.BadParameter(f'Unknown mode "{mode}".')
+            elapsed = _run(mode, num_geos, batch_size)
+            click.echo(
+                f"{num_geos:>12} {mode:>12} {elapsed:>10.2f} "
+                f"{num_geos / elapsed:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Admission control for synchronous view and graph renders.
+
+Each render runs `ogr2ogr` (or a native export) and holds database
+connections for as long as it takes, so a burst of render requests can
+exhaust Postgres connections and memory. Synchronous renders are admitted
+only while there is room under two limits:
+
+  * `GERRYDB_RENDER_WORKER_LIMIT`: renders in progress in each API server
+    process (i.e. per gunicorn worker).
+  * `GERRYDB_RENDER_HOST_LIMIT`: renders in progress across all API server
+    processes on the host. Host-wide slots are lock files in
+    `GERRYDB_RENDER_SLOT_DIR`, held with `flock()` for the duration of a
+    render; the operating system releases them if a process dies.
+
+A limit of 0 (the default) disables it. Refused renders raise a
+`RenderLimitError`, which is served as `429 Too Many Requests` with a
+`Retry-After` header of `GERRYDB_RENDER_RETRY_AFTER` seconds. Background
+renders (`?background=true`) are never refused: they wait in the job queue,
+which is drained by a fixed number of render workers.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+from gerrydb_meta.exceptions import RenderLimitError
+
+DEFAULT_RENDER_SLOT_DIR = Path(tempfile.gettempdir()) / "gerrydb-render-slots"
+DEFAULT_RENDER_RETRY_AFTER = 30  # seconds
+
+
+class RenderTicket:
+    """An admitted render, which holds its slot until released."""
+
+    def __init__(self, admission: "RenderAdmission", slot_fd: int | None):
+        self._admission = admission
+        self._slot_fd = slot_fd
+        self._released = False
+
+    def release(self) -> None:
+        """Frees the render's slot. Releasing a ticket twice is a no-op."""
+        if self._released:
+            return
+        self._released = True
+        if self._slot_fd is not None:
+            os.close(self._slot_fd)  # also releases the lock.
+        self._admission._finish()
+
+
+class RenderAdmission:
+    """Limits the number of renders in progress in a process and on a host.
+
+    Counters are cumulative for the lifetime of the process (i.e. per worker),
+    like `gerrydb_meta.db.PoolStats`.
+    """
+
+    def __init__(
+        self,
+        *,
+        worker_limit: int = 0,
+        host_limit: int = 0,
+        slot_dir: Path | str = DEFAULT_RENDER_SLOT_DIR,
+        retry_after: int = DEFAULT_RENDER_RETRY_AFTER,
+    ):
+        self.worker_limit = worker_limit
+        self.host_limit = host_limit
+        self.slot_dir = Path(slot_dir)
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    def _refuse(self, message: str) -> RenderLimitError:
+        with self._lock:
+            self.rejected += 1
+        return RenderLimitError(
+            f"{message} Retry after {self.retry_after} seconds, or request a "
+            "background render with `?background=true`.",
+            retry_after=self.retry_after,
+        )
+
+    def _acquire_host_slot(self) -> int | None:
+        """Locks a free host-wide render slot, returning its file descriptor."""
+        import fcntl
+
+        self.slot_dir.mkdir(parents=True, exist_ok=True)
+        for slot in range(self.host_limit):
+            fd = os.open(self.slot_dir / f"slot-{slot}.lock", os.O_RDWR | os.O_CREAT)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            return fd
+        return None
+
+    def _finish(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def acquire(self) -> RenderTicket:
+        """Admits a render, which must be released when it finishes.
+
+        Raises:
+            RenderLimitError: Too many renders are in progress.
+        """
+        with self._lock:
+            refused = 0 < self.worker_limit <= self.in_flight
+            if not refused:
+                self.in_flight += 1
+        if refused:
+            raise self._refuse(
+                f"Too many renders in progress (limit {self.worker_limit} "
+                "per worker)."
+            )
+
+        slot_fd = None
+        if self.host_limit > 0:
+            try:
+                slot_fd = self._acquire_host_slot()
+            except BaseException:  # pragma: no cover
+                self._finish()
+                raise
+            if slot_fd is None:
+                self._finish()
+                raise self._refuse(
+                    f"Too many renders in progress (limit {self.host_limit} "
+                    "per host)."
+                )
+
+        with self._lock:
+            self.admitted += 1
+        return RenderTicket(self, slot_fd)
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """Runs a block as an admitted render (see `acquire()`)."""
+        ticket = self.acquire()
+        try:
+            yield
+        finally:
+            ticket.release()
+
+    def snapshot(self) -> dict[str, int]:
+        """Returns current admission counters and limits."""
+        with self._lock:
+            return {
+                "worker_limit": self.worker_limit,
+                "host_limit": self.host_limit,
+                "in_flight": self.in_flight,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+            }
+
+
+def release_after(chunks: Iterator[bytes], ticket: RenderTicket) -> Iterator[bytes]:
+    """Holds a render's slot until a streamed response is finished."""
+    try:
+        yield from chunks
+    finally:
+        ticket.release()
+
+
+@lru_cache(maxsize=None)
+def render_admission() -> RenderAdmission:
+    """Loads the process-wide render admission limits from the environment."""
+    return RenderAdmission(
+        worker_limit=int(os.environ.get("GERRYDB_RENDER_WORKER_LIMIT", 0)),
+        host_limit=int(os.environ.get("GERRYDB_RENDER_HOST_LIMIT", 0)),
+        slot_dir=os.environ.get("GERRYDB_RENDER_SLOT_DIR", DEFAULT_RENDER_SLOT_DIR),
+        retry_after=int(
+            os.environ.get("GERRYDB_RENDER_RETRY_AFTER", DEFAULT_RENDER_RETRY_AFTER)
+        ),
+    )
@@ -13,6 +13,7 @@ from gerrydb_meta.api import (
     namespace,
     obj_meta,
     plan,
+    render,
     view,
     view_template,
 )
@@ -33,6 +34,9 @@ api_router.include_router(
     geo_import.router, prefix="/geo-imports", tags=["geo-imports"]
 )
 api_router.include_router(column_value.router, prefix="/columns", tags=["columns"])
+api_router.include_router(
+    column_value.columnar_router, prefix="/__column_values", tags=["columns"]
+)
 api_router.include_router(geo_set.router, prefix="/layers", tags=["layers"])
 api_router.include_router(plan.router, prefix="/plans", tags=["plans"])
 api_router.include_router(view.router, prefix="/views", tags=["views"])
@@ -40,6 +44,7 @@ api_router.include_router(
     view_template.router, prefix="/view-templates", tags=["view-templates"]
 )
 api_router.include_router(graph.router, prefix="/graphs", tags=["graphs"])
+api_router.include_router(render.router, prefix=render.RENDERS_PREFIX, tags=["renders"])
 
 
 api_router.include_router(
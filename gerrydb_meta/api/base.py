@@ -4,10 +4,12 @@ import inspect
 from collections import defaultdict
 from dataclasses import dataclass
 from http import HTTPStatus
-from typing import Any, Callable, Type
+from typing import Any, Callable, Iterable, Iterator, Type
 from uuid import UUID
 
+import anyio
 import ormsgpack as msgpack
+from msgpack import OutOfData, Unpacker
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from fastapi.routing import APIRoute
 from pydantic import BaseModel
@@ -18,6 +20,7 @@ from gerrydb_meta.api.deps import get_db, get_obj_meta, get_scopes, no_perms
 from gerrydb_meta.crud.base import normalize_path
 from gerrydb_meta.exceptions import GerryValueError
 from gerrydb_meta.scopes import ScopeManager
+from gerrydb_meta.tiles import MVT_MEDIA_TYPE, Tile
 from uvicorn.config import logger as log
 
 
@@ -62,6 +65,14 @@ def add_etag(response: Response, etag: UUID | None) -> None:
         response.headers["ETag"] = f'"{etag}"'
 
 
+def tile_response(tile: Tile, if_none_match: str | None) -> Response:
+    """Serves a vector tile, or 304 Not Modified if the client has it already."""
+    headers = {"ETag": f'"{tile.key}"'}
+    if if_none_match is not None and f'"{tile.key}"' in if_none_match:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+    return Response(content=tile.data, media_type=MVT_MEDIA_TYPE, headers=headers)
+
+
 def namespace_read_error_msg(obj_name: str) -> str:
     """Generates an error message for a failed read in a namespace."""
     return (
@@ -387,6 +398,63 @@ class MsgpackRequest(Request):
         return self._body
 
 
+def request_chunks(request: Request) -> Iterator[bytes]:
+    """Reads a request body incrementally from a synchronous endpoint.
+
+    Synchronous endpoints run in a worker thread, so each chunk of the body
+    is awaited on the event loop with `anyio.from_thread.run()`.
+    """
+    stream = request.stream()
+    while True:
+        try:
+            yield anyio.from_thread.run(stream.__anext__)
+        except StopAsyncIteration:
+            return
+
+
+def msgpack_array_batches(
+    chunks: Iterable[bytes], batch_size: int
+) -> Iterator[list[Any]]:
+    """Decodes a MessagePack array incrementally, in batches of items.
+
+    Only the current batch and the bytes of the item being decoded are held
+    in memory, so memory use depends on `batch_size` rather than on the size
+    of the array.
+
+    Raises:
+        ValueError: The data is not a single valid MessagePack array.
+    """
+    unpacker = Unpacker(raw=False)
+    chunks = iter(chunks)
+    num_bytes = 0
+
+    def read(unpack: Callable[[], Any]) -> Any:
+        nonlocal num_bytes
+        while True:
+            try:
+                return unpack()
+            except OutOfData:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    raise ValueError("MessagePack data is truncated.")
+                num_bytes += len(chunk)
+                unpacker.feed(chunk)
+
+    num_items = read(unpacker.read_array_header)
+    batch = []
+    for _ in range(num_items):
+        batch.append(read(unpacker.unpack))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+    num_bytes += sum(len(chunk) for chunk in chunks)
+    if num_bytes != unpacker.tell():
+        raise ValueError("Unexpected data after MessagePack array.")
+
+
 # see https://fastapi.tiangolo.com/advanced/custom-response/
 class MsgpackResponse(Response):
     """A request with a MessagePack-encoded body."""
@@ -6,13 +6,50 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from gerrydb_meta import crud, models, schemas
-from gerrydb_meta.api.base import geos_from_paths, namespace_write_error_msg
+from gerrydb_meta.api.base import (
+    MsgpackRoute,
+    geos_from_paths,
+    namespace_write_error_msg,
+)
 from gerrydb_meta.api.deps import get_db, get_obj_meta, get_scopes
 from gerrydb_meta.crud.base import normalize_path
 from gerrydb_meta.scopes import ScopeManager
 from uvicorn.config import logger as log
 
 router = APIRouter()
+columnar_router = APIRouter(route_class=MsgpackRoute)
+
+
+def _columns_with_write(
+    db: Session, namespace: str, paths: list[str], scopes: ScopeManager
+) -> list[models.DataColumn]:
+    """Returns columns (in the order of `paths`) that values can be set for.
+
+    Raises:
+        HTTPException: If the columns' namespace or any of the columns do not
+            exist, or the requester cannot write in the columns' namespace.
+    """
+    col_namespace_obj = crud.namespace.get(db=db, path=namespace)
+    if col_namespace_obj is None or not scopes.can_write_in_namespace(
+        col_namespace_obj
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=namespace_write_error_msg("column values"),
+        )
+
+    cols = []
+    for path in paths:
+        col = crud.column.get(
+            db, path=normalize_path(path), namespace=col_namespace_obj
+        )
+        if col is None:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=f'Column not found: "{path}".',
+            )
+        cols.append(col)
+    return cols
 
 
 @router.put(
@@ -30,21 +67,9 @@ def set_column_values(
     scopes: ScopeManager = Depends(get_scopes),
 ):
     log.debug("IN THE PUT METHOD OF COLUMN VALUES")
-    col_path = normalize_path(path)
-    col_namespace_obj = crud.namespace.get(db=db, path=namespace)
-    if col_namespace_obj is None or not scopes.can_write_in_namespace(
-        col_namespace_obj
-    ):
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND,
-            detail=namespace_write_error_msg("column values"),
-        )
-
-    col = crud.column.get(db, path=col_path, namespace=col_namespace_obj)
-    if col is None:
-        raise HTTPException(
-            status_code=HTTPStatus.NOT_FOUND, detail="Column not found."
-        )
+    (col,) = _columns_with_write(
+        db=db, namespace=namespace, paths=[path], scopes=scopes
+    )
 
     geos = geos_from_paths(
         paths=[val.path for val in values], namespace=namespace, db=db, scopes=scopes
@@ -53,3 +78,89 @@ def set_column_values(
     # Pair the geography objects with their values.
     geos_values = [(geo, val.value) for geo, val in zip(geos, values)]
     crud.column.set_values(db, col=col, values=geos_values, obj_meta=obj_meta)
+
+
+@columnar_router.put(
+    "/{namespace}/{path:path}",
+    response_model=None,
+    status_code=HTTPStatus.NO_CONTENT,
+)
+def set_columnar_column_values(
+    *,
+    namespace: str,
+    path: str,
+    values: schemas.ColumnValues,
+    db: Session = Depends(get_db),
+    obj_meta: models.ObjectMeta = Depends(get_obj_meta),
+    scopes: ScopeManager = Depends(get_scopes),
+):
+    """Sets column values from a MessagePack-encoded array of paths and an
+    array (or typed buffer) of values.
+
+    Values are type-checked all at once rather than one at a time, which is
+    much faster for large uploads (e.g. block-level columns).
+    """
+    (col,) = _columns_with_write(
+        db=db, namespace=namespace, paths=[path], scopes=scopes
+    )
+    geos = geos_from_paths(
+        paths=values.paths, namespace=namespace, db=db, scopes=scopes
+    )
+    crud.column.set_columnar_values(
+        db,
+        col=col,
+        geos=geos,
+        values=values.values,
+        dtype=values.dtype,
+        obj_meta=obj_meta,
+    )
+
+
+@columnar_router.put(
+    "/{namespace}",
+    response_model=None,
+    status_code=HTTPStatus.NO_CONTENT,
+)
+def set_column_values_batch(
+    *,
+    namespace: str,
+    values: schemas.ColumnValuesBatch,
+    db: Session = Depends(get_db),
+    obj_meta: models.ObjectMeta = Depends(get_obj_meta),
+    scopes: ScopeManager = Depends(get_scopes),
+):
+    """Sets the values of several columns in a namespace from a
+    MessagePack-encoded array of paths and a map of column paths to values.
+
+    The geographies are looked up once for all columns, and all columns are
+    set in a single transaction.
+    """
+    col_paths = list(values.columns.keys())
+    cols = _columns_with_write(
+        db=db, namespace=namespace, paths=col_paths, scopes=scopes
+    )
+    # Aliases of the same column would set its values twice.
+    col_ids = [col.col_id for col in cols]
+    if len(set(col_ids)) < len(col_ids):
+        dup_paths = [
+            path
+            for path, col_id in zip(col_paths, col_ids)
+            if col_ids.count(col_id) > 1
+        ]
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=f"Paths refer to the same column: {dup_paths}",
+        )
+
+    geos = geos_from_paths(
+        paths=values.paths, namespace=namespace, db=db, scopes=scopes
+    )
+    crud.column.set_columnar_values_bulk(
+        db,
+        geos=geos,
+        columns=[
+            (col, values.columns[col_path].values, values.columns[col_path].dtype)
+            for col, col_path in zip(cols, col_paths)
+        ],
+        obj_meta=obj_meta,
+    )
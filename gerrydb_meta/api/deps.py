@@ -4,42 +4,45 @@ import os
 import re
 from hashlib import sha512
 from http import HTTPStatus
-from typing import Generator
+from typing import Callable, Generator
 from uuid import UUID
 
 from fastapi import Depends, Header, HTTPException
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session
 
 from gerrydb_meta import crud, models
-from gerrydb_meta.db import db_url, ogr2ogr_db_config
+from gerrydb_meta.db import Session as SessionLocal
+from gerrydb_meta.db import ogr2ogr_db_config, pool_stats
 from gerrydb_meta.enums import ScopeType
 from gerrydb_meta.scopes import ScopeManager
 from uvicorn.config import logger as log
 import time
-import os
-
-GERRYDB_SQL_ECHO = bool(os.environ.get("GERRYDB_SQL_ECHO", False))
 
 API_KEY_PATTERN = re.compile(r"[0-9a-z]{64}")
 
 
 def get_db() -> Generator:  # pragma: no cover
+    db = SessionLocal()
     try:
-        engine = create_engine(db_url, echo=GERRYDB_SQL_ECHO)
-        Session = sessionmaker(engine)
-        db = Session()
+        # Check out a pooled connection up front so that time spent waiting
+        # on an exhausted pool is visible in the pool statistics.
+        with pool_stats.time_checkout():
+            db.connection()
         yield db
         db.commit()
     finally:
         db.close()
-        engine.dispose()
 
 
 def get_ogr2ogr_db_config() -> str:  # pragma: no cover
     return ogr2ogr_db_config
 
 
+def get_session_factory() -> Callable[[], Session]:  # pragma: no cover
+    """Session factory for work that outlives the request's session."""
+    return SessionLocal
+
+
 def get_user(
     db: Session = Depends(get_db), x_api_key: str | None = Header(default=None)
 ) -> models.User:
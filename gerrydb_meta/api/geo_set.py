@@ -4,15 +4,22 @@ A `GeoSet` defines a `GeoLayer` on a `Locality`.
 """
 
 from http import HTTPStatus
+from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from gerrydb_meta import crud, models, schemas
-from gerrydb_meta.api.base import geos_from_paths, namespace_write_error_msg
+from gerrydb_meta import crud, models, schemas, storage
+from gerrydb_meta.api.base import (
+    geos_from_paths,
+    namespace_read_error_msg,
+    namespace_write_error_msg,
+    tile_response,
+)
 from gerrydb_meta.api.deps import can_read_localities, get_db, get_obj_meta, get_scopes
 from gerrydb_meta.crud.base import normalize_path
 from gerrydb_meta.scopes import ScopeManager
+from gerrydb_meta.tiles import TileError, get_tile
 from uvicorn.config import logger as log
 
 router = APIRouter()
@@ -70,3 +77,74 @@ def map_locality(
         geographies=geo_objs,
         obj_meta=obj_meta,
     )
+
+
+@router.get(
+    "/{namespace}/{path:path}/tiles/{z}/{x}/{y}.mvt",
+    name="Get GeoLayer tile",
+    dependencies=[Depends(can_read_localities)],
+    response_class=Response,
+)
+def get_layer_tile(
+    *,
+    namespace: str,
+    path: str,
+    locality: str,
+    z: int,
+    x: int,
+    y: int,
+    db: Session = Depends(get_db),
+    scopes: ScopeManager = Depends(get_scopes),
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """Returns a Mapbox Vector Tile of the current geographies of a layer
+    in a locality.
+
+    Features have a `path` property. Tiles are cached (see
+    `gerrydb_meta.tiles`).
+    """
+    layer_namespace_obj = crud.namespace.get(db=db, path=namespace)
+    if layer_namespace_obj is None or not scopes.can_read_in_namespace(
+        layer_namespace_obj
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=namespace_read_error_msg("geographic layers"),
+        )
+
+    loc_obj = crud.locality.get_by_ref(db, path=normalize_path(locality))
+    if loc_obj is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Locality not found."
+        )
+
+    layer_obj = crud.geo_layer.get(db=db, path=path, namespace=layer_namespace_obj)
+    if layer_obj is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail="Geographic layer not found."
+        )
+
+    set_version = crud.geo_layer.get_set_by_locality(
+        db=db, layer=layer_obj, locality=loc_obj
+    )
+    if set_version is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Locality is not mapped to geographic layer.",
+        )
+
+    try:
+        tile = get_tile(
+            db,
+            crud.geo_layer.tile_features(set_version=set_version),
+            layer_name=layer_obj.path,
+            # Set versions are immutable, so tiles are keyed by ID alone.
+            source=f"layer:{set_version.set_version_id}",
+            z=z,
+            x=x,
+            y=y,
+            store=storage.tile_store(),
+        )
+    except TileError as ex:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(ex))
+    return tile_response(tile, if_none_match)
@@ -1,8 +1,18 @@
 """Endpoints for base geographic data (points and polygons)."""
 
 from http import HTTPStatus
-from typing import Callable
-from fastapi import APIRouter, Depends, Response, Header, Query
+from typing import Callable, Iterator
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    Response,
+    Header,
+    Query,
+)
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from gerrydb_meta import crud, models, schemas
@@ -11,12 +21,51 @@ from gerrydb_meta.api.base import (
     MsgpackRoute,
     NamespacedObjectApi,
     add_etag,
+    msgpack_array_batches,
+    request_chunks,
 )
 from gerrydb_meta.api.deps import get_db, get_geo_import, get_obj_meta, get_scopes
 from gerrydb_meta.scopes import ScopeManager
 from uvicorn.config import logger as log
 
 
+DEFAULT_STREAM_BATCH_SIZE = 2_000
+MAX_STREAM_BATCH_SIZE = 50_000
+
+
+def _geography_batches(
+    request: Request, batch_size: int
+) -> Iterator[list[schemas.GeographyCreate]]:
+    """Decodes and validates a streamed upload of geographies, batch by batch."""
+    batches = msgpack_array_batches(request_chunks(request), batch_size)
+    offset = 0
+    while True:
+        try:
+            batch = next(batches, None)
+        except ValueError as ex:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=f"Request body is not a valid MessagePack array. {ex}",
+            )
+        if batch is None:
+            return
+
+        objs_in = []
+        errors = []
+        for idx, obj in enumerate(batch, start=offset):
+            try:
+                objs_in.append(schemas.GeographyCreate.model_validate(obj))
+            except ValidationError as ex:
+                errors.extend(
+                    {**error, "loc": ("body", idx, *error["loc"])}
+                    for error in ex.errors(include_input=False)
+                )
+        if errors:
+            raise RequestValidationError(errors)
+        offset += len(batch)
+        yield objs_in
+
+
 class GeographyApi(NamespacedObjectApi):
     def _create(self, router: APIRouter) -> Callable:
         @router.post(
@@ -71,6 +120,59 @@ class GeographyApi(NamespacedObjectApi):
 
         return create_route
 
+    def _create_stream(self, router: APIRouter) -> Callable:
+        @router.post(
+            "/{namespace}/stream",
+            response_model=None,
+            response_class=MsgpackResponse,
+            name=f"Create {self.obj_name_plural} from a streamed upload",
+            status_code=HTTPStatus.CREATED,
+        )
+        def create_stream_route(
+            *,
+            request: Request,
+            namespace: str,
+            db: Session = Depends(get_db),
+            obj_meta: models.ObjectMeta = Depends(get_obj_meta),
+            geo_import: models.GeoImport = Depends(get_geo_import),
+            scopes: ScopeManager = Depends(get_scopes),
+            batch_size: int = Query(
+                default=DEFAULT_STREAM_BATCH_SIZE, ge=1, le=MAX_STREAM_BATCH_SIZE
+            ),
+            bulk_load: bool = Query(default=False),
+        ):
+            """Creates geographies from a MessagePack array of unbounded size.
+
+            Accepts the same body as the regular create endpoint, but decodes,
+            validates, hashes, and inserts it in batches of `batch_size`
+            geographies as it is received, so memory use depends on the batch
+            size rather than the size of the upload. The geographies are still
+            created in a single transaction. Only the number of geographies
+            created is returned.
+
+            With `?bulk_load=true`, batches are staged with `COPY` and inserted
+            with set-based queries (see `CRGeography.copy_bulk()`), which is
+            much faster for very large uploads.
+            """
+            namespace_obj = self._namespace_with_write(
+                db=db, scopes=scopes, path=namespace
+            )
+            create = self.crud.copy_bulk if bulk_load else self.crud.create_bulk_stream
+            num_created, etag = create(
+                db=db,
+                batches=_geography_batches(request, batch_size),
+                obj_meta=obj_meta,
+                geo_import=geo_import,
+                namespace=namespace_obj,
+            )
+            response = MsgpackResponse(
+                {"count": num_created}, status_code=HTTPStatus.CREATED
+            )
+            add_etag(response, etag)
+            return response
+
+        return create_stream_route
+
     def _patch(self, router: APIRouter) -> Callable:
         @router.patch(
             "/{namespace}",
@@ -156,6 +258,7 @@ class GeographyApi(NamespacedObjectApi):
         msgpack_router = APIRouter()
         msgpack_router.route_class = MsgpackRoute
         self._create(msgpack_router)
+        self._create_stream(msgpack_router)
         self._patch(msgpack_router)
         self._get(router)
         self._all(router)
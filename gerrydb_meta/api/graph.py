@@ -1,21 +1,17 @@
 """Endpoints for districting graphs."""
 
-import os
-import subprocess
-from datetime import timedelta
+import uuid
+from typing import Annotated
 from http import HTTPStatus
-from urllib.parse import urlparse
 import time
 
-from fastapi import APIRouter, Depends, HTTPException, Response
-from fastapi.responses import FileResponse, RedirectResponse
-from sqlalchemy.orm import Session
-from google.cloud import storage
-from google.oauth2.service_account import Credentials
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 from uvicorn.config import logger as log
 
-from gerrydb_meta import crud, models, schemas
+from gerrydb_meta import crud, metrics, models, schemas, storage
+from gerrydb_meta.admission import render_admission
 from gerrydb_meta.api.base import (
     add_etag,
     geo_set_from_paths,
@@ -23,6 +19,8 @@ from gerrydb_meta.api.base import (
 )
 from gerrydb_meta.api.base import add_etag
 from gerrydb_meta.scopes import ScopeManager
+from gerrydb_meta.api.render import queued_render_response, render_artifact_response
+from gerrydb_meta.enums import SimplifyLevel
 from gerrydb_meta.render import graph_to_gpkg
 from gerrydb_meta.api.deps import (
     can_read_localities,
@@ -33,9 +31,6 @@ from gerrydb_meta.api.deps import (
     get_user,
 )
 
-GPKG_MEDIA_TYPE = "application/geopackage+sqlite3"
-
-
 router = APIRouter()
 
 
@@ -195,7 +190,15 @@ def render_graph(
     db_config: str = Depends(get_ogr2ogr_db_config),
     user: models.User = Depends(get_user),
     scopes: ScopeManager = Depends(get_scopes),
+    background: bool = False,
+    accept_encoding: Annotated[str | None, Header()] = None,
+    simplify: SimplifyLevel = SimplifyLevel.FULL,
 ):
+    """Renders a dual graph to a GeoPackage.
+
+    See `render_view()` for background rendering, simplified geometries, and
+    admission control.
+    """
     log.debug("TOP OF GRAPH RENDER")
     namespace_obj = crud.namespace.get(db=db, path=namespace)
     if namespace_obj is None or not scopes.can_read_in_namespace(namespace_obj):
@@ -214,135 +217,90 @@ def render_graph(
             detail=f"Graph not found in namespace.",
         )
 
-    bucket_name = os.getenv("GCS_BUCKET")
-    key_path = os.getenv("GCS_KEY_PATH")
-    storage_credentials = storage_client = None
-    if bucket_name is not None and key_path is not None:  # pragma: no cover
-        try:
-            storage_credentials = Credentials.from_service_account_file(key_path)
-            storage_client = storage.Client(credentials=storage_credentials)
-        except Exception:
-            log.exception("Failed to initialize Google Cloud Storage context.")
-            storage_credentials = storage_client = None
-    has_gcs_context = storage_client is not None
-
-    cached_render_meta = crud.graph.get_cached_render(db=db, graph=graph_obj)
-    if cached_render_meta is not None and has_gcs_context:  # pragma: no cover
-        render_path = urlparse(cached_render_meta.path)
-        try:
-            bucket = storage_client.bucket(render_path.netloc)
-            blob = bucket.get_blob(render_path.path[1:])
-            redirect_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(minutes=15),
-                method="GET",
-                # see https://stackoverflow.com/a/64245028
-                service_account_email=storage_credentials.service_account_email,
-                access_token=storage_credentials.token,
-            )
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=HTTPStatus.PERMANENT_REDIRECT,
-            )
-        except Exception:
-            log.exception(
-                "Failed to serve rendered graph via Google Cloud Storage. "
-                "Falling back to direct streaming."
-            )
-
-    bucket_name = os.getenv("GCS_BUCKET")
-    key_path = os.getenv("GCS_KEY_PATH")
-    storage_credentials = storage_client = None
-
-    if bucket_name is not None and key_path is not None:  # pragma: no cover
-        try:
-            storage_credentials = Credentials.from_service_account_file(key_path)
-            storage_client = storage.Client(credentials=storage_credentials)
-        except Exception:
-            log.exception("Failed to initialize Google Cloud Storage context.")
-            storage_credentials = storage_client = None
-    has_gcs_context = storage_client is not None
+    store = storage.render_store()
+    etag = crud.graph.etag(db, namespace_obj)
 
-    cached_render_meta = crud.graph.get_cached_render(db=db, graph=graph_obj)
-    if cached_render_meta is not None and has_gcs_context:  # pragma: no cover
+    cached_render_meta = crud.graph.get_cached_render(
+        db=db, graph=graph_obj, store=store, simplify=simplify
+    )
+    if cached_render_meta is not None:
         log.debug("Found cached render")
-        render_path = urlparse(cached_render_meta.path)
         try:
-            bucket = storage_client.bucket(render_path.netloc)
-            blob = bucket.get_blob(render_path.path[1:])
-            redirect_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(minutes=15),
-                method="GET",
-                # see https://stackoverflow.com/a/64245028
-                service_account_email=storage_credentials.service_account_email,
-                access_token=storage_credentials.token,
+            return render_artifact_response(
+                store,
+                cached_render_meta.path,
+                headers={
+                    "ETag": etag.hex,
+                    "X-GerryDB-Graph-Render-ID": cached_render_meta.render_id.hex,
+                },
+                accept_encoding=accept_encoding,
             )
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=HTTPStatus.PERMANENT_REDIRECT,
-            )
-        except Exception:
+        except Exception:  # pragma: no cover
             log.exception(
-                "Failed to serve rendered graph via Google Cloud Storage. "
-                "Falling back to direct streaming."
+                "Failed to serve cached rendered graph. Falling back to rendering."
             )
 
-    log.debug("BEFORE GRAPH RENDER")
-    start = time.perf_counter()
-    etag = crud.graph.etag(db, namespace_obj)
-    render_ctx = crud.graph.render(db=db, graph=graph_obj)
-    log.debug("RENDER CTX %s", render_ctx)
-    log.debug("Time to render graph: %s", time.perf_counter() - start)
-    start = time.perf_counter()
-    render_uuid, gpkg_path = graph_to_gpkg(context=render_ctx, db_config=db_config)
-    log.debug("Time to write GPKG: %s", time.perf_counter() - start)
-    log.debug("Created GPKG %s", gpkg_path)
-
-    if has_gcs_context:  # pragma: no cover
-        log.debug("Attempting to upload rendered graph to Google Cloud Storage")
-        try:
-            bucket = storage_client.bucket(bucket_name)
-            gzipped_path = gpkg_path.with_suffix(".gpkg.gz")
-            subprocess.run(["gzip", "-k", "-1", str(gpkg_path)], check=True)
-
-            blob_path = f"{render_uuid.hex}.gpkg.gz"
-            blob = bucket.blob(blob_path)
-            blob.content_encoding = "gzip"
-            blob.metadata = {"gerrydb-graph-render-id": render_uuid.hex}
-            blob.upload_from_filename(gzipped_path, content_type=GPKG_MEDIA_TYPE)
-            crud.graph.cache_render(
+    if background:  # pragma: no cover
+        queued_render = crud.graph.get_queued_render(
+            db=db, graph=graph_obj, simplify=simplify
+        )
+        if queued_render is None:
+            queued_render = crud.graph.queue_render(
                 db=db,
                 graph=graph_obj,
                 created_by=user,
-                render_id=render_uuid,
-                path=f"gs://{bucket_name}/{blob_path}",
+                render_id=uuid.uuid4(),
+                simplify=simplify,
             )
+        return queued_render_response(db, queued_render)
 
-            redirect_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(minutes=15),
-                method="GET",
-                # see https://stackoverflow.com/a/64245028
-                service_account_email=storage_credentials.service_account_email,
-                access_token=storage_credentials.token,
-            )
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=HTTPStatus.PERMANENT_REDIRECT,
-            )
-        except Exception as ex:
-            log.exception(
-                "Failed to serve rendered graph via Google Cloud Storage. "
-                "Falling back to direct streaming."
-            )
-            raise ex
-
-    return FileResponse(
-        gpkg_path,
-        media_type=GPKG_MEDIA_TYPE,
-        headers={
-            "ETag": etag.hex,
-            "X-GerryDB-Graph-Render-ID": render_uuid.hex,
-        },
-    )
+    with (
+        render_admission().admit(),
+        metrics.render_target("graph", f"{namespace}/{path}"),
+    ):
+        log.debug("BEFORE GRAPH RENDER")
+        start = time.perf_counter()
+        with metrics.stage("context"):
+            render_ctx = crud.graph.render(db=db, graph=graph_obj, simplify=simplify)
+        log.debug("RENDER CTX %s", render_ctx)
+        log.debug("Time to render graph: %s", time.perf_counter() - start)
+        start = time.perf_counter()
+        render_uuid, gpkg_path = graph_to_gpkg(
+            context=render_ctx, db_config=db_config, db=db
+        )
+        log.debug("Time to write GPKG: %s", time.perf_counter() - start)
+        log.debug("Created GPKG %s", gpkg_path)
+
+        if store is not None:
+            log.debug("Caching rendered graph")
+            try:
+                render_meta = crud.graph.cache_render(
+                    db=db,
+                    graph=graph_obj,
+                    created_by=user,
+                    render_id=render_uuid,
+                    path=gpkg_path,
+                    store=store,
+                    simplify=simplify,
+                )
+                return render_artifact_response(
+                    store,
+                    render_meta.path,
+                    headers={
+                        "ETag": etag.hex,
+                        "X-GerryDB-Graph-Render-ID": render_uuid.hex,
+                    },
+                    accept_encoding=accept_encoding,
+                )
+            except Exception as ex:  # pragma: no cover
+                log.exception("Failed to cache rendered graph.")
+                raise ex
+
+        return FileResponse(
+            gpkg_path,
+            media_type=storage.GPKG_MEDIA_TYPE,
+            headers={
+                "ETag": etag.hex,
+                "X-GerryDB-Graph-Render-ID": render_uuid.hex,
+            },
+        )
@@ -0,0 +1,146 @@
+"""Endpoints for queued view and graph renders."""
+
+import uuid
+from http import HTTPStatus
+from pathlib import Path
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, Response
+from sqlalchemy.orm import Session
+
+from gerrydb_meta import crud, models, schemas, storage
+from gerrydb_meta.api.deps import get_db, get_scopes
+from gerrydb_meta.enums import ViewRenderStatus
+from gerrydb_meta.scopes import ScopeManager
+
+router = APIRouter()
+
+RENDERS_PREFIX = "/renders"
+
+
+def queued_render_response(
+    db: Session, render: models.ViewRender | models.GraphRender
+) -> JSONResponse:
+    """Builds a `202 Accepted` response for a queued render."""
+    crud_obj = crud.view if isinstance(render, models.ViewRender) else crud.graph
+    render_status = schemas.RenderStatus.from_attributes(
+        render, queue_position=crud_obj.queue_position(db, render=render)
+    )
+    # Avoid a circular import with `gerrydb_meta.main`.
+    from gerrydb_meta.main import API_PREFIX
+
+    return JSONResponse(
+        status_code=HTTPStatus.ACCEPTED,
+        content=jsonable_encoder(render_status),
+        headers={"Location": f"{API_PREFIX}{RENDERS_PREFIX}/{render.render_id}"},
+    )
+
+
+def render_artifact_response(
+    store: storage.RenderStore | None,
+    path: str,
+    headers: dict[str, str],
+    accept_encoding: str | None = None,
+) -> Response:
+    """Serves a rendered GeoPackage, preferring a redirect to external storage.
+
+    If the store has a precompressed copy of the render in an encoding the
+    client accepts, the compressed bytes are served as-is with a
+    `Content-Encoding` header (which `GZipMiddleware` passes through).
+
+    Raises:
+        HTTPException: The render is no longer available.
+    """
+    local_path = None
+    if store is not None and store.contains(path):
+        url = store.url(path)
+        if url is not None:  # pragma: no cover
+            return RedirectResponse(url=url, status_code=HTTPStatus.PERMANENT_REDIRECT)
+        for encoding in storage.negotiate_encodings(accept_encoding, store.encodings):
+            encoded_path = store.encoded_path(path, encoding)
+            if encoded_path is not None:
+                return FileResponse(
+                    encoded_path,
+                    media_type=storage.GPKG_MEDIA_TYPE,
+                    headers={
+                        **headers,
+                        "Content-Encoding": encoding,
+                        "Vary": "Accept-Encoding",
+                    },
+                )
+        local_path = store.local_path(path)
+    elif not storage.is_gcs_uri(path):
+        # Renders saved without a store (e.g. by a render worker with caching
+        # disabled) are plain local paths.
+        local_path = Path(path)
+
+    if local_path is None or not local_path.is_file():
+        raise HTTPException(
+            status_code=HTTPStatus.GONE,
+            detail="Render is no longer available. Please request a new render.",
+        )
+    return FileResponse(local_path, media_type=storage.GPKG_MEDIA_TYPE, headers=headers)
+
+
+def _get_render(
+    db: Session, scopes: ScopeManager, render_id: uuid.UUID
+) -> models.ViewRender | models.GraphRender:
+    render = crud.view.get_render(db, render_id=render_id)
+    if render is not None:
+        namespace = render.view.namespace
+    else:
+        render = crud.graph.get_render(db, render_id=render_id)
+        namespace = None if render is None else render.graph.namespace
+
+    if render is None or not scopes.can_read_in_namespace(namespace):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=(
+                "Render not found, or you do not have sufficient permissions "
+                "to read data in its namespace."
+            ),
+        )
+    return render
+
+
+@router.get("/{render_id}", response_model=schemas.RenderStatus)
+def get_render_status(
+    *,
+    render_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    scopes: ScopeManager = Depends(get_scopes),
+):
+    """Returns the job queue status of a view or graph render."""
+    render = _get_render(db, scopes, render_id)
+    queue_position = None
+    if render.status == ViewRenderStatus.PENDING:
+        crud_obj = crud.view if isinstance(render, models.ViewRender) else crud.graph
+        queue_position = crud_obj.queue_position(db, render=render)
+    return schemas.RenderStatus.from_attributes(render, queue_position=queue_position)
+
+
+@router.get("/{render_id}/artifact")
+def get_render_artifact(
+    *,
+    render_id: uuid.UUID,
+    db: Session = Depends(get_db),
+    scopes: ScopeManager = Depends(get_scopes),
+    accept_encoding: Annotated[str | None, Header()] = None,
+):
+    """Downloads (or redirects to) the GeoPackage of a successful render."""
+    render = _get_render(db, scopes, render_id)
+    if render.status != ViewRenderStatus.SUCCEEDED:
+        raise HTTPException(
+            status_code=HTTPStatus.CONFLICT,
+            detail=f"Render is not available (status: {render.status.value}).",
+        )
+
+    kind = "View" if isinstance(render, models.ViewRender) else "Graph"
+    return render_artifact_response(
+        storage.render_store(),
+        render.path,
+        headers={f"X-GerryDB-{kind}-Render-ID": render.render_id.hex},
+        accept_encoding=accept_encoding,
+    )
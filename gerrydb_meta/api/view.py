@@ -1,36 +1,100 @@
 """Endpoints for views."""
 
-import os
-import subprocess
-from datetime import timedelta
+import math
+import uuid
+from typing import Annotated, Callable
 from http import HTTPStatus
-from urllib.parse import urlparse
 import time
 
-from fastapi import APIRouter, Depends, HTTPException, Response
-from fastapi.responses import RedirectResponse, FileResponse
-from google.cloud import storage
-from google.oauth2.service_account import Credentials
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from uvicorn.config import logger as log
 
-from gerrydb_meta import crud, models, schemas
-from gerrydb_meta.api.base import add_etag, namespace_with_read, parse_path
+from gerrydb_meta import crud, metrics, models, schemas, storage
+from gerrydb_meta.admission import release_after, render_admission
+from gerrydb_meta.api.base import (
+    add_etag,
+    namespace_with_read,
+    parse_path,
+    tile_response,
+)
 from gerrydb_meta.api.deps import (
     can_read_localities,
     get_db,
     get_obj_meta,
     get_ogr2ogr_db_config,
     get_scopes,
+    get_session_factory,
     get_user,
 )
-from gerrydb_meta.render import view_to_gpkg
+from gerrydb_meta.api.render import queued_render_response, render_artifact_response
+from gerrydb_meta.crud.base import normalize_path
+from gerrydb_meta.crud.view import ViewRenderSubset
+from gerrydb_meta.enums import RenderFormat, SimplifyLevel
+from gerrydb_meta.render import RenderError, render_view_gpkg
+from gerrydb_meta.render_stream import stream_view
 from gerrydb_meta.scopes import ScopeManager
-from gerrydb_meta.exceptions import ViewConflictError
+from gerrydb_meta.tiles import TileError, get_tile
+from gerrydb_meta.exceptions import GerryPathError, ViewConflictError
 
 
 router = APIRouter()
-GPKG_MEDIA_TYPE = "application/geopackage+sqlite3"
+
+
+def _render_subset(
+    db: Session,
+    view_obj: models.View,
+    columns: list[str],
+    paths: list[str],
+    bbox: str | None,
+) -> ViewRenderSubset:
+    """Parses the subset of a view to render from query parameters.
+
+    Raises:
+        HTTPException: An unknown column or a malformed bounding box.
+    """
+    if columns:
+        view_columns = crud.view.columns(db=db, view=view_obj)
+        missing_columns = [alias for alias in columns if alias not in view_columns]
+        if missing_columns:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=f"Columns not found in view: {', '.join(missing_columns)}",
+            )
+
+    bounds = None
+    if bbox is not None:
+        try:
+            bounds = tuple(float(value) for value in bbox.split(","))
+        except ValueError:
+            bounds = ()
+        if (
+            len(bounds) != 4
+            or not all(math.isfinite(value) for value in bounds)
+            or bounds[0] > bounds[2]
+            or bounds[1] > bounds[3]
+        ):
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=(
+                    "Bounding box must be of the form min_x,min_y,max_x,max_y "
+                    "(with min_x <= max_x and min_y <= max_y)."
+                ),
+            )
+
+    try:
+        normalized_paths = tuple(
+            normalize_path(path, case_sensitive_uid=True) for path in paths
+        )
+    except GerryPathError as ex:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(ex))
+
+    return ViewRenderSubset(
+        columns=tuple(columns) if columns else None,
+        paths=normalized_paths if paths else None,
+        bbox=bounds,
+    )
 
 
 @router.post(
@@ -133,6 +197,88 @@ def create_view(
     return schemas.ViewMeta.from_attributes(view_obj)
 
 
+# Registered before `get_view()`, whose path parameter would match tile paths.
+@router.get(
+    "/{namespace}/{path:path}/tiles/{z}/{x}/{y}.mvt",
+    dependencies=[Depends(can_read_localities)],
+    response_class=Response,
+)
+def get_view_tile(
+    *,
+    namespace: str,
+    path: str,
+    z: int,
+    x: int,
+    y: int,
+    columns: Annotated[list[str], Query()] = [],
+    db: Session = Depends(get_db),
+    scopes: ScopeManager = Depends(get_scopes),
+    if_none_match: Annotated[str | None, Header()] = None,
+):
+    """Returns a Mapbox Vector Tile of a view's geographies.
+
+    Features have a `path` property and a property for each view column
+    (by alias) in `?columns=`, named as in GeoPackage renders. Tiles are
+    cached (see `gerrydb_meta.tiles`).
+    """
+    view_namespace_obj = crud.namespace.get(db=db, path=namespace)
+    if view_namespace_obj is None or not scopes.can_read_in_namespace(
+        view_namespace_obj
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=(
+                f'Namespace "{namespace}" not found, or you do not have '
+                "sufficient permissions to read views in this namespace."
+            ),
+        )
+
+    view_obj = crud.view.get(db=db, namespace=view_namespace_obj, path=path)
+    if view_obj is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail=f"View not found in namespace.",
+        )
+
+    view_columns = crud.view.columns(db=db, view=view_obj)
+    # Requests for the same columns in any order share cached tiles.
+    columns = sorted(set(columns))
+    missing_columns = [alias for alias in columns if alias not in view_columns]
+    if missing_columns:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Columns not found in view: {', '.join(missing_columns)}",
+        )
+
+    # Tiles are keyed by the view's render fingerprint (of only the requested
+    # columns), so cached tiles are served without querying their features.
+    manifest = crud.view.render_manifest(
+        db=db, view=view_obj, subset=ViewRenderSubset(columns=tuple(columns))
+    )
+    column_digests = ",".join(str(digest) for digest in manifest.columns.values())
+    try:
+        tile = get_tile(
+            db,
+            crud.view.tile_features(
+                db=db,
+                view=view_obj,
+                columns={alias: view_columns[alias] for alias in columns},
+            ),
+            layer_name=view_obj.path,
+            source=(
+                f"view:{view_obj.view_id}:{','.join(columns)}:"
+                f"{manifest.geometry}:{column_digests}"
+            ),
+            z=z,
+            x=x,
+            y=y,
+            store=storage.tile_store(),
+        )
+    except TileError as ex:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(ex))
+    return tile_response(tile, if_none_match)
+
+
 @router.get(
     "/{namespace}/{path:path}",
     response_model=schemas.ViewMeta,
@@ -218,7 +364,39 @@ def render_view(
     db_config: str = Depends(get_ogr2ogr_db_config),
     user: models.User = Depends(get_user),
     scopes: ScopeManager = Depends(get_scopes),
+    session_factory: Callable[[], Session] = Depends(get_session_factory),
+    background: bool = False,
+    accept_encoding: Annotated[str | None, Header()] = None,
+    format: RenderFormat = RenderFormat.GPKG,
+    columns: Annotated[list[str], Query()] = [],
+    paths: Annotated[list[str], Query()] = [],
+    bbox: str | None = None,
+    simplify: SimplifyLevel = SimplifyLevel.FULL,
 ):
+    """Renders a view to a GeoPackage.
+
+    With `?background=true`, the render is added to the job queue instead, and
+    a `202 Accepted` response with the render's status is returned; poll
+    `/renders/{render_id}` until the render is available.
+
+    With `?format=fgb`, `?format=parquet`, or `?format=ndjson`, the view is
+    streamed as FlatGeobuf, GeoParquet, or newline-delimited GeoJSON instead
+    (see `gerrydb_meta.render_stream`). Streamed renders are not cached.
+
+    Renders can be restricted to some of the view's columns (by alias, with
+    `?columns=`), to some of its geographies (by path, with `?paths=`), and
+    to the geographies that intersect a bounding box (with
+    `?bbox=min_x,min_y,max_x,max_y`, in degrees). Each subset of a view is
+    cached separately.
+
+    With `?simplify=medium` or `?simplify=coarse`, geometries are exported at
+    a coarser simplification level (see `models.SIMPLIFY_TOLERANCES`), which
+    is much smaller than the full geometries.
+
+    Renders that are not served from the cache are subject to admission
+    control (see `gerrydb_meta.admission`): when too many renders are in
+    progress, `429 Too Many Requests` is returned with a `Retry-After` header.
+    """
     log.debug("TOP OF VIEW RENDER")
     view_namespace_obj = crud.namespace.get(db=db, path=namespace)
     if view_namespace_obj is None or not scopes.can_read_in_namespace(
@@ -239,97 +417,135 @@ def render_view(
             detail=f"View not found in namespace.",
         )
 
-    bucket_name = os.getenv("GCS_BUCKET")
-    key_path = os.getenv("GCS_KEY_PATH")
-    storage_credentials = storage_client = None
-    if bucket_name is not None and key_path is not None:  # pragma: no cover
+    subset = _render_subset(db, view_obj, columns, paths, bbox)
+    etag = crud.view.etag(db, view_namespace_obj)
+    if format != RenderFormat.GPKG:
+        if background:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail="Streamed renders cannot be run in the background.",
+            )
+        # Streamed renders hold their slot until the response is finished.
+        ticket = render_admission().acquire()
         try:
-            storage_credentials = Credentials.from_service_account_file(key_path)
-            storage_client = storage.Client(credentials=storage_credentials)
-        except Exception:
-            log.exception("Failed to initialize Google Cloud Storage context.")
-            storage_credentials = storage_client = None
-    has_gcs_context = storage_client is not None
-
-    cached_render_meta = crud.view.get_cached_render(db=db, view=view_obj)
-    if cached_render_meta is not None and has_gcs_context:  # pragma: no cover
+            with (
+                metrics.render_target("view", f"{namespace}/{path}"),
+                metrics.stage("context"),
+            ):
+                render_ctx = crud.view.render(
+                    db=db, view=view_obj, subset=subset, simplify=simplify
+                )
+            view_stream = stream_view(render_ctx, db, session_factory, format)
+        except RenderError as ex:
+            ticket.release()
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(ex))
+        except BaseException:
+            ticket.release()
+            raise
+        return StreamingResponse(
+            release_after(view_stream.chunks, ticket),
+            media_type=view_stream.media_type,
+            headers={
+                "ETag": etag.hex,
+                "Content-Disposition": (
+                    f'attachment; filename="{view_stream.filename}"'
+                ),
+            },
+        )
+
+    store = storage.render_store()
+
+    manifest = crud.view.render_manifest(db=db, view=view_obj, subset=subset)
+    cached_render_meta = crud.view.get_cached_render(
+        db=db, view=view_obj, store=store, subset=subset, simplify=simplify
+    )
+    if (
+        cached_render_meta is not None
+        and cached_render_meta.manifest == manifest.to_dict()
+    ):
         log.debug("Found cached render")
-        render_path = urlparse(cached_render_meta.path)
         try:
-            bucket = storage_client.bucket(render_path.netloc)
-            blob = bucket.get_blob(render_path.path[1:])
-            redirect_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(minutes=15),
-                method="GET",
-                # see https://stackoverflow.com/a/64245028
-                service_account_email=storage_credentials.service_account_email,
-                access_token=storage_credentials.token,
-            )
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=HTTPStatus.PERMANENT_REDIRECT,
+            return render_artifact_response(
+                store,
+                cached_render_meta.path,
+                headers={
+                    "ETag": etag.hex,
+                    "X-GerryDB-View-Render-ID": cached_render_meta.render_id.hex,
+                },
+                accept_encoding=accept_encoding,
             )
-        except Exception:
+        except Exception:  # pragma: no cover
             log.exception(
-                "Failed to serve rendered view via Google Cloud Storage. "
-                "Falling back to direct streaming."
+                "Failed to serve cached rendered view. Falling back to rendering."
             )
 
-    log.debug("BEFORE RENDER")
-    start = time.perf_counter()
-    etag = crud.view.etag(db, view_namespace_obj)
-    render_ctx = crud.view.render(db=db, view=view_obj)
-    log.debug("Time to render: %s", time.perf_counter() - start)
-    start = time.perf_counter()
-    render_uuid, gpkg_path = view_to_gpkg(context=render_ctx, db_config=db_config)
-    log.debug("Time to write GPKG: %s", time.perf_counter() - start)
-    log.debug("AFTER GPKG")
-
-    if has_gcs_context:  # pragma: no cover
-        log.debug("Attempting to upload rendered view to Google Cloud Storage")
-        try:
-            bucket = storage_client.bucket(bucket_name)
-            gzipped_path = gpkg_path.with_suffix(".gpkg.gz")
-            subprocess.run(["gzip", "-k", "-1", str(gpkg_path)], check=True)
-
-            blob_path = f"{render_uuid.hex}.gpkg.gz"
-            blob = bucket.blob(blob_path)
-            blob.content_encoding = "gzip"
-            blob.metadata = {"gerrydb-view-render-id": render_uuid.hex}
-            blob.upload_from_filename(gzipped_path, content_type=GPKG_MEDIA_TYPE)
-            crud.view.cache_render(
+    if background:
+        queued_render = crud.view.get_queued_render(
+            db=db, view=view_obj, subset=subset, simplify=simplify
+        )
+        if queued_render is None:
+            queued_render = crud.view.queue_render(
                 db=db,
                 view=view_obj,
                 created_by=user,
-                render_id=render_uuid,
-                path=f"gs://{bucket_name}/{blob_path}",
+                render_id=uuid.uuid4(),
+                subset=subset,
+                simplify=simplify,
             )
+        return queued_render_response(db, queued_render)
 
-            redirect_url = blob.generate_signed_url(
-                version="v4",
-                expiration=timedelta(minutes=15),
-                method="GET",
-                # see https://stackoverflow.com/a/64245028
-                service_account_email=storage_credentials.service_account_email,
-                access_token=storage_credentials.token,
-            )
-            return RedirectResponse(
-                url=redirect_url,
-                status_code=HTTPStatus.PERMANENT_REDIRECT,
-            )
-        except Exception as ex:
-            log.exception(
-                "Failed to serve rendered view via Google Cloud Storage. "
-                "Falling back to direct streaming."
-            )
-            raise ex
-
-    return FileResponse(
-        gpkg_path,
-        media_type=GPKG_MEDIA_TYPE,
-        headers={
-            "ETag": etag.hex,
-            "X-GerryDB-View-Render-ID": render_uuid.hex,
-        },
-    )
+    with (
+        render_admission().admit(),
+        metrics.render_target("view", f"{namespace}/{path}"),
+    ):
+        log.debug("BEFORE RENDER")
+        start = time.perf_counter()
+        render_uuid, gpkg_path = render_view_gpkg(
+            db,
+            view_obj,
+            db_config,
+            manifest=manifest,
+            previous=cached_render_meta,
+            store=store,
+            base_store=storage.base_layer_store(),
+            subset=subset,
+            simplify=simplify,
+        )
+        log.debug("Time to write GPKG: %s", time.perf_counter() - start)
+        log.debug("AFTER GPKG")
+
+        if store is not None:
+            log.debug("Caching rendered view")
+            try:
+                render_meta = crud.view.cache_render(
+                    db=db,
+                    view=view_obj,
+                    created_by=user,
+                    render_id=render_uuid,
+                    path=gpkg_path,
+                    store=store,
+                    manifest=manifest,
+                    subset=subset,
+                    simplify=simplify,
+                )
+                return render_artifact_response(
+                    store,
+                    render_meta.path,
+                    headers={
+                        "ETag": etag.hex,
+                        "X-GerryDB-View-Render-ID": render_uuid.hex,
+                    },
+                    accept_encoding=accept_encoding,
+                )
+            except Exception as ex:  # pragma: no cover
+                log.exception("Failed to cache rendered view.")
+                raise ex
+
+        return FileResponse(
+            gpkg_path,
+            media_type=storage.GPKG_MEDIA_TYPE,
+            headers={
+                "ETag": etag.hex,
+                "X-GerryDB-View-Render-ID": render_uuid.hex,
+            },
+        )
@@ -6,9 +6,11 @@
 #   %7B%7Bcookiecutter.project_slug%7D%7D/backend/app/app/crud/base.py
 from abc import abstractmethod
 import uuid
-from typing import Any, Generic, List, Optional, Tuple, Type, TypeVar
+from dataclasses import dataclass
+from typing import Any, Generic, Iterator, List, Optional, Tuple, Type, TypeVar
 
 from pydantic import BaseModel
+from sqlalchemy import Row, Select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 from abc import ABC, abstractmethod
@@ -28,6 +30,9 @@ PatchSchemaType = TypeVar("PatchSchemaType", bound=BaseModel)
 # through the cracks in the past, so we keep this check here just in case.
 INVALID_PATH_SUBSTRINGS = set({"..", " ", ";", "\\", "./"})
 
+# Rows fetched per round trip when streaming large query results.
+STREAM_BATCH_SIZE = 10_000
+
 
 def normalize_path(
     path: str, case_sensitive_uid: bool = False, path_length: Optional[int] = None
@@ -73,6 +78,34 @@ def normalize_path(
     return "/".join(path_list)
 
 
+@dataclass(frozen=True)
+class StreamedRows:
+    """Rows of a query, fetched lazily in batches from a server-side cursor.
+
+    The query is (re-)executed each time the rows are iterated, so large
+    results (such as plan assignments and graph edges) are never held in
+    memory all at once.
+    """
+
+    db: Session
+    query: Select
+    batch_size: int = STREAM_BATCH_SIZE
+
+    def batches(self) -> Iterator[list[Row]]:
+        """Yields the rows of the query in lists of up to `batch_size` rows."""
+        result = self.db.execute(
+            self.query, execution_options={"yield_per": self.batch_size}
+        )
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+
+    def __iter__(self) -> Iterator[Row]:
+        for batch in self.batches():
+            yield from batch
+
+
 class CRBase(Generic[ModelType, CreateSchemaType], ABC):
     model: Type[ModelType]
 
@@ -1,10 +1,29 @@
 """CRUD operations and transformations for column metadata."""
 
+import io
+import struct
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Collection, Tuple
 
-from sqlalchemy import exc, insert, update, tuple_
+import numpy as np
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    Table,
+    Text,
+    exc,
+    exists,
+    insert,
+    literal,
+    update,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.exc import IntegrityError
@@ -15,7 +34,10 @@ from gerrydb_meta import models, schemas
 from gerrydb_meta.crud.base import NamespacedCRBase, normalize_path
 from gerrydb_meta.enums import ColumnType
 from gerrydb_meta.exceptions import ColumnValueTypeError, CreateValueError
-from gerrydb_meta.utils import create_column_value_partition_text
+from gerrydb_meta.utils import (
+    create_column_value_partition_text,
+    create_column_value_partitions_text,
+)
 from uvicorn.config import logger as log
 
 # Maps the `ColumnType` enum to columns in `ColumnValue`.
@@ -27,6 +49,148 @@ COLUMN_TYPE_TO_VALUE_COLUMN = {
 }
 
 
+# NumPy dtype kinds (see `numpy.dtype.kind`) accepted for each column type.
+COLUMN_TYPE_TO_DTYPE_KINDS = {
+    ColumnType.FLOAT: "fiu",
+    ColumnType.INT: "iu",
+    ColumnType.STR: "U",
+    ColumnType.BOOL: "b",
+}
+
+# Staging table for column values bulk loaded with `COPY` (see
+# `CRColumn.set_columnar_values_bulk()`).
+_value_stage = Table(
+    "column_value_stage",
+    MetaData(),
+    Column("col_id", Integer, nullable=False),
+    Column("geo_id", Integer, nullable=False),
+    Column("val_float", DOUBLE_PRECISION, nullable=True),
+    Column("val_int", BigInteger, nullable=True),
+    Column("val_str", Text, nullable=True),
+    Column("val_bool", Boolean, nullable=True),
+    prefixes=["TEMPORARY"],
+)
+
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+_COPY_TRAILER = struct.pack("!h", -1)
+
+# Binary `COPY` encodings of fixed-width column values.
+_COLUMN_TYPE_TO_COPY_DTYPE = {
+    ColumnType.FLOAT: np.dtype(">f8"),
+    ColumnType.INT: np.dtype(">i8"),
+    ColumnType.BOOL: np.dtype("?"),
+}
+
+_COLUMN_TYPE_NAMES = {
+    ColumnType.FLOAT: "integer or floating-point",
+    ColumnType.INT: "integer",
+    ColumnType.STR: "string",
+    ColumnType.BOOL: "boolean",
+}
+
+
+def column_values_array(
+    col_type: ColumnType, values: list | bytes, dtype: str | None = None
+) -> np.ndarray:
+    """Converts a column's values to a NumPy array, checking their type.
+
+    Values are either a list (e.g. decoded from a MessagePack array), whose
+    dtype is inferred by NumPy, or a buffer of fixed-width numeric or boolean
+    values with an explicit `dtype` (e.g. `"<f8"`), which is read without
+    copying. Integers are promoted to floats for floating-point columns.
+
+    Raises:
+        ColumnValueTypeError: If the values cannot be converted to an array of
+            the column's type.
+    """
+    if isinstance(values, bytes):
+        try:
+            values_dtype = np.dtype(dtype)
+            if dtype is None or values_dtype.kind not in "biuf":
+                raise TypeError
+            array = np.frombuffer(values, dtype=values_dtype)
+        except (TypeError, ValueError):
+            raise ColumnValueTypeError(
+                errors=[
+                    "Expected binary column values with a fixed-width numeric "
+                    f'or boolean dtype, found dtype "{dtype}" and '
+                    f"{len(values)} bytes."
+                ]
+            )
+    else:
+        try:
+            array = np.asarray(values)
+        except ValueError:  # e.g. nested lists of different lengths
+            array = np.asarray(values, dtype=object)
+        if array.dtype.kind == "U" and set(map(type, values)) != {str}:
+            # NumPy converts mixed strings and numbers to strings.
+            array = np.asarray(values, dtype=object)
+
+    if array.ndim != 1 or (
+        len(array) > 0 and array.dtype.kind not in COLUMN_TYPE_TO_DTYPE_KINDS[col_type]
+    ):
+        raise ColumnValueTypeError(
+            errors=[
+                f"Expected {_COLUMN_TYPE_NAMES[col_type]} column values, "
+                f"found {array.dtype} values."
+            ]
+        )
+
+    if col_type == ColumnType.FLOAT:
+        return array.astype(np.float64, copy=False)
+    if col_type == ColumnType.INT:
+        if array.dtype.kind == "u" and len(array) > 0:
+            if array.max() > np.iinfo(np.int64).max:
+                raise ColumnValueTypeError(
+                    errors=["Expected integer column values in the range of int64."]
+                )
+        return array.astype(np.int64, copy=False)
+    if col_type == ColumnType.BOOL:
+        return array.astype(np.bool_, copy=False)
+    return array
+
+
+def _copy_value_rows(
+    col: models.DataColumn, geo_ids: np.ndarray, array: np.ndarray
+) -> bytes:
+    """Encodes a column's values as `(col_id, geo_id, value)` rows of
+    `_value_stage` in the binary `COPY` format (without header or trailer).
+
+    Fixed-width values are encoded straight from their array, without
+    converting each value to a Python object.
+    """
+    value_dtype = _COLUMN_TYPE_TO_COPY_DTYPE.get(col.type)
+    if value_dtype is None:  # strings
+        row_prefix = struct.Struct("!hiiiii")
+        buf = io.BytesIO()
+        for geo_id, value in zip(geo_ids.tolist(), array):
+            encoded = str(value).encode("utf-8")
+            buf.write(row_prefix.pack(3, 4, col.col_id, 4, geo_id, len(encoded)))
+            buf.write(encoded)
+        return buf.getvalue()
+
+    rows = np.empty(
+        len(array),
+        dtype=[
+            ("num_fields", ">i2"),
+            ("col_id_size", ">i4"),
+            ("col_id", ">i4"),
+            ("geo_id_size", ">i4"),
+            ("geo_id", ">i4"),
+            ("value_size", ">i4"),
+            ("value", value_dtype),
+        ],
+    )
+    rows["num_fields"] = 3
+    rows["col_id_size"] = 4
+    rows["col_id"] = col.col_id
+    rows["geo_id_size"] = 4
+    rows["geo_id"] = geo_ids
+    rows["value_size"] = value_dtype.itemsize
+    rows["value"] = array
+    return rows.tobytes()
+
+
 class CRColumn(NamespacedCRBase[models.DataColumn, schemas.ColumnCreate]):
     """CRUD operations and transformations for column metadata."""
 
@@ -175,16 +339,12 @@ class CRColumn(NamespacedCRBase[models.DataColumn, schemas.ColumnCreate]):
         Raises:
             ColumnValueTypeError: If column types do not match expected types.
         """
-        val_column = COLUMN_TYPE_TO_VALUE_COLUMN[col.type]
-        now = datetime.now(timezone.utc)
-
         # Validate column data.
-        rows_dict = {}
-        new_row_pairs = set()
+        values_by_geo_id = {}
         validation_errors = []
         for geo, value in values:
             suffix = f"column value for geography {geo.full_path} found {type(value)}"
-            if geo.geo_id in rows_dict:
+            if geo.geo_id in values_by_geo_id:
                 raise ValueError(f"Duplicate geography path '{geo.path}' found.")
 
             if col.type == ColumnType.FLOAT and isinstance(value, int):
@@ -200,22 +360,196 @@ class CRColumn(NamespacedCRBase[models.DataColumn, schemas.ColumnCreate]):
             elif col.type == ColumnType.BOOL and not isinstance(value, bool):
                 validation_errors.append(f"Expected boolean {suffix}")
             else:
-                rows_dict[geo.geo_id] = {
-                    "col_id": col.col_id,
-                    "geo_id": geo.geo_id,
-                    "meta_id": obj_meta.meta_id,
-                    "valid_from": now,
-                    val_column: value,
-                }
-                new_row_pairs.add((geo.geo_id, value))
+                values_by_geo_id[geo.geo_id] = value
 
         if validation_errors:
             log.error(validation_errors)
             raise ColumnValueTypeError(errors=validation_errors)
 
-        # Add the new column values and invalidate the old ones where present.
-        geo_ids = [geo.geo_id for geo, _ in values]
+        self._insert_values(
+            db,
+            col=col,
+            geo_ids=list(values_by_geo_id.keys()),
+            values=list(values_by_geo_id.values()),
+            obj_meta=obj_meta,
+        )
+
+    def set_columnar_values(
+        self,
+        db: Session,
+        *,
+        col: models.DataColumn,
+        geos: list[models.Geography],
+        values: list | bytes,
+        dtype: str | None,
+        obj_meta: models.ObjectMeta,
+    ) -> None:
+        """Sets column values across geographies from a single array of values.
+
+        Unlike `set_values()`, values are type-checked all at once, by their
+        NumPy dtype (see `column_values_array()`).
 
+        Raises:
+            ColumnValueTypeError: If the values do not match the column type,
+                or there is not exactly one value per geography.
+            ValueError: If a geography is repeated.
+        """
+        self.set_columnar_values_bulk(
+            db, geos=geos, columns=[(col, values, dtype)], obj_meta=obj_meta
+        )
+
+    def set_columnar_values_bulk(
+        self,
+        db: Session,
+        *,
+        geos: list[models.Geography],
+        columns: list[Tuple[models.DataColumn, list | bytes, str | None]],
+        obj_meta: models.ObjectMeta,
+    ) -> None:
+        """Sets the values of several columns across the same geographies.
+
+        Each column's values are given as in `set_columnar_values()`, as
+        `(column, values, dtype)` triples. All columns are type-checked before
+        any values are set.
+
+        Raises:
+            ColumnValueTypeError: If the values of any column do not match the
+                column's type, or there is not exactly one value per geography.
+            ValueError: If a geography is repeated.
+        """
+        geo_ids = set()
+        for geo in geos:
+            if geo.geo_id in geo_ids:
+                raise ValueError(f"Duplicate geography path '{geo.path}' found.")
+            geo_ids.add(geo.geo_id)
+
+        arrays = []
+        validation_errors = []
+        for col, values, dtype in columns:
+            prefix = f'Column "{col.canonical_ref.path}": '
+            try:
+                array = column_values_array(col.type, values, dtype)
+            except ColumnValueTypeError as ex:
+                validation_errors.extend(prefix + error for error in ex.errors)
+                continue
+            if len(array) != len(geos):
+                validation_errors.append(
+                    f"{prefix}Expected {len(geos)} column values, found {len(array)}."
+                )
+                continue
+            arrays.append((col, array))
+
+        if validation_errors:
+            log.error(validation_errors)
+            raise ColumnValueTypeError(errors=validation_errors)
+
+        geo_ids = np.fromiter(
+            (geo.geo_id for geo in geos), dtype=np.int32, count=len(geos)
+        )
+        self._copy_values(db, geo_ids=geo_ids, arrays=arrays, obj_meta=obj_meta)
+
+    def _copy_values(
+        self,
+        db: Session,
+        *,
+        geo_ids: np.ndarray,
+        arrays: list[Tuple[models.DataColumn, np.ndarray]],
+        obj_meta: models.ObjectMeta,
+    ) -> None:
+        """Sets type-checked values of columns for distinct geographies from arrays.
+
+        Like `_insert_values()`, but the values of all columns are staged with
+        binary `COPY` (one `COPY` per value type) and applied with two
+        set-based statements: current values that changed are superseded, and
+        values are inserted for geographies without a current value.
+        """
+        if not arrays:
+            return
+        now = datetime.now(timezone.utc)
+        stage = _value_stage
+        col_ids = [col.col_id for col, _ in arrays]
+        db.execute(create_column_value_partitions_text(col_ids))
+
+        with db.begin(nested=True):
+            conn = db.connection()
+            stage.drop(conn, checkfirst=True)
+            stage.create(conn)
+            cursor = conn.connection.cursor()
+            try:
+                for col_type, val_column in COLUMN_TYPE_TO_VALUE_COLUMN.items():
+                    rows = [
+                        _copy_value_rows(col, geo_ids, array)
+                        for col, array in arrays
+                        if col.type == col_type
+                    ]
+                    if not rows:
+                        continue
+                    cursor.copy_expert(
+                        f"COPY {stage.name} (col_id, geo_id, {val_column}) "
+                        "FROM STDIN WITH (FORMAT binary)",
+                        io.BytesIO(b"".join([_COPY_HEADER, *rows, _COPY_TRAILER])),
+                    )
+            finally:
+                cursor.close()
+
+            value_columns = list(COLUMN_TYPE_TO_VALUE_COLUMN.values())
+            current_value = (
+                models.ColumnValue.col_id.in_(col_ids),
+                models.ColumnValue.col_id == stage.c.col_id,
+                models.ColumnValue.geo_id == stage.c.geo_id,
+                models.ColumnValue.valid_to.is_(None),
+            )
+            db.execute(
+                update(models.ColumnValue)
+                .where(
+                    *current_value,
+                    tuple_(
+                        *(getattr(models.ColumnValue, name) for name in value_columns)
+                    ).is_distinct_from(
+                        tuple_(*(stage.c[name] for name in value_columns))
+                    ),
+                )
+                .values(valid_to=now)
+            )
+            db.execute(
+                insert(models.ColumnValue).from_select(
+                    ["col_id", "geo_id", "meta_id", "valid_from", *value_columns],
+                    select(
+                        stage.c.col_id,
+                        stage.c.geo_id,
+                        literal(obj_meta.meta_id),
+                        literal(now, DateTime(timezone=True)),
+                        *(stage.c[name] for name in value_columns),
+                    ).where(~exists().where(*current_value)),
+                )
+            )
+            stage.drop(conn)
+
+    def _insert_values(
+        self,
+        db: Session,
+        *,
+        col: models.DataColumn,
+        geo_ids: list[int],
+        values: list[Any],
+        obj_meta: models.ObjectMeta,
+    ) -> None:
+        """Sets type-checked column values for distinct geographies."""
+        val_column = COLUMN_TYPE_TO_VALUE_COLUMN[col.type]
+        now = datetime.now(timezone.utc)
+        rows_dict = {
+            geo_id: {
+                "col_id": col.col_id,
+                "geo_id": geo_id,
+                "meta_id": obj_meta.meta_id,
+                "valid_from": now,
+                val_column: value,
+            }
+            for geo_id, value in zip(geo_ids, values)
+        }
+        new_row_pairs = set(zip(geo_ids, values))
+
+        # Add the new column values and invalidate the old ones where present.
         # make sure partition exists for column
         db.execute(create_column_value_partition_text(column_id=col.col_id))
 
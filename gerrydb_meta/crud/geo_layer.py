@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Tuple
 
-from sqlalchemy import exc, insert, update
+from sqlalchemy import Select, exc, insert, select, update
 from sqlalchemy.orm import Session
 
 from gerrydb_meta import models, schemas
@@ -170,5 +170,27 @@ class CRGeoLayer(NamespacedCRBase[models.GeoLayer, schemas.GeoLayerCreate]):
             .first()
         )
 
+    def tile_features(self, *, set_version: models.GeoSetVersion) -> Select:
+        """Selects the paths of the current geographies in a `GeoSetVersion`.
+
+        The query is over `GeoBin` (see `gerrydb_meta.tiles.get_tile()`).
+        """
+        return (
+            select(models.Geography.path)
+            .select_from(models.GeoSetMember)
+            .join(
+                models.GeoVersion,
+                models.GeoVersion.geo_id == models.GeoSetMember.geo_id,
+            )
+            .join(models.Geography, models.Geography.geo_id == models.GeoVersion.geo_id)
+            .join(
+                models.GeoBin, models.GeoBin.geo_bin_id == models.GeoVersion.geo_bin_id
+            )
+            .where(
+                models.GeoSetMember.set_version_id == set_version.set_version_id,
+                models.GeoVersion.valid_to.is_(None),
+            )
+        )
+
 
 geo_layer = CRGeoLayer(models.GeoLayer)
@@ -7,20 +7,30 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from sqlalchemy import (
-    Sequence,
+    and_,
     exc,
+    func,
     or_,
     select,
+    update,
 )
 from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects import postgresql
 
 from gerrydb_meta import models, schemas
-from gerrydb_meta.crud.base import NamespacedCRBase, normalize_path
+from gerrydb_meta.crud.base import NamespacedCRBase, StreamedRows, normalize_path
+from gerrydb_meta.crud.view import (
+    ABANDONED_RENDER_ERROR,
+    MAX_RENDER_ATTEMPTS,
+    RENDER_STALE_AFTER,
+    _simplify_geo_bins,
+)
+from gerrydb_meta.enums import SimplifyLevel
+from gerrydb_meta.storage import RenderStore
 from gerrydb_meta.exceptions import CreateValueError
 from typing import Tuple
-from datetime import datetime
+from datetime import datetime, timedelta
 from uvicorn.config import logger as log
 
 _ST_ASBINARY_REGEX = re.compile(r"ST\_AsBinary\(([a-zA-Z0-9_.]+)\)")
@@ -29,7 +39,7 @@ _ST_ASBINARY_REGEX = re.compile(r"ST\_AsBinary\(([a-zA-Z0-9_.]+)\)")
 @dataclass(frozen=True)
 class GraphRenderContext:
     graph: models.Graph
-    graph_edges: Sequence | None
+    graph_edges: StreamedRows | None
     geo_meta: dict[int, models.ObjectMeta]
     geo_meta_ids: dict[str, int]  # by path
     geo_valid_from_dates: dict[str, datetime]
@@ -154,8 +164,8 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
             .first()
         )
 
-    def _graph_edges(self, db: Session, graph: models.Graph) -> Sequence | None:
-        """Gets graph edges by path, if applicable."""
+    def _graph_edges(self, db: Session, graph: models.Graph) -> StreamedRows | None:
+        """Gets a lazy iterator of graph edges by path, if applicable."""
         log.debug("Getting graph edges for graph %s", graph.graph_id)
         if graph.graph_id is None:  # pragma: no cover
             return None
@@ -181,9 +191,7 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
             )
         )
         log.debug("GRAPH EDGES QUERY %s", graph_edges_query)
-        ret = db.execute(graph_edges_query).fetchall()
-        log.debug("GRAPH EDGES QUERY RET %s", len(ret))
-        return ret
+        return StreamedRows(db, graph_edges_query)
 
     def _geo_meta(
         self, db: Session, graph: models.Graph
@@ -239,7 +247,14 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
 
         return {row.path: row.valid_from for row in result}
 
-    def render(self, db: Session, graph: models.Graph) -> GraphRenderContext:
+    def render(
+        self,
+        db: Session,
+        graph: models.Graph,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
+    ) -> GraphRenderContext:
+        """Generates queries to retrieve graph data (see `CRView.render()`)."""
+        _simplify_geo_bins(db, [graph.set_version_id], graph.created_at, simplify)
         timestamp_clauses = [
             models.GeoVersion.valid_from <= graph.created_at,
             or_(
@@ -268,7 +283,7 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
         geo_query = (
             select(
                 geo_sub.c.path,
-                models.GeoBin.geography,
+                models.simplified_geography(simplify).label("geography"),
             )
             .select_from(models.GeoVersion)
             .join(members_sub, members_sub.c.geo_id == models.GeoVersion.geo_id)
@@ -277,6 +292,7 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
                 models.GeoBin, models.GeoVersion.geo_bin_id == models.GeoBin.geo_bin_id
             )
         )
+        geo_query = models.join_simplified_geography(geo_query, simplify)
 
         geo_query = geo_query.distinct().where(*timestamp_clauses)
 
@@ -343,16 +359,18 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
         graph: models.Graph,
         created_by: models.User,
         render_id: uuid.UUID,
-        path: Path | str,
+        path: Path | str | None,
         status: models.GraphRenderStatus,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.GraphRender:  # pragma: no cover
         """Creates graph render metadata."""
         render = models.GraphRender(
             graph_id=graph.graph_id,
             render_id=render_id,
             created_by=created_by.user_id,
-            path=path,
+            path=None if path is None else str(path),
             status=status,
+            simplify=simplify,
         )
         db.add(render)
         db.flush()
@@ -367,15 +385,24 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
         created_by: models.User,
         render_id: uuid.UUID,
         path: Path | str,
+        store: RenderStore | None = None,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.GraphRender:  # pragma: no cover
-        """Saves metadata for a successful render"""
-        self._create_render(
+        """Saves metadata for a successful render.
+
+        If a render store is provided, the rendered GeoPackage at `path` is
+        added to the store first, and the render's path in the store is saved.
+        """
+        if store is not None:
+            path = store.put(Path(path), render_id=render_id, kind="graph")
+        return self._create_render(
             db=db,
             graph=graph,
             created_by=created_by,
             render_id=render_id,
             path=path,
             status=models.GraphRenderStatus.SUCCEEDED,
+            simplify=simplify,
         )
 
     def queue_render(
@@ -385,7 +412,8 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
         graph: models.Graph,
         created_by: models.User,
         render_id: uuid.UUID,
-        path: Path | str,
+        path: Path | str | None = None,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.GraphRender:  # pragma: no cover
         """Adds a render to the job queue."""
         return self._create_render(
@@ -395,20 +423,159 @@ class CRGraph(NamespacedCRBase[models.Graph, schemas.GraphCreate]):
             render_id=render_id,
             path=path,
             status=models.GraphRenderStatus.PENDING,
+            simplify=simplify,
         )
 
     def get_cached_render(
-        self, db: Session, *, graph: models.Graph
+        self,
+        db: Session,
+        *,
+        graph: models.Graph,
+        store: RenderStore | None = None,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.GraphRender | None:  # pragma: no cover
-        return (
+        render = (
             db.query(models.GraphRender)
             .filter(
                 models.GraphRender.graph_id == graph.graph_id,
                 models.GraphRender.status == models.GraphRenderStatus.SUCCEEDED,
+                models.GraphRender.simplify == simplify,
             )
             .order_by(models.GraphRender.created_at.desc())
             .first()
         )
+        if render is not None and store is not None and not store.contains(render.path):
+            # The artifact was evicted (or saved to a different store).
+            return None
+        return render
+
+    def get_render(
+        self, db: Session, *, render_id: uuid.UUID
+    ) -> models.GraphRender | None:  # pragma: no cover
+        """Retrieves graph render metadata by render ID."""
+        return (
+            db.query(models.GraphRender)
+            .filter(models.GraphRender.render_id == render_id)
+            .first()
+        )
+
+    def get_queued_render(
+        self,
+        db: Session,
+        *,
+        graph: models.Graph,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
+    ) -> models.GraphRender | None:  # pragma: no cover
+        """Retrieves a pending or running render of a graph, if any."""
+        return (
+            db.query(models.GraphRender)
+            .filter(
+                models.GraphRender.graph_id == graph.graph_id,
+                models.GraphRender.simplify == simplify,
+                models.GraphRender.status.in_(
+                    (
+                        models.GraphRenderStatus.PENDING,
+                        models.GraphRenderStatus.RUNNING,
+                    )
+                ),
+            )
+            .order_by(models.GraphRender.created_at.desc())
+            .first()
+        )
+
+    def claim_render(
+        self, db: Session, *, stale_after: timedelta = RENDER_STALE_AFTER
+    ) -> models.GraphRender | None:  # pragma: no cover
+        """Claims the oldest pending (or abandoned) render in the job queue.
+
+        See `CRView.claim_render()`.
+        """
+        while True:
+            render = (
+                db.query(models.GraphRender)
+                .filter(
+                    or_(
+                        models.GraphRender.status == models.GraphRenderStatus.PENDING,
+                        and_(
+                            models.GraphRender.status
+                            == models.GraphRenderStatus.RUNNING,
+                            models.GraphRender.heartbeat_at < func.now() - stale_after,
+                        ),
+                    )
+                )
+                .order_by(models.GraphRender.created_at)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if render is None:
+                return None
+            if render.status == models.GraphRenderStatus.RUNNING:
+                log.warning("Render %s was abandoned.", render.render_id.hex)
+                if render.attempts >= MAX_RENDER_ATTEMPTS:
+                    self.fail_render(
+                        db,
+                        render=render,
+                        error=ABANDONED_RENDER_ERROR.format(attempts=render.attempts),
+                    )
+                    continue
+            render.status = models.GraphRenderStatus.RUNNING
+            render.attempts += 1
+            render.heartbeat_at = func.now()
+            db.flush()
+            return render
+
+    def heartbeat(
+        self, db: Session, *, render_id: uuid.UUID
+    ) -> None:  # pragma: no cover
+        """Records that the worker running a claimed render is still alive."""
+        db.execute(
+            update(models.GraphRender)
+            .where(
+                models.GraphRender.render_id == render_id,
+                models.GraphRender.status == models.GraphRenderStatus.RUNNING,
+            )
+            .values(heartbeat_at=func.now())
+        )
+
+    def finish_render(
+        self, db: Session, *, render: models.GraphRender, path: Path | str
+    ) -> models.GraphRender:  # pragma: no cover
+        """Marks a claimed render as successful."""
+        render.path = str(path)
+        render.status = models.GraphRenderStatus.SUCCEEDED
+        render.error = None
+        db.flush()
+        return render
+
+    def fail_render(
+        self, db: Session, *, render: models.GraphRender, error: str
+    ) -> models.GraphRender:  # pragma: no cover
+        """Marks a claimed render as failed."""
+        render.status = models.GraphRenderStatus.FAILED
+        render.error = error
+        db.flush()
+        return render
+
+    def queue_position(
+        self, db: Session, *, render: models.GraphRender
+    ) -> int:  # pragma: no cover
+        """Counts the pending renders ahead of a render in the job queue."""
+        return (
+            db.query(models.GraphRender)
+            .filter(
+                models.GraphRender.status == models.GraphRenderStatus.PENDING,
+                models.GraphRender.created_at < render.created_at,
+            )
+            .count()
+        )
+
+    def num_pending(self, db: Session) -> int:  # pragma: no cover
+        """Counts the pending renders in the job queue."""
+        return (
+            db.query(models.GraphRender)
+            .filter(models.GraphRender.status == models.GraphRenderStatus.PENDING)
+            .count()
+        )
 
 
 graph = CRGraph(models.Graph)
@@ -1,33 +1,45 @@
 """CRUD operations and transformations for views."""
 
+import hashlib
+import json
 import re
 import uuid
 from collections import defaultdict
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Tuple, Optional
 
 from sqlalchemy import (
-    Sequence,
+    Integer,
+    Select,
+    TableClause,
+    and_,
+    any_,
     exc,
+    exists,
     func,
     label,
+    literal,
     or_,
     select,
+    table,
+    true,
     union,
+    union_all,
     bindparam,
 )
 from sqlalchemy.dialects import postgresql
-from sqlalchemy.orm import Session
-from sqlalchemy import insert
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy import insert, update
 from sqlalchemy.sql import column
 from sqlalchemy.exc import SQLAlchemyError
 
 from gerrydb_meta import models, schemas
-from gerrydb_meta.crud.base import NamespacedCRBase, normalize_path
+from gerrydb_meta.crud.base import NamespacedCRBase, StreamedRows, normalize_path
 from gerrydb_meta.crud.column import COLUMN_TYPE_TO_VALUE_COLUMN
-from gerrydb_meta.enums import ViewRenderStatus
+from gerrydb_meta.enums import SimplifyLevel, ViewRenderStatus
+from gerrydb_meta.storage import RenderStore
 from gerrydb_meta.exceptions import CreateValueError, ViewConflictError
 from uvicorn.config import logger as log
 
@@ -37,6 +49,18 @@ _ST_ASBINARY_REGEX = re.compile(r"ST\_AsBinary\(([a-zA-Z0-9_.]+)\)")
 PLAN_BATCH_SIZE = 10000
 GRAPH_BATCH_SIZE = 100000
 
+# Running background renders without a worker heartbeat for this long were
+# abandoned (the worker crashed, was killed, or was redeployed).
+RENDER_STALE_AFTER = timedelta(minutes=5)
+# Abandoned renders are claimed again until they have been claimed this many
+# times, then marked as failed (so a render that crashes its worker, e.g. by
+# running out of memory, is not retried forever).
+MAX_RENDER_ATTEMPTS = 3
+ABANDONED_RENDER_ERROR = (
+    "Render abandoned by its worker {attempts} times (the worker crashed or "
+    "was stopped)."
+)
+
 
 def _view_columns(
     db: Session, template_version_id: int
@@ -87,6 +111,163 @@ def _view_columns(
     return {col_id_to_alias[col.col_id]: col for col in raw_columns}
 
 
+def _plan_labels(plans: list[models.Plan]) -> list[str]:
+    """Determines the shortest unambiguous label for each plan."""
+    namespaces_by_path = defaultdict(set)
+    for plan in plans:
+        namespaces_by_path[plan.path].add(plan.namespace.path)
+    return [
+        (
+            f"{plan.namespace.path}__{plan.path}"
+            if len(namespaces_by_path[plan.path]) > 1
+            else plan.path
+        )
+        for plan in plans
+    ]
+
+
+def _column_value_partition(col: models.DataColumn) -> TableClause:
+    """Gets the `column_value` partition that holds a column's values."""
+    return table(
+        f"{models.ColumnValue.__tablename__}_{col.col_id}",
+        column("geo_id"),
+        column("valid_from"),
+        column("valid_to"),
+        column(COLUMN_TYPE_TO_VALUE_COLUMN[col.type]),
+        schema=models.SCHEMA,
+    )
+
+
+def _with_column_values(
+    query: Select, geo_id, at: datetime, columns: dict[str, models.DataColumn]
+) -> Select:
+    """Joins the values of `columns` at time `at` onto a query by geography ID.
+
+    Each column's values are read from its own `column_value` partition (so
+    the planner only touches the partitions of the view's columns) and joined
+    on `geo_id`. Values are labeled with their canonical column paths.
+    Geographies without a value in any of `columns` are dropped.
+    """
+    partitions = []
+    for col in columns.values():
+        partition = _column_value_partition(col)
+        query = query.outerjoin(
+            partition,
+            and_(
+                partition.c.geo_id == geo_id,
+                partition.c.valid_from <= at,
+                # Superseded values are valid until (and including) the
+                # `valid_from` of their replacement, so the upper bound is
+                # exclusive here to join at most one value per geography.
+                or_(partition.c.valid_to.is_(None), partition.c.valid_to > at),
+            ),
+        ).add_columns(
+            partition.c[COLUMN_TYPE_TO_VALUE_COLUMN[col.type]].label(
+                col.canonical_ref.path
+            )
+        )
+        partitions.append(partition)
+    if partitions:
+        query = query.where(
+            or_(*(partition.c.geo_id.is_not(None) for partition in partitions))
+        )
+    return query
+
+
+def _has_column_values(geo_id, at: datetime, columns: dict[str, models.DataColumn]):
+    """Filters a query to geographies with a value in any of `columns` at `at`.
+
+    Keeps the same geographies as `_with_column_values()`, without joining
+    the values themselves.
+    """
+    if not columns:
+        return true()
+    return or_(
+        *(
+            exists().where(
+                partition.c.geo_id == geo_id,
+                partition.c.valid_from <= at,
+                or_(partition.c.valid_to.is_(None), partition.c.valid_to > at),
+            )
+            for partition in map(_column_value_partition, columns.values())
+        )
+    )
+
+
+def _simplify_geo_bins(
+    db: Session, set_version_ids: list[int], at: datetime, level: SimplifyLevel
+) -> None:
+    """Stores the simplified geographies of GeoBins that don't have them yet.
+
+    The GeoBins of the geographies in `set_version_ids` at `at` are
+    simplified together, as one coverage, with `ST_CoverageSimplify()`, so
+    edges shared by neighboring geographies stay shared. Once every GeoBin
+    has a simplified geography at `level`, this is a single existence check.
+    GeoBins that are also in other coverages keep their first simplification.
+
+    Simplified geographies are committed immediately, as renders read them
+    from other connections (e.g. `ogr2ogr`).
+    """
+    if level == SimplifyLevel.FULL:
+        return
+    bin_ids = (
+        select(models.GeoVersion.geo_bin_id)
+        .join(
+            models.GeoSetMember,
+            models.GeoSetMember.geo_id == models.GeoVersion.geo_id,
+        )
+        .where(
+            models.GeoSetMember.set_version_id.in_(set_version_ids),
+            models.GeoVersion.valid_from <= at,
+            or_(
+                models.GeoVersion.valid_to.is_(None),
+                models.GeoVersion.valid_to >= at,
+            ),
+        )
+    )
+    bins = (
+        select(models.GeoBin.geo_bin_id, models.GeoBin.geography)
+        .where(models.GeoBin.geo_bin_id.in_(bin_ids))
+        .subquery("bins")
+    )
+    missing = (
+        exists()
+        .select_from(bins)
+        .where(
+            ~exists().where(
+                models.GeoBinSimplified.geo_bin_id == bins.c.geo_bin_id,
+                models.GeoBinSimplified.level == level,
+            )
+        )
+    )
+    if not db.scalar(select(missing)):
+        return
+
+    # The simplification of an edge depends on the geographies that meet at
+    # its ends, so the whole coverage is simplified, not just missing GeoBins.
+    simplified = select(
+        bins.c.geo_bin_id,
+        func.ST_CoverageSimplify(
+            func.geometry(bins.c.geography), models.SIMPLIFY_TOLERANCES[level]
+        )
+        .over()
+        .label("geometry"),
+    ).subquery("simplified")
+    db.execute(
+        postgresql.insert(models.GeoBinSimplified)
+        .from_select(
+            ["geo_bin_id", "level", "geography"],
+            select(
+                simplified.c.geo_bin_id,
+                literal(level, models.GeoBinSimplified.level.type),
+                func.geography(simplified.c.geometry),
+            ),
+        )
+        .on_conflict_do_nothing()
+    )
+    db.commit()
+
+
 @dataclass(frozen=True)
 class ViewRenderContext:
     """Context for rendering a view's data and metadata."""
@@ -95,8 +276,8 @@ class ViewRenderContext:
     columns: dict[str, models.DataColumn]
     plans: list[models.Plan]
     plan_labels: list[str]
-    plan_assignments: Sequence | None
-    graph_edges: Sequence | None
+    plan_assignments: StreamedRows | None
+    graph_edges: StreamedRows | None
     geo_meta: dict[int, models.ObjectMeta]
     geo_meta_ids: dict[str, int]  # by path
     geo_valid_from_dates: dict[str, datetime]
@@ -104,11 +285,174 @@ class ViewRenderContext:
     # Bulk queries for `ogr2ogr`.
     geo_query: str
     internal_point_query: str
+    base_geo_query: str  # `geo_query` without tabular columns
+
+    # Expected number of geographies in the render (fewer than the view's
+    # `num_geos` if the render is restricted to a subset of its geographies).
+    num_geos: int
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"ViewRenderContext(view={self.view.path}, columns={list(self.columns.keys())})"
 
 
+@dataclass(frozen=True)
+class _ViewGeographies:
+    """The geographies of a view at the view's timestamp."""
+
+    set_version_ids: list[int]
+    geo_ids: list[int]
+    meta_ids: dict[str, int]  # by path
+    valid_from_dates: dict[str, datetime]  # by path
+
+
+@dataclass(frozen=True)
+class ViewRenderSubset:
+    """The part of a view to render.
+
+    Unset fields are unrestricted, so `ViewRenderSubset()` is a full render.
+    A subset is part of a render's cache key (see `key()`).
+    """
+
+    columns: tuple[str, ...] | None = None  # column aliases
+    paths: tuple[str, ...] | None = None  # geography paths
+    # (min_x, min_y, max_x, max_y), in the coordinates of `GeoBin.geography`.
+    bbox: tuple[float, float, float, float] | None = None
+
+    @property
+    def filters_geographies(self) -> bool:
+        return self.paths is not None or self.bbox is not None
+
+    def key(self) -> dict | None:
+        """Canonical form of the subset, or `None` for a full render."""
+        if self.columns is None and not self.filters_geographies:
+            return None
+        return {
+            "columns": None if self.columns is None else sorted(set(self.columns)),
+            "paths": None if self.paths is None else sorted(set(self.paths)),
+            "bbox": None if self.bbox is None else [float(v) for v in self.bbox],
+        }
+
+    @classmethod
+    def from_key(cls, key: dict | None) -> "ViewRenderSubset":
+        if key is None:
+            return cls()
+        return cls(
+            **{
+                field: None if key.get(field) is None else tuple(key[field])
+                for field in ("columns", "paths", "bbox")
+            }
+        )
+
+    def select_columns(
+        self, columns: dict[str, models.DataColumn]
+    ) -> dict[str, models.DataColumn]:
+        """Restricts a view's columns (by alias) to the subset, in view order."""
+        if self.columns is None:
+            return columns
+        return {alias: col for alias, col in columns.items() if alias in self.columns}
+
+    def restrict(self, query: Select, path) -> Select:
+        """Restricts a query over `GeoBin` to the subset's geographies.
+
+        The bounding box is matched with `&&`, which uses the spatial index on
+        `geo_bin.geography`.
+        """
+        if self.paths is not None:
+            query = query.where(path.in_(self.paths))
+        if self.bbox is not None:
+            query = query.where(
+                models.GeoBin.geography.op("&&")(
+                    func.geography(
+                        func.ST_MakeEnvelope(
+                            *self.bbox, models.GeoBin.geography.type.srid
+                        )
+                    )
+                )
+            )
+        return query
+
+
+FULL_RENDER = ViewRenderSubset()
+
+
+@dataclass(frozen=True)
+class ViewRenderChanges:
+    """Tabular differences between a view's data and a previous render of it."""
+
+    columns: list[str]  # layer column names (canonical column paths)
+    geo_attrs: bool
+    plans: bool
+
+
+@dataclass(frozen=True)
+class ViewRenderManifest:
+    """Fingerprints of the data that goes into a view render.
+
+    Each fingerprint is an MD5 digest of the versions of some of the view's
+    inputs (row counts and latest `valid_from` dates, not values), so two
+    renders of a view are interchangeable if their manifests are equal.
+    Versioned data is never changed in place, so the versions visible at the
+    view's timestamp only change when rows are added or superseded.
+    """
+
+    geometry: str | None  # paths and geometries of the view's geographies
+    columns: dict[str, str | None]  # column values by layer column name
+    geo_meta: str | None  # metadata IDs of the view's geographies
+    geo_valid_from: str | None  # valid dates of the view's geographies
+    plans: dict[str, str | None]  # plan assignments by plan label
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, manifest: dict) -> "ViewRenderManifest":
+        return cls(**manifest)
+
+    def changes_since(self, previous: dict | None) -> ViewRenderChanges | None:
+        """Determines which tabular data changed since a previous render.
+
+        Returns:
+            The changes, or `None` if the previous render cannot be updated
+            in place (because it has no manifest, or because the view's
+            geometries or set of columns differ).
+        """
+        if previous is None:
+            return None
+        previous = ViewRenderManifest.from_dict(previous)
+        if (
+            previous.geometry != self.geometry
+            or previous.columns.keys() != self.columns.keys()
+        ):
+            return None
+        return ViewRenderChanges(
+            columns=[
+                name
+                for name, digest in self.columns.items()
+                if previous.columns[name] != digest
+            ],
+            geo_attrs=(
+                previous.geo_meta != self.geo_meta
+                or previous.geo_valid_from != self.geo_valid_from
+            ),
+            plans=previous.plans != self.plans,
+        )
+
+
+def _fingerprint(*parts) -> str:
+    """Hashes the (JSON-serializable) parts of a fingerprint into an MD5 digest."""
+    return hashlib.md5(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _subset_key_clause(subset: ViewRenderSubset):
+    """Matches the renders of a view subset (see `ViewRenderSubset.key()`)."""
+    key = subset.key()
+    if key is None:
+        return models.ViewRender.subset.is_(None)
+    return models.ViewRender.subset == key
+
+
 class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
     def __get_all_path_hashes_in_set_version(
         self, db: Session, valid_at: datetime, set_version_id: int
@@ -598,16 +942,22 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
         view: models.View,
         created_by: models.User,
         render_id: uuid.UUID,
-        path: Path | str,
+        path: Path | str | None,
         status: ViewRenderStatus,
+        manifest: ViewRenderManifest | None = None,
+        subset: ViewRenderSubset = FULL_RENDER,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.ViewRender:
         """Creates view render metadata."""
         render = models.ViewRender(
             view_id=view.view_id,
             render_id=render_id,
             created_by=created_by.user_id,
-            path=path,
+            path=None if path is None else str(path),
             status=status,
+            manifest=None if manifest is None else manifest.to_dict(),
+            subset=subset.key(),
+            simplify=simplify,
         )
         db.add(render)
         db.flush()
@@ -622,8 +972,18 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
         created_by: models.User,
         render_id: uuid.UUID,
         path: Path | str,
+        store: RenderStore | None = None,
+        manifest: ViewRenderManifest | None = None,
+        subset: ViewRenderSubset = FULL_RENDER,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.ViewRender:
-        """Saves metadata for a successful render."""
+        """Saves metadata for a successful render.
+
+        If a render store is provided, the rendered GeoPackage at `path` is
+        added to the store first, and the render's path in the store is saved.
+        """
+        if store is not None:
+            path = store.put(Path(path), render_id=render_id, kind="view")
         return self._create_render(
             db=db,
             view=view,
@@ -631,6 +991,9 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
             render_id=render_id,
             path=path,
             status=ViewRenderStatus.SUCCEEDED,
+            manifest=manifest,
+            subset=subset,
+            simplify=simplify,
         )
 
     def queue_render(
@@ -640,8 +1003,10 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
         view: models.View,
         created_by: models.User,
         render_id: uuid.UUID,
-        path: Path | str,
-    ) -> models.ViewRender:  # pragma: no cover
+        path: Path | str | None = None,
+        subset: ViewRenderSubset = FULL_RENDER,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
+    ) -> models.ViewRender:
         """Adds a render to the job queue."""
         return self._create_render(
             db=db,
@@ -650,39 +1015,202 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
             render_id=render_id,
             path=path,
             status=ViewRenderStatus.PENDING,
+            subset=subset,
+            simplify=simplify,
         )
 
     def get_cached_render(
-        self, db: Session, *, view: models.View
+        self,
+        db: Session,
+        *,
+        view: models.View,
+        store: RenderStore | None = None,
+        manifest: ViewRenderManifest | None = None,
+        subset: ViewRenderSubset = FULL_RENDER,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
     ) -> models.ViewRender | None:
-        """Retrieves metadata for a cached view render, if available."""
-        return (
+        """Retrieves metadata for a cached view render, if available.
+
+        Only renders of the same subset of the view (at the same
+        simplification level) are considered. If a
+        manifest is provided, the latest render is only returned if it was
+        rendered from the same data.
+        """
+        render = (
             db.query(models.ViewRender)
             .filter(
                 models.ViewRender.view_id == view.view_id,
                 models.ViewRender.status == ViewRenderStatus.SUCCEEDED,
+                _subset_key_clause(subset),
+                models.ViewRender.simplify == simplify,
             )
             .order_by(models.ViewRender.created_at.desc())
             .first()
         )
+        if render is not None and store is not None and not store.contains(render.path):
+            # The artifact was evicted (or saved to a different store).
+            return None
+        if (
+            render is not None
+            and manifest is not None
+            and render.manifest != manifest.to_dict()
+        ):
+            return None
+        return render
 
-    def render(self, db: Session, *, view: models.View) -> ViewRenderContext:
-        """Generates queries to retrieve view data.
+    def get_render(
+        self, db: Session, *, render_id: uuid.UUID
+    ) -> models.ViewRender | None:
+        """Retrieves view render metadata by render ID."""
+        return (
+            db.query(models.ViewRender)
+            .filter(models.ViewRender.render_id == render_id)
+            .first()
+        )
 
-        Used for bulk exports via `ogr2ogr`.
+    def get_queued_render(
+        self,
+        db: Session,
+        *,
+        view: models.View,
+        subset: ViewRenderSubset = FULL_RENDER,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
+    ) -> models.ViewRender | None:
+        """Retrieves a pending or running render of (a subset of) a view, if any."""
+        return (
+            db.query(models.ViewRender)
+            .filter(
+                models.ViewRender.view_id == view.view_id,
+                _subset_key_clause(subset),
+                models.ViewRender.simplify == simplify,
+                models.ViewRender.status.in_(
+                    (ViewRenderStatus.PENDING, ViewRenderStatus.RUNNING)
+                ),
+            )
+            .order_by(models.ViewRender.created_at.desc())
+            .first()
+        )
+
+    def claim_render(
+        self, db: Session, *, stale_after: timedelta = RENDER_STALE_AFTER
+    ) -> models.ViewRender | None:
+        """Claims the oldest pending (or abandoned) render in the job queue.
+
+        Rows are locked with `FOR UPDATE SKIP LOCKED`, so concurrent workers
+        never claim the same render. Running renders without a heartbeat (see
+        `heartbeat()`) in `stale_after` are claimed again, or marked as failed
+        after `MAX_RENDER_ATTEMPTS` claims. The claimed render is marked as
+        running; the caller is responsible for committing the claim.
         """
-        log.debug("TOP OF CR RENDER")
-        columns = _view_columns(db, view.template_version_id)
+        while True:
+            render = (
+                db.query(models.ViewRender)
+                .filter(
+                    or_(
+                        models.ViewRender.status == ViewRenderStatus.PENDING,
+                        and_(
+                            models.ViewRender.status == ViewRenderStatus.RUNNING,
+                            models.ViewRender.heartbeat_at < func.now() - stale_after,
+                        ),
+                    )
+                )
+                .order_by(models.ViewRender.created_at)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if render is None:
+                return None
+            if render.status == ViewRenderStatus.RUNNING:
+                log.warning("Render %s was abandoned.", render.render_id.hex)
+                if render.attempts >= MAX_RENDER_ATTEMPTS:
+                    self.fail_render(
+                        db,
+                        render=render,
+                        error=ABANDONED_RENDER_ERROR.format(attempts=render.attempts),
+                    )
+                    continue
+            render.status = ViewRenderStatus.RUNNING
+            render.attempts += 1
+            render.heartbeat_at = func.now()
+            db.flush()
+            return render
+
+    def heartbeat(self, db: Session, *, render_id: uuid.UUID) -> None:
+        """Records that the worker running a claimed render is still alive."""
+        db.execute(
+            update(models.ViewRender)
+            .where(
+                models.ViewRender.render_id == render_id,
+                models.ViewRender.status == ViewRenderStatus.RUNNING,
+            )
+            .values(heartbeat_at=func.now())
+        )
 
-        view_set_version_ids = [
-            item[0]
-            for item in (
-                db.query(models.ViewGeoSetVersions.set_version_id)
-                .filter(models.ViewGeoSetVersions.view_id == view.view_id)
-                .distinct()
-                .all()
+    def finish_render(
+        self,
+        db: Session,
+        *,
+        render: models.ViewRender,
+        path: Path | str,
+        manifest: ViewRenderManifest | None = None,
+    ) -> models.ViewRender:
+        """Marks a claimed render as successful."""
+        render.path = str(path)
+        render.manifest = None if manifest is None else manifest.to_dict()
+        render.status = ViewRenderStatus.SUCCEEDED
+        render.error = None
+        db.flush()
+        return render
+
+    def fail_render(
+        self, db: Session, *, render: models.ViewRender, error: str
+    ) -> models.ViewRender:
+        """Marks a claimed render as failed."""
+        render.status = ViewRenderStatus.FAILED
+        render.error = error
+        db.flush()
+        return render
+
+    def queue_position(self, db: Session, *, render: models.ViewRender) -> int:
+        """Counts the pending renders ahead of a render in the job queue."""
+        return (
+            db.query(models.ViewRender)
+            .filter(
+                models.ViewRender.status == ViewRenderStatus.PENDING,
+                models.ViewRender.created_at < render.created_at,
             )
-        ]
+            .count()
+        )
+
+    def num_pending(self, db: Session) -> int:
+        """Counts the pending renders in the job queue."""
+        return (
+            db.query(models.ViewRender)
+            .filter(models.ViewRender.status == ViewRenderStatus.PENDING)
+            .count()
+        )
+
+    def render(
+        self,
+        db: Session,
+        *,
+        view: models.View,
+        subset: ViewRenderSubset = FULL_RENDER,
+        simplify: SimplifyLevel = SimplifyLevel.FULL,
+    ) -> ViewRenderContext:
+        """Generates queries to retrieve view data.
+
+        Used for bulk exports via `ogr2ogr`. If `subset` restricts the view's
+        columns or geographies, all queries (including plan assignments and
+        graph edges) are restricted accordingly. Geometries are read at the
+        `simplify` level of each GeoBin, which is computed (for the whole
+        view) on first use.
+        """
+        log.debug("TOP OF CR RENDER")
+        columns = subset.select_columns(_view_columns(db, view.template_version_id))
+        geographies = self._geographies(db, view, subset)
+        view_set_version_ids = geographies.set_version_ids
+        _simplify_geo_bins(db, view_set_version_ids, view.at, simplify)
 
         members_sub = (
             select(
@@ -698,36 +1226,6 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
             .subquery("geo_sub")
         )
 
-        agg_selects = []
-        column_labels = []
-        col_ids = []
-        for _, col in columns.items():
-            agg_selects.append(
-                func.max(column(COLUMN_TYPE_TO_VALUE_COLUMN[col.type]))
-                .filter(models.ColumnValue.col_id == col.col_id)
-                .label(col.canonical_ref.path)
-            )
-            column_labels.append(column(col.canonical_ref.path))
-            col_ids.append(col.col_id)
-
-        column_sub = (
-            select(models.Geography.path, *agg_selects)
-            .select_from(models.ColumnValue)
-            .join(
-                models.Geography, models.ColumnValue.geo_id == models.Geography.geo_id
-            )
-            .where(
-                models.ColumnValue.col_id.in_(col_ids),
-                models.ColumnValue.valid_from <= view.at,
-                or_(
-                    models.ColumnValue.valid_to.is_(None),
-                    models.ColumnValue.valid_to >= view.at,
-                ),
-            )
-            .group_by(models.Geography.path)
-            .subquery("column_value")
-        )
-
         timestamp_clauses = [
             models.GeoVersion.valid_from <= view.at,
             or_(
@@ -739,8 +1237,7 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
         geo_query = (
             select(
                 geo_sub.c.path,
-                models.GeoBin.geography,
-                *column_labels,
+                models.simplified_geography(simplify).label("geography"),
             )
             .select_from(models.GeoVersion)
             .join(
@@ -752,8 +1249,14 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
                 models.GeoBin, models.GeoVersion.geo_bin_id == models.GeoBin.geo_bin_id
             )
         )
+        geo_query = models.join_simplified_geography(geo_query, simplify)
+        geo_query = subset.restrict(geo_query, geo_sub.c.path)
+        # Geometries only (no tabular data), for cached base layers.
+        base_geo_query = geo_query.distinct().where(*timestamp_clauses)
 
-        geo_query = geo_query.join(column_sub, column_sub.c.path == geo_sub.c.path)
+        geo_query = _with_column_values(
+            geo_query, models.GeoVersion.geo_id, view.at, columns
+        )
         geo_query = geo_query.distinct().where(*timestamp_clauses)
 
         internal_point_query = (
@@ -771,12 +1274,16 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
                 models.GeoBin, models.GeoVersion.geo_bin_id == models.GeoBin.geo_bin_id
             )
             .distinct()
-            .where(*timestamp_clauses)
+            .where(
+                *timestamp_clauses,
+                # Internal points are only rendered for geographies in `geo_query`.
+                _has_column_values(models.GeoVersion.geo_id, view.at, columns),
+            )
         )
+        internal_point_query = subset.restrict(internal_point_query, geo_sub.c.path)
 
-        plans, plan_labels, plan_assignments = self._plans(db, view)
-        geo_meta_ids, geo_meta = self._geo_meta(db, view)
-        geo_valid_from_dates = self._geo_valid_dates(db, view)
+        plans, plan_labels, plan_assignments = self._plans(db, view, geographies)
+        geo_meta = self._geo_meta(db, geographies)
 
         # Query generation: substitute in literals and remove the
         # ST_AsBinary() calls added by GeoAlchemy2.
@@ -805,107 +1312,324 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
         )
 
         log.debug("The new internal point query is %s", full_internal_point_query)
+
+        full_base_geo_query = re.sub(
+            _ST_ASBINARY_REGEX,
+            r"\1",
+            str(
+                base_geo_query.compile(
+                    dialect=postgresql.dialect(),
+                    compile_kwargs={"literal_binds": True},
+                )
+            ),
+        )
         ret = ViewRenderContext(
             view=view,
             columns=columns,
             plans=plans,
             plan_labels=plan_labels,
             plan_assignments=plan_assignments,
-            graph_edges=self._graph_edges(db, view),
+            graph_edges=self._graph_edges(
+                db, view, geographies if subset.filters_geographies else None
+            ),
             geo_meta=geo_meta,
-            geo_meta_ids=geo_meta_ids,
-            geo_valid_from_dates=geo_valid_from_dates,
+            geo_meta_ids=geographies.meta_ids,
+            geo_valid_from_dates=geographies.valid_from_dates,
             geo_query=full_geo_query,
             internal_point_query=full_internal_point_query,
+            base_geo_query=full_base_geo_query,
+            num_geos=(
+                len(geographies.geo_ids)
+                if subset.filters_geographies
+                else view.num_geos
+            ),
         )
         return ret
 
-    def _geo_meta(
-        self, db: Session, view: models.View
-    ) -> tuple[dict[str, int], dict[int, models.ObjectMeta]]:
-        """Gets object metadata associated with a view's geographies.
-
-        Returns:
-            (1) Mapping from geography paths to metadata IDs.
-            (2) Mapping from metadata IDs to metadata objects.
+    def render_manifest(
+        self,
+        db: Session,
+        *,
+        view: models.View,
+        subset: ViewRenderSubset = FULL_RENDER,
+    ) -> ViewRenderManifest:
+        """Fingerprints the data that goes into a render of (a subset of) a view.
+
+        Only row counts and latest `valid_from` dates are aggregated (one
+        query over the view's geographies, one over the partitions of its
+        columns, and one over its plans' assignments), so this is cheap enough
+        to run before every cache lookup.
         """
-        view_set_version_ids = [
-            item[0]
-            for item in (
-                db.query(models.ViewGeoSetVersions.set_version_id)
-                .filter(models.ViewGeoSetVersions.view_id == view.view_id)
-                .distinct()
-                .all()
-            )
-        ]
-
+        view_set_version_ids = self._set_version_ids(db, view)
         members_sub = (
             select(models.GeoSetMember.geo_id)
-            .filter(models.GeoSetMember.set_version_id.in_(view_set_version_ids))
-            .subquery()
+            .where(models.GeoSetMember.set_version_id.in_(view_set_version_ids))
+            .scalar_subquery()
         )
-        raw_geo_meta_ids = db.execute(
-            select(models.Geography.path, models.Geography.meta_id).join(
-                members_sub, members_sub.c.geo_id == models.Geography.geo_id
+        # Subsets of the same size share counts and dates, so the geometry
+        # fingerprint (which keys base layers) includes the geography filter.
+        subset_geos = {"paths": subset.paths, "bbox": subset.bbox}
+
+        geo_versions = (
+            select()
+            .select_from(models.GeoVersion)
+            .join(models.Geography, models.Geography.geo_id == models.GeoVersion.geo_id)
+            .join(
+                models.GeoBin, models.GeoBin.geo_bin_id == models.GeoVersion.geo_bin_id
+            )
+            .where(
+                models.GeoVersion.geo_id.in_(members_sub),
+                models.GeoVersion.valid_from <= view.at,
+                or_(
+                    models.GeoVersion.valid_to.is_(None),
+                    models.GeoVersion.valid_to >= view.at,
+                ),
             )
-        ).fetchall()
-        geo_meta_ids = {row.path: row.meta_id for row in raw_geo_meta_ids}
+        )
+        geo_versions = subset.restrict(geo_versions, models.Geography.path)
+        num_geos, geo_valid_from, max_geo_bin_id, max_meta_id = db.execute(
+            geo_versions.add_columns(
+                func.count(),
+                func.max(models.GeoVersion.valid_from),
+                func.max(models.GeoVersion.geo_bin_id),
+                func.max(models.Geography.meta_id),
+            )
+        ).one()
+        # Base layers cached on disk (see `gerrydb_meta.render.base_layer_id()`)
+        # can outlive a database, so geometries are also fingerprinted by
+        # their latest import date rather than by IDs alone.
+        geometry = (
+            _fingerprint(
+                sorted(view_set_version_ids),
+                subset_geos,
+                num_geos,
+                geo_valid_from,
+                max_geo_bin_id,
+            )
+            if num_geos
+            else None
+        )
+        # Tabular data is only fingerprinted for the subset's geographies.
+        subset_geo_ids = (
+            geo_versions.add_columns(models.GeoVersion.geo_id)
+            if subset.filters_geographies
+            else None
+        )
 
-        distinct_meta_ids = set(geo_meta_ids.values())
-        raw_distinct_meta = (
-            db.query(models.ObjectMeta)
-            .where(models.ObjectMeta.meta_id.in_(distinct_meta_ids))
-            .all()
+        columns = subset.select_columns(_view_columns(db, view.template_version_id))
+        column_versions = []
+        for col in columns.values():
+            partition = _column_value_partition(col)
+            col_query = select(
+                literal(col.col_id, Integer).label("col_id"),
+                func.count().label("num_values"),
+                func.max(partition.c.valid_from).label("valid_from"),
+            ).where(
+                partition.c.valid_from <= view.at,
+                # Exclusive, as in `_with_column_values()`.
+                or_(partition.c.valid_to.is_(None), partition.c.valid_to > view.at),
+            )
+            if subset_geo_ids is not None:
+                col_query = col_query.where(partition.c.geo_id.in_(subset_geo_ids))
+            column_versions.append(col_query)
+        col_id_to_name = {
+            col.col_id: col.canonical_ref.path for col in columns.values()
+        }
+        column_digests = dict.fromkeys(col_id_to_name.values())
+        if column_versions:
+            for col_id, num_values, valid_from in db.execute(
+                union_all(*column_versions)
+            ):
+                column_digests[col_id_to_name[col_id]] = _fingerprint(
+                    col_id, num_values, valid_from
+                )
+
+        visible_plans = self._visible_plans(db, view, view_set_version_ids)
+        plan_id_to_label = {
+            plan.plan_id: label
+            for plan, label in zip(visible_plans, _plan_labels(visible_plans))
+        }
+        plan_digests = dict.fromkeys(plan_id_to_label.values())
+        # Plans are not versioned (their assignments never change).
+        plan_count_query = (
+            select(models.PlanAssignment.plan_id, func.count())
+            .where(models.PlanAssignment.plan_id.in_(list(plan_id_to_label)))
+            .group_by(models.PlanAssignment.plan_id)
         )
-        distinct_meta = {meta.meta_id: meta for meta in raw_distinct_meta}
+        if subset_geo_ids is not None:
+            plan_count_query = plan_count_query.where(
+                models.PlanAssignment.geo_id.in_(subset_geo_ids)
+            )
+        for plan_id, num_assignments in db.execute(plan_count_query):
+            plan_digests[plan_id_to_label[plan_id]] = _fingerprint(
+                plan_id, num_assignments
+            )
 
-        return geo_meta_ids, distinct_meta
+        return ViewRenderManifest(
+            geometry=geometry,
+            columns=column_digests,
+            geo_meta=_fingerprint(num_geos, max_meta_id) if num_geos else None,
+            geo_valid_from=(
+                _fingerprint(num_geos, geo_valid_from) if num_geos else None
+            ),
+            plans=plan_digests,
+        )
 
-    def _geo_valid_dates(self, db: Session, view: models.View) -> dict[str, datetime]:
-        """Gets the valid dates for each geometry.
+    def columns(
+        self, db: Session, *, view: models.View
+    ) -> dict[str, models.DataColumn]:
+        """Gets the columns of a view by alias."""
+        return _view_columns(db, view.template_version_id)
 
-        Returns:
-            A dictionary mapping geometry IDs to valid dates.
-        """
-        view_set_version_ids = [
-            item[0]
-            for item in (
-                db.query(models.ViewGeoSetVersions.set_version_id)
-                .filter(models.ViewGeoSetVersions.view_id == view.view_id)
-                .distinct()
-                .all()
-            )
-        ]
+    def tile_features(
+        self, db: Session, *, view: models.View, columns: dict[str, models.DataColumn]
+    ) -> Select:
+        """Selects the paths of a view's geographies and their values of `columns`.
 
+        The query is over `GeoBin` (see `gerrydb_meta.tiles.get_tile()`).
+        """
+        members_sub = select(models.GeoSetMember.geo_id).where(
+            models.GeoSetMember.set_version_id.in_(self._set_version_ids(db, view))
+        )
         query = (
-            select(models.Geography.path, models.GeoVersion.valid_from)
+            select(models.Geography.path)
+            .select_from(models.GeoVersion)
+            .join(models.Geography, models.Geography.geo_id == models.GeoVersion.geo_id)
             .join(
-                models.GeoSetMember,
-                models.Geography.geo_id == models.GeoSetMember.geo_id,
+                models.GeoBin, models.GeoBin.geo_bin_id == models.GeoVersion.geo_bin_id
             )
-            .join(
-                models.GeoVersion, models.Geography.geo_id == models.GeoVersion.geo_id
+            .where(
+                models.GeoVersion.geo_id.in_(members_sub),
+                models.GeoVersion.valid_from <= view.at,
+                or_(
+                    models.GeoVersion.valid_to.is_(None),
+                    models.GeoVersion.valid_to >= view.at,
+                ),
             )
-            .where(models.GeoSetMember.set_version_id.in_(view_set_version_ids))
         )
+        return _with_column_values(query, models.GeoVersion.geo_id, view.at, columns)
 
-        result = db.execute(query)
+    def column_values(
+        self,
+        db: Session,
+        *,
+        view: models.View,
+        columns: dict[str, models.DataColumn],
+        subset: ViewRenderSubset = FULL_RENDER,
+    ) -> StreamedRows:
+        """Gets a lazy iterator of a view's values of `columns` by path.
 
-        return {row.path: row.valid_from for row in result}
+        Rows are of the form `(path, *values)`, in the order of `columns`.
+        Only the geographies in `subset` are included.
+        """
+        members_sub = select(models.GeoSetMember.geo_id).where(
+            models.GeoSetMember.set_version_id.in_(self._set_version_ids(db, view))
+        )
+        query = select(models.Geography.path).where(
+            models.Geography.geo_id.in_(members_sub)
+        )
+        if subset.bbox is not None:
+            query = query.join(
+                models.GeoVersion,
+                and_(
+                    models.GeoVersion.geo_id == models.Geography.geo_id,
+                    models.GeoVersion.valid_from <= view.at,
+                    or_(
+                        models.GeoVersion.valid_to.is_(None),
+                        models.GeoVersion.valid_to >= view.at,
+                    ),
+                ),
+            ).join(
+                models.GeoBin, models.GeoBin.geo_bin_id == models.GeoVersion.geo_bin_id
+            )
+        query = subset.restrict(query, models.Geography.path)
+        return StreamedRows(
+            db, _with_column_values(query, models.Geography.geo_id, view.at, columns)
+        )
 
-    def _plans(
-        self, db: Session, view: models.View
-    ) -> tuple[list[models.Plan], list[str], Sequence | None]:
-        """Gets plans associated with a view.
+    def _geographies(
+        self, db: Session, view: models.View, subset: ViewRenderSubset = FULL_RENDER
+    ) -> _ViewGeographies:
+        """Resolves a view's set versions and geographies in one query.
 
-        Returns:
-            (1) A list of plans compatible with the view.
-                (These plans also satisfy the view's public join constraint.)
-            (2) A list of column labels for the plans.
-            (3) A database iterator for the plan assignments, if any assignments
-                are available.
+        Only the geography versions valid at the view's timestamp (and the
+        geographies in `subset`) are considered. All of the view's set
+        versions are returned regardless.
         """
-        view_set_version_ids = [
+        geo_versions = (
+            select(
+                models.GeoVersion.geo_id,
+                models.GeoVersion.valid_from,
+                models.Geography.path,
+                models.Geography.meta_id,
+            )
+            .join(models.Geography, models.Geography.geo_id == models.GeoVersion.geo_id)
+            .where(
+                models.GeoVersion.valid_from <= view.at,
+                or_(
+                    models.GeoVersion.valid_to.is_(None),
+                    models.GeoVersion.valid_to >= view.at,
+                ),
+            )
+        )
+        if subset.bbox is not None:
+            geo_versions = geo_versions.join(
+                models.GeoBin, models.GeoBin.geo_bin_id == models.GeoVersion.geo_bin_id
+            )
+        geo_versions = subset.restrict(geo_versions, models.Geography.path).subquery(
+            "geo_versions"
+        )
+        rows = db.execute(
+            select(
+                models.ViewGeoSetVersions.set_version_id,
+                geo_versions.c.geo_id,
+                geo_versions.c.path,
+                geo_versions.c.meta_id,
+                geo_versions.c.valid_from,
+            )
+            .select_from(models.ViewGeoSetVersions)
+            .outerjoin(
+                models.GeoSetMember,
+                models.GeoSetMember.set_version_id
+                == models.ViewGeoSetVersions.set_version_id,
+            )
+            .outerjoin(
+                geo_versions, geo_versions.c.geo_id == models.GeoSetMember.geo_id
+            )
+            .where(models.ViewGeoSetVersions.view_id == view.view_id)
+        )
+
+        set_version_ids = {}
+        geo_ids = {}
+        meta_ids = {}
+        valid_from_dates = {}
+        for row in rows:
+            set_version_ids[row.set_version_id] = None
+            if row.geo_id is not None:
+                geo_ids[row.geo_id] = None
+                meta_ids[row.path] = row.meta_id
+                valid_from_dates[row.path] = row.valid_from
+        return _ViewGeographies(
+            set_version_ids=list(set_version_ids),
+            geo_ids=list(geo_ids),
+            meta_ids=meta_ids,
+            valid_from_dates=valid_from_dates,
+        )
+
+    def _geo_meta(
+        self, db: Session, geographies: _ViewGeographies
+    ) -> dict[int, models.ObjectMeta]:
+        """Gets the object metadata of a view's geographies by metadata ID."""
+        raw_distinct_meta = (
+            db.query(models.ObjectMeta)
+            .where(models.ObjectMeta.meta_id.in_(set(geographies.meta_ids.values())))
+            .all()
+        )
+        return {meta.meta_id: meta for meta in raw_distinct_meta}
+
+    def _set_version_ids(self, db: Session, view: models.View) -> list[int]:
+        """Gets the IDs of the geography set versions in a view."""
+        return [
             item[0]
             for item in (
                 db.query(models.ViewGeoSetVersions.set_version_id)
@@ -915,9 +1639,15 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
             )
         ]
 
+    def _visible_plans(
+        self, db: Session, view: models.View, view_set_version_ids: list[int]
+    ) -> list[models.Plan]:
+        """Gets plans compatible with a view that satisfy its public join constraint."""
         # Get plans that existed when the view was created.
         plans = (
             db.query(models.Plan)
+            # Assignments are streamed separately (see `_plans()`).
+            .options(lazyload(models.Plan.assignments))
             .filter(
                 models.Plan.set_version_id.in_(view_set_version_ids),
                 models.Plan.created_at <= view.at,
@@ -925,7 +1655,7 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
             .all()
         )
         # Apply the public join constraint: don't leak any private plans.
-        visible_plans = [
+        return [
             plan
             for plan in plans
             if (
@@ -934,25 +1664,28 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
             )
         ]
 
+    def _plans(
+        self, db: Session, view: models.View, geographies: _ViewGeographies
+    ) -> tuple[list[models.Plan], list[str], StreamedRows | None]:
+        """Gets plans associated with a view.
+
+        Returns:
+            (1) A list of plans compatible with the view.
+                (These plans also satisfy the view's public join constraint.)
+            (2) A list of column labels for the plans.
+            (3) A lazy database iterator for the plan assignments, if any
+                assignments are available.
+        """
+        visible_plans = self._visible_plans(db, view, geographies.set_version_ids)
+
         # Get plan assignments as a table.
-        plan_labels = []
         if len(visible_plans) == 0:  # pragma: no cover
             return [], [], None
 
-        # Determine the shortest unambiguous alias for each plan.
-        namespaces_by_path = defaultdict(set)
-        for plan in visible_plans:
-            namespaces_by_path[plan.path].add(plan.namespace.path)
-
         # Generate query clauses for each plan.
+        plan_labels = _plan_labels(visible_plans)
         plan_subs = []
         for plan in visible_plans:
-            label = (
-                f"{plan.namespace.path}__{plan.path}"
-                if len(namespaces_by_path[plan.path]) > 1
-                else plan.path
-            )
-            plan_labels.append(label)
             plan_subs.append(
                 select(models.PlanAssignment.geo_id, models.PlanAssignment.assignment)
                 .where(
@@ -961,32 +1694,41 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
                 .subquery()
             )
 
-        geo_sub = select(models.Geography.geo_id, models.Geography.path).subquery()
-        members_sub = (
-            select(models.GeoSetMember.geo_id)
-            .filter(models.GeoSetMember.set_version_id.in_(view_set_version_ids))
-            .subquery()
-        )
         plan_cols = [
             plan_sub.c.assignment.label(plan_label)
             for plan_sub, plan_label in zip(plan_subs, plan_labels)
         ]
-        plan_assignment_query = (
-            select(models.GeoVersion.geo_id, geo_sub.c.path, *plan_cols)
-            .join(geo_sub, geo_sub.c.geo_id == models.GeoVersion.geo_id)
-            .join(members_sub, members_sub.c.geo_id == models.GeoVersion.geo_id)
+        # The view's geographies are already resolved, so they're passed as
+        # a single array parameter rather than joined again.
+        plan_assignment_query = select(
+            models.Geography.geo_id, models.Geography.path, *plan_cols
+        ).where(
+            models.Geography.geo_id
+            == any_(
+                bindparam(
+                    "view_geo_ids", geographies.geo_ids, type_=postgresql.ARRAY(Integer)
+                )
+            )
         )
         for plan_sub in plan_subs:
             plan_assignment_query = plan_assignment_query.outerjoin(
                 plan_sub,
-                plan_sub.c.geo_id == models.GeoVersion.geo_id,
+                plan_sub.c.geo_id == models.Geography.geo_id,
             )
-        plan_assignments = db.execute(plan_assignment_query).fetchall()
+        plan_assignments = StreamedRows(db, plan_assignment_query)
 
         return visible_plans, plan_labels, plan_assignments
 
-    def _graph_edges(self, db: Session, view: models.View) -> Sequence | None:
-        """Gets graph edges by path, if applicable."""
+    def _graph_edges(
+        self,
+        db: Session,
+        view: models.View,
+        geographies: _ViewGeographies | None = None,
+    ) -> StreamedRows | None:
+        """Gets a lazy iterator of graph edges by path, if applicable.
+
+        If `geographies` is provided, only edges between them are included.
+        """
         if view.graph_id is None:  # pragma: no cover
             return None
 
@@ -1010,8 +1752,16 @@ class CRView(NamespacedCRBase[models.View, schemas.ViewCreate]):
                 models.GraphEdge.graph_id == view.graph_id,
             )
         )
+        if geographies is not None:
+            geo_ids = bindparam(
+                "view_geo_ids", geographies.geo_ids, type_=postgresql.ARRAY(Integer)
+            )
+            graph_edges_query = graph_edges_query.where(
+                models.GraphEdge.geo_id_1 == any_(geo_ids),
+                models.GraphEdge.geo_id_2 == any_(geo_ids),
+            )
 
-        return db.execute(graph_edges_query).fetchall()
+        return StreamedRows(db, graph_edges_query)
 
 
 view = CRView(models.View)
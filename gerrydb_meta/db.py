@@ -1,10 +1,16 @@
 """Database connections."""
 
 import os
+import threading
+import time
 import urllib.parse
+from contextlib import contextmanager
+from typing import Any, Generator, Mapping
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from uvicorn.config import logger as log
 
 if os.getenv("INSTANCE_CONNECTION_NAME"):  # pragma: no cover
@@ -26,5 +32,181 @@ else:
 
     ogr2ogr_db_config = f"PG:{db_url}"
 
+GERRYDB_SQL_ECHO = bool(os.environ.get("GERRYDB_SQL_ECHO", False))
+
+# Connection pool defaults. Every gunicorn worker holds its own pool, so the
+# worst-case number of Postgres backends used by the API server is
+# (number of workers) * (pool size + max overflow); see `serve.sh`.
+DEFAULT_POOL_SIZE = 5
+DEFAULT_POOL_MAX_OVERFLOW = 5
+DEFAULT_POOL_TIMEOUT = 30  # seconds to wait for a connection before failing
+DEFAULT_POOL_RECYCLE = 1800  # seconds
+DEFAULT_POOL_PRE_PING = True
+
+
+def _env_bool(value: str) -> bool:
+    return value.strip().lower() not in ("", "0", "false", "no", "off")
+
+
+def pool_config_from_env(environ: Mapping[str, str]) -> dict[str, Any]:
+    """Builds `create_engine()` keyword arguments for the connection pool.
+
+    Recognized variables:
+        GERRYDB_POOL_SIZE: Number of persistent connections per worker.
+        GERRYDB_POOL_MAX_OVERFLOW: Extra connections allowed under burst load.
+        GERRYDB_POOL_TIMEOUT: Seconds to wait for a free connection.
+        GERRYDB_POOL_RECYCLE: Maximum connection age in seconds (-1 to disable).
+        GERRYDB_POOL_PRE_PING: Test connections for liveness on checkout.
+        GERRYDB_STATEMENT_TIMEOUT: Postgres `statement_timeout` in milliseconds
+            (unset or 0 to use the server default).
+    """
+    config = {
+        "poolclass": QueuePool,
+        "pool_size": int(environ.get("GERRYDB_POOL_SIZE", DEFAULT_POOL_SIZE)),
+        "max_overflow": int(
+            environ.get("GERRYDB_POOL_MAX_OVERFLOW", DEFAULT_POOL_MAX_OVERFLOW)
+        ),
+        "pool_timeout": float(
+            environ.get("GERRYDB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT)
+        ),
+        "pool_recycle": int(environ.get("GERRYDB_POOL_RECYCLE", DEFAULT_POOL_RECYCLE)),
+        "pool_pre_ping": (
+            _env_bool(environ["GERRYDB_POOL_PRE_PING"])
+            if "GERRYDB_POOL_PRE_PING" in environ
+            else DEFAULT_POOL_PRE_PING
+        ),
+    }
+
+    statement_timeout = int(environ.get("GERRYDB_STATEMENT_TIMEOUT", 0))
+    if statement_timeout > 0:
+        config["connect_args"] = {
+            "options": f"-c statement_timeout={statement_timeout}"
+        }
+    return config
+
+
+class PoolStats:
+    """Thread-safe counters for connection pool activity.
+
+    Counters are cumulative for the lifetime of the process (i.e. per worker);
+    the gauges in `snapshot()` reflect the state of the pool at call time.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.overflow_checkouts = 0
+        self.max_overflow_in_use = 0
+        self.waits = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _overflow(self) -> int:
+        pool = self.engine.pool
+        return pool.overflow() if hasattr(pool, "overflow") else 0
+
+    def _on_connect(self, dbapi_conn, conn_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_conn, conn_record, conn_proxy) -> None:
+        overflow = self._overflow()
+        with self._lock:
+            self.checkouts += 1
+            if overflow > 0:
+                self.overflow_checkouts += 1
+                self.max_overflow_in_use = max(self.max_overflow_in_use, overflow)
+
+    def _on_checkin(self, dbapi_conn, conn_record) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def _on_invalidate(self, dbapi_conn, conn_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def record_wait(self, seconds: float) -> None:
+        """Records the time spent waiting on a pool checkout."""
+        with self._lock:
+            self.waits += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+    def _pool_exhausted(self) -> bool:
+        """Whether a checkout can't be served by an idle pooled connection.
+
+        Checkouts while the pool is still filling up (fewer than `pool_size`
+        connections open) are not counted: they open a new connection
+        without contending with other requests.
+        """
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return False
+        return pool.checkedin() == 0 and pool.checkedout() >= pool.size()
+
+    @contextmanager
+    def time_checkout(self) -> Generator[None, None, None]:
+        """Times a block that checks out a connection from the pool.
+
+        Only checkouts that find no idle connection (and so must wait for one
+        to be returned, or open an overflow connection) are recorded as waits.
+        """
+        exhausted = self._pool_exhausted()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if exhausted:
+                self.record_wait(time.perf_counter() - start)
+
+    def snapshot(self) -> dict[str, int | float]:
+        """Returns current pool counters and gauges."""
+        pool = self.engine.pool
+        with self._lock:
+            stats = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "overflow_checkouts": self.overflow_checkouts,
+                "max_overflow_in_use": self.max_overflow_in_use,
+                "waits": self.waits,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                {
+                    "pool_size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return stats
+
+
 log.debug("Using database URL: %s", db_url)
-Session = sessionmaker(create_engine(db_url))
+
+# One engine (and one connection pool) per process. API requests and
+# administrative sessions share it via `Session`.
+engine = create_engine(
+    db_url, echo=GERRYDB_SQL_ECHO, **pool_config_from_env(os.environ)
+)
+pool_stats = PoolStats(engine)
+Session = sessionmaker(engine)
+
+# Connections must never be shared across processes. If the app is imported
+# before gunicorn forks its workers (e.g. with `--preload`), drop the parent's
+# pooled connections in each child without closing them under the parent.
+if hasattr(os, "register_at_fork"):  # pragma: no cover
+    os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
@@ -84,3 +84,30 @@ class GraphRenderStatus(str, Enum):
     RUNNING = "running"
     FAILED = "failed"
     SUCCEEDED = "succeeded"
+
+
+class RenderEngine(str, Enum):
+    """Engine used to write rendered GeoPackages."""
+
+    # Shell out to GDAL's `ogr2ogr`, which queries the database directly.
+    OGR2OGR = "ogr2ogr"
+    # Stream rows over the API's pooled connection and write with `sqlite3`.
+    NATIVE = "native"
+
+
+class SimplifyLevel(str, Enum):
+    """Geometry simplification level of a rendered view or graph."""
+
+    FULL = "full"  # Geometries as imported.
+    MEDIUM = "medium"
+    COARSE = "coarse"
+
+
+class RenderFormat(str, Enum):
+    """File format of a rendered view."""
+
+    GPKG = "gpkg"
+    # Streaming formats: the response starts with the first rows of the view.
+    FLATGEOBUF = "fgb"
+    GEOPARQUET = "parquet"
+    NDJSON = "ndjson"
@@ -48,3 +48,13 @@ class ViewCreateError(Exception):
 
 class ViewConflictError(Exception):
     """Raised when a view cannot be created on the server side"""
+
+
+class RenderLimitError(Exception):
+    """Raised when a render is refused because too many renders are running."""
+
+    retry_after: int
+
+    def __init__(self, message: str, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(message)
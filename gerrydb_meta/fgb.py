@@ -0,0 +1,320 @@
+"""Minimal streaming FlatGeobuf writer.
+
+Used by streamed view renders (see `gerrydb_meta.render_stream`) to write
+FlatGeobuf without GDAL. Features are written in the order they are
+received, without a spatial index, so a file can be sent to a client as it
+is generated. Header and feature records are FlatBuffers tables, which are
+encoded by a small forward-only FlatBuffers encoder.
+
+See https://flatgeobuf.org/ and
+https://github.com/flatgeobuf/flatgeobuf/tree/master/src/fbs.
+"""
+
+import struct
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from enum import IntEnum
+
+import numpy as np
+import orjson as json
+import shapely
+
+MAGIC = bytes([0x66, 0x67, 0x62, 0x03, 0x66, 0x67, 0x62, 0x00])
+
+
+class GeometryType(IntEnum):
+    """FlatGeobuf geometry types (`GeometryType` in `header.fbs`)."""
+
+    UNKNOWN = 0
+    POINT = 1
+    LINESTRING = 2
+    POLYGON = 3
+    MULTIPOINT = 4
+    MULTILINESTRING = 5
+    MULTIPOLYGON = 6
+    GEOMETRYCOLLECTION = 7
+
+
+class ColumnType(IntEnum):
+    """FlatGeobuf attribute types (`ColumnType` in `header.fbs`)."""
+
+    BYTE = 0
+    UBYTE = 1
+    BOOL = 2
+    SHORT = 3
+    USHORT = 4
+    INT = 5
+    UINT = 6
+    LONG = 7
+    ULONG = 8
+    FLOAT = 9
+    DOUBLE = 10
+    STRING = 11
+    JSON = 12
+    DATETIME = 13
+    BINARY = 14
+
+
+_SHAPELY_GEOMETRY_TYPES = {
+    "Point": GeometryType.POINT,
+    "LineString": GeometryType.LINESTRING,
+    "LinearRing": GeometryType.LINESTRING,
+    "Polygon": GeometryType.POLYGON,
+    "MultiPoint": GeometryType.MULTIPOINT,
+    "MultiLineString": GeometryType.MULTILINESTRING,
+    "MultiPolygon": GeometryType.MULTIPOLYGON,
+    "GeometryCollection": GeometryType.GEOMETRYCOLLECTION,
+}
+
+_FIXED_WIDTH_FORMATS = {
+    ColumnType.BOOL: "<?",
+    ColumnType.INT: "<i",
+    ColumnType.LONG: "<q",
+    ColumnType.DOUBLE: "<d",
+}
+
+
+@dataclass(frozen=True)
+class Column:
+    """An attribute column of a FlatGeobuf layer."""
+
+    name: str
+    type: ColumnType
+    description: str | None = None
+
+
+@dataclass(frozen=True)
+class Crs:
+    """The coordinate reference system of a FlatGeobuf layer."""
+
+    org: str
+    code: int
+    wkt: str | None = None
+
+
+# FlatBuffers encoding. Tables are written front-to-back: each table's
+# vtable is written immediately before it, and the objects it refers to
+# (strings, vectors, and other tables) immediately after it, so that all
+# (unsigned) offsets point forward.
+
+
+@dataclass(frozen=True)
+class _Vector:
+    """A vector of scalars, already encoded as little-endian bytes."""
+
+    data: bytes
+    count: int
+    alignment: int
+
+
+@dataclass(frozen=True)
+class _Table:
+    """A table with fields by vtable slot: `(format, value)` or a child object."""
+
+    fields: dict[
+        int, "tuple[str, int | float | bool] | _Table | _Vector | list[_Table] | str"
+    ]
+
+
+def _doubles(values: np.ndarray) -> _Vector:
+    return _Vector(
+        data=np.ascontiguousarray(values, dtype="<f8").tobytes(),
+        count=values.size,
+        alignment=8,
+    )
+
+
+def _uints(values: list[int]) -> _Vector:
+    return _Vector(
+        data=struct.pack(f"<{len(values)}I", *values), count=len(values), alignment=4
+    )
+
+
+def _ubytes(data: bytes) -> _Vector:
+    return _Vector(data=data, count=len(data), alignment=1)
+
+
+class _Encoder:
+    def __init__(self):
+        self.buf = bytearray()
+
+    def _pad(self, alignment: int, offset: int = 0) -> None:
+        """Pads the buffer so that `len(buf) + offset` is aligned."""
+        self.buf += b"\0" * (-(len(self.buf) + offset) % alignment)
+
+    def encode(self, root: _Table) -> bytes:
+        self.buf += b"\0" * 4  # root offset
+        root_pos = self._table(root)
+        struct.pack_into("<I", self.buf, 0, root_pos)
+        return bytes(self.buf)
+
+    def _child(self, child) -> int:
+        if isinstance(child, _Table):
+            return self._table(child)
+        if isinstance(child, str):
+            data = child.encode("utf-8")
+            self._pad(4)
+            pos = len(self.buf)
+            self.buf += struct.pack("<I", len(data)) + data + b"\0"
+            return pos
+        if isinstance(child, _Vector):
+            self._pad(max(4, child.alignment), offset=4)
+            pos = len(self.buf)
+            self.buf += struct.pack("<I", child.count) + child.data
+            return pos
+
+        # Vector of tables.
+        self._pad(4)
+        pos = len(self.buf)
+        self.buf += struct.pack("<I", len(child))
+        offset_positions = []
+        for _ in child:
+            offset_positions.append(len(self.buf))
+            self.buf += b"\0" * 4
+        for offset_pos, table in zip(offset_positions, child):
+            table_pos = self._table(table)
+            struct.pack_into("<I", self.buf, offset_pos, table_pos - offset_pos)
+        return pos
+
+    def _table(self, table: _Table) -> int:
+        # Lay out inline fields after the vtable offset, largest first.
+        layout = []
+        for slot, field in table.fields.items():
+            fmt = field[0] if isinstance(field, tuple) else "<I"
+            layout.append((struct.calcsize(fmt), slot, fmt, field))
+        layout.sort(key=lambda item: -item[0])
+
+        field_offsets = {}
+        table_size = 4
+        for size, slot, _, _ in layout:
+            table_size += -table_size % size
+            field_offsets[slot] = table_size
+            table_size += size
+
+        num_slots = max(table.fields, default=-1) + 1
+        vtable = struct.pack(
+            f"<HH{num_slots}H",
+            4 + 2 * num_slots,
+            table_size,
+            *(field_offsets.get(slot, 0) for slot in range(num_slots)),
+        )
+        self._pad(2)
+        vtable_pos = len(self.buf)
+        self.buf += vtable
+        self._pad(8)
+        table_pos = len(self.buf)
+        self.buf += b"\0" * table_size
+        struct.pack_into("<i", self.buf, table_pos, table_pos - vtable_pos)
+
+        children = []
+        for _, slot, fmt, field in layout:
+            field_pos = table_pos + field_offsets[slot]
+            if isinstance(field, tuple):
+                struct.pack_into(fmt, self.buf, field_pos, field[1])
+            else:
+                children.append((field_pos, field))
+        for field_pos, child in children:
+            child_pos = self._child(child)
+            struct.pack_into("<I", self.buf, field_pos, child_pos - field_pos)
+        return table_pos
+
+
+def _size_prefixed(table: _Table) -> bytes:
+    data = _Encoder().encode(table)
+    return struct.pack("<I", len(data)) + data
+
+
+def header(
+    name: str,
+    columns: list[Column],
+    *,
+    geometry_type: GeometryType = GeometryType.UNKNOWN,
+    crs: Crs | None = None,
+    description: str | None = None,
+    metadata: str | None = None,
+) -> bytes:
+    """Encodes the magic bytes and header of a FlatGeobuf file.
+
+    The feature count is left unknown and no spatial index is written, so
+    features can be appended as they become available.
+    """
+    column_tables = []
+    for col in columns:
+        fields = {0: col.name, 1: ("<B", col.type)}
+        if col.description:
+            fields[3] = col.description
+        column_tables.append(_Table(fields))
+
+    fields = {
+        0: name,
+        2: ("<B", geometry_type),
+        7: column_tables,
+        9: ("<H", 0),  # index_node_size: no spatial index.
+    }
+    if crs is not None:
+        crs_fields = {0: crs.org, 1: ("<i", crs.code)}
+        if crs.wkt is not None:
+            crs_fields[4] = crs.wkt
+        fields[10] = _Table(crs_fields)
+    if description is not None:
+        fields[12] = description
+    if metadata is not None:
+        fields[13] = metadata
+    return MAGIC + _size_prefixed(_Table(fields))
+
+
+def _geometry(geom: shapely.Geometry) -> _Table:
+    geometry_type = _SHAPELY_GEOMETRY_TYPES[geom.geom_type]
+    fields = {6: ("<B", geometry_type)}
+    if geometry_type in (GeometryType.MULTIPOLYGON, GeometryType.GEOMETRYCOLLECTION):
+        fields[7] = [_geometry(part) for part in geom.geoms if not part.is_empty]
+        return _Table(fields)
+
+    if geometry_type == GeometryType.POLYGON:
+        lines = [geom.exterior, *geom.interiors]
+    elif geometry_type == GeometryType.MULTILINESTRING:
+        lines = list(geom.geoms)
+    else:
+        lines = [geom]
+    fields[1] = _doubles(shapely.get_coordinates(geom))
+    if len(lines) > 1:
+        ends = np.cumsum([len(line.coords) for line in lines])
+        fields[0] = _uints(ends.tolist())
+    return _Table(fields)
+
+
+def _property(col_type: ColumnType, value) -> bytes:
+    fmt = _FIXED_WIDTH_FORMATS.get(col_type)
+    if fmt is not None:
+        if isinstance(value, Decimal):
+            value = float(value)
+        return struct.pack(fmt, value)
+
+    if col_type == ColumnType.BINARY:
+        data = bytes(value)
+    elif col_type == ColumnType.JSON and not isinstance(value, str):
+        data = json.dumps(value)
+    elif isinstance(value, (date, datetime)):
+        data = value.isoformat().encode("utf-8")
+    else:
+        data = str(value).encode("utf-8")
+    return struct.pack("<I", len(data)) + data
+
+
+def feature(
+    columns: list[Column], geometry: shapely.Geometry | None, values: tuple
+) -> bytes:
+    """Encodes a (size-prefixed) FlatGeobuf feature.
+
+    Empty geometries are written as null geometries (as GDAL does).
+    """
+    properties = bytearray()
+    for idx, (col, value) in enumerate(zip(columns, values)):
+        if value is not None:
+            properties += struct.pack("<H", idx) + _property(col.type, value)
+
+    fields = {1: _ubytes(bytes(properties))}
+    if geometry is not None and not geometry.is_empty:
+        fields[0] = _geometry(geometry)
+    return _size_prefixed(_Table(fields))
@@ -0,0 +1,89 @@
+"""Batch hashing of geometries for GeoBin deduplication.
+
+Each distinct geometry is stored once, as a `GeoBin`, and identified by its
+`geometry_hash`: the MD5 digest of `ST_AsBinary(geography)`, computed by the
+database. Imports hash incoming WKB on the server with `geometry_hashes()` to
+find existing GeoBins before inserting anything, so the two hashes must
+agree byte for byte.
+
+`ST_AsBinary()` returns little-endian (NDR) WKB, so big-endian (XDR) WKB is
+converted before it is hashed; little-endian WKB is hashed as-is. Geographies
+without a geometry are stored as an empty polygon.
+
+`hashlib` releases the GIL while hashing buffers larger than 2 KiB, so large
+batches are split across a small thread pool. Small batches (and batches of
+small geometries, which would mostly contend for the GIL) are hashed on the
+calling thread.
+"""
+
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+import shapely
+from shapely.geometry import Polygon
+
+EMPTY_POLYGON_WKB = Polygon().wkb
+
+HASH_THREADS = min(4, os.cpu_count() or 1)
+# Batches with less WKB than this (in bytes) are hashed on the calling thread.
+PARALLEL_HASH_MIN_BYTES = 8 * 1024**2
+# `hashlib` only releases the GIL for buffers larger than this.
+_GIL_RELEASE_MIN_BYTES = 2048
+_CHUNKS_PER_THREAD = 4
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _hash_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=HASH_THREADS, thread_name_prefix="gerrydb-geo-hash"
+            )
+        return _pool
+
+
+def canonical_wkb(wkb: bytes | None) -> bytes:
+    """Converts WKB to the form hashed by `GeoBin.geometry_hash`."""
+    if not wkb:
+        return EMPTY_POLYGON_WKB
+    if wkb[0] == 0:  # big-endian (XDR) byte order
+        return shapely.to_wkb(shapely.from_wkb(wkb), byte_order=1)
+    return wkb
+
+
+def _md5_digests(wkbs: Sequence[bytes]) -> list[bytes]:
+    md5 = hashlib.md5
+    return [md5(wkb).digest() for wkb in wkbs]
+
+
+def geometry_hashes(wkbs: Sequence[bytes | None]) -> list[bytes]:
+    """Computes the `GeoBin.geometry_hash` of each geometry in a batch.
+
+    Args:
+        wkbs: WKB-encoded geometries (`None` for geographies without one).
+
+    Returns:
+        16-byte MD5 digests, in the order of `wkbs`.
+    """
+    wkbs = [canonical_wkb(wkb) for wkb in wkbs]
+    num_bytes = sum(len(wkb) for wkb in wkbs)
+    if (
+        HASH_THREADS < 2
+        or num_bytes < PARALLEL_HASH_MIN_BYTES
+        or num_bytes < len(wkbs) * _GIL_RELEASE_MIN_BYTES
+    ):
+        return _md5_digests(wkbs)
+
+    chunk_size = -(-len(wkbs) // (HASH_THREADS * _CHUNKS_PER_THREAD))
+    chunks = [wkbs[idx : idx + chunk_size] for idx in range(0, len(wkbs), chunk_size)]
+    return [
+        digest
+        for chunk_digests in _hash_pool().map(_md5_digests, chunks)
+        for digest in chunk_digests
+    ]
@@ -0,0 +1,363 @@
+"""Minimal GeoPackage feature table writer.
+
+Used by the `native` render engine (see `gerrydb_meta.render`) to write
+GeoPackages directly with `sqlite3` instead of shelling out to `ogr2ogr`.
+Only the parts of the GeoPackage specification needed for vector features
+are implemented: the core metadata tables, feature tables with GeoPackage
+geometry blobs, and the R-tree spatial index extension.
+
+See http://www.geopackage.org/spec120/.
+"""
+
+import sqlite3
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable
+
+# "GPKG" in ASCII.
+GPKG_APPLICATION_ID = 0x47504B47
+GPKG_USER_VERSION = 10200
+
+GEOMETRY_TYPES = (
+    "GEOMETRY",
+    "POINT",
+    "LINESTRING",
+    "POLYGON",
+    "MULTIPOINT",
+    "MULTILINESTRING",
+    "MULTIPOLYGON",
+    "GEOMETRYCOLLECTION",
+)
+
+_UNDEFINED_SRS = [
+    ("Undefined cartesian SRS", -1, "NONE", -1, "undefined", None),
+    ("Undefined geographic SRS", 0, "NONE", 0, "undefined", None),
+]
+
+# Little-endian header with an [minx, maxx, miny, maxy] envelope.
+_GPKG_FLAGS_ENVELOPE_XY = 0b0000_0011
+# Little-endian header without an envelope, marked empty.
+_GPKG_FLAGS_EMPTY = 0b0001_0001
+
+Envelope = tuple[float, float, float, float]  # (minx, maxx, miny, maxy)
+
+
+@dataclass(frozen=True)
+class FeatureColumn:
+    """An attribute column of a feature table."""
+
+    name: str
+    sqlite_type: str  # e.g. INTEGER, REAL, TEXT, BOOLEAN
+
+
+@dataclass(frozen=True)
+class Feature:
+    """A row of a feature table."""
+
+    attrs: tuple
+    wkb: bytes | None
+    srs_id: int | None
+    envelope: Envelope | None
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def init_gpkg(conn: sqlite3.Connection) -> None:
+    """Creates the core GeoPackage metadata tables in an empty database."""
+    conn.execute(f"PRAGMA application_id = {GPKG_APPLICATION_ID}")
+    conn.execute(f"PRAGMA user_version = {GPKG_USER_VERSION}")
+    conn.execute(
+        """
+        CREATE TABLE gpkg_spatial_ref_sys (
+            srs_name                 TEXT    NOT NULL,
+            srs_id                   INTEGER PRIMARY KEY,
+            organization             TEXT    NOT NULL,
+            organization_coordsys_id INTEGER NOT NULL,
+            definition               TEXT    NOT NULL,
+            description              TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE gpkg_contents (
+            table_name  TEXT     NOT NULL PRIMARY KEY,
+            data_type   TEXT     NOT NULL,
+            identifier  TEXT     UNIQUE,
+            description TEXT     DEFAULT '',
+            last_change DATETIME NOT NULL
+                DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ','now')),
+            min_x       DOUBLE,
+            min_y       DOUBLE,
+            max_x       DOUBLE,
+            max_y       DOUBLE,
+            srs_id      INTEGER,
+            CONSTRAINT fk_gc_r_srs_id FOREIGN KEY (srs_id)
+                REFERENCES gpkg_spatial_ref_sys(srs_id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE gpkg_geometry_columns (
+            table_name         TEXT    NOT NULL,
+            column_name        TEXT    NOT NULL,
+            geometry_type_name TEXT    NOT NULL,
+            srs_id             INTEGER NOT NULL,
+            z                  TINYINT NOT NULL,
+            m                  TINYINT NOT NULL,
+            CONSTRAINT pk_geom_cols PRIMARY KEY (table_name, column_name),
+            CONSTRAINT uk_gc_table_name UNIQUE (table_name),
+            CONSTRAINT fk_gc_tn FOREIGN KEY (table_name)
+                REFERENCES gpkg_contents(table_name),
+            CONSTRAINT fk_gc_srs FOREIGN KEY (srs_id)
+                REFERENCES gpkg_spatial_ref_sys (srs_id)
+        )
+        """
+    )
+    # Same definition as in `gerrydb_meta.render`, which adds its own
+    # extensions to this table later.
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS gpkg_extensions (
+            table_name     TEXT,
+            column_name    TEXT,
+            extension_name TEXT NOT NULL,
+            definition     TEXT NOT NULL,
+            scope          TEXT NOT NULL,
+            CONSTRAINT ge_tce UNIQUE (table_name, column_name, extension_name)
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)", _UNDEFINED_SRS
+    )
+
+
+def add_srs(
+    conn: sqlite3.Connection,
+    srs_id: int,
+    definition: str,
+    *,
+    organization: str = "EPSG",
+    srs_name: str | None = None,
+) -> None:
+    """Registers a spatial reference system (if not already registered)."""
+    conn.execute(
+        "INSERT OR IGNORE INTO gpkg_spatial_ref_sys VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            srs_name or f"{organization}:{srs_id}",
+            srs_id,
+            organization,
+            srs_id,
+            definition,
+            None,
+        ),
+    )
+
+
+def geometry_blob(
+    wkb: bytes | None, srs_id: int, envelope: Envelope | None
+) -> bytes | None:
+    """Wraps (ISO) WKB in a GeoPackage geometry blob header.
+
+    Geometries without an envelope are marked as empty.
+    """
+    if wkb is None:
+        return None
+    if envelope is None or any(coord is None for coord in envelope):
+        header = struct.pack("<2sBBi", b"GP", 0, _GPKG_FLAGS_EMPTY, srs_id)
+    else:
+        header = struct.pack(
+            "<2sBBi4d", b"GP", 0, _GPKG_FLAGS_ENVELOPE_XY, srs_id, *envelope
+        )
+    return header + bytes(wkb)
+
+
+def create_feature_table(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: list[FeatureColumn],
+    *,
+    geometry_column: str = "geom",
+) -> None:
+    """Creates an (unregistered) feature table."""
+    column_defs = ",\n".join(f"{_quote(col.name)} {col.sqlite_type}" for col in columns)
+    conn.execute(
+        f"""
+        CREATE TABLE {_quote(table_name)} (
+            fid INTEGER PRIMARY KEY AUTOINCREMENT NOT NULL,
+            {_quote(geometry_column)} BLOB{"," if columns else ""}
+            {column_defs}
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE {_quote(f"rtree_{table_name}_{geometry_column}")}
+        USING rtree(id, minx, maxx, miny, maxy)
+        """
+    )
+
+
+def insert_features(
+    conn: sqlite3.Connection,
+    table_name: str,
+    columns: list[FeatureColumn],
+    features: Iterable[Feature],
+    *,
+    geometry_column: str = "geom",
+    batch_size: int = 10_000,
+) -> tuple[Envelope | None, int | None, int]:
+    """Inserts features into a feature table and its R-tree index.
+
+    Features are consumed lazily and inserted in batches, so they can be
+    streamed from a database cursor.
+
+    Returns:
+        (1) The bounds of the inserted features, if any are non-empty.
+        (2) The spatial reference system ID of the first non-null geometry.
+        (3) The number of inserted features.
+    """
+    table = _quote(table_name)
+    rtree = _quote(f"rtree_{table_name}_{geometry_column}")
+    column_names = ", ".join(
+        ["fid", _quote(geometry_column), *(_quote(col.name) for col in columns)]
+    )
+    placeholders = ", ".join(["?"] * (len(columns) + 2))
+    insert_feature_sql = f"INSERT INTO {table} ({column_names}) VALUES ({placeholders})"
+    insert_rtree_sql = f"INSERT INTO {rtree} VALUES (?, ?, ?, ?, ?)"
+
+    min_x = min_y = float("inf")
+    max_x = max_y = float("-inf")
+    has_bounds = False
+    srs_id = None
+    fid = 0
+    feature_rows = []
+    rtree_rows = []
+    for feature in features:
+        fid += 1
+        if srs_id is None and feature.srs_id is not None:
+            srs_id = feature.srs_id
+        feature_rows.append(
+            (
+                fid,
+                geometry_blob(feature.wkb, feature.srs_id or 0, feature.envelope),
+                *feature.attrs,
+            )
+        )
+        envelope = feature.envelope
+        if envelope is not None and not any(coord is None for coord in envelope):
+            rtree_rows.append((fid, *envelope))
+            has_bounds = True
+            min_x = min(min_x, envelope[0])
+            max_x = max(max_x, envelope[1])
+            min_y = min(min_y, envelope[2])
+            max_y = max(max_y, envelope[3])
+
+        if len(feature_rows) >= batch_size:
+            conn.executemany(insert_feature_sql, feature_rows)
+            conn.executemany(insert_rtree_sql, rtree_rows)
+            feature_rows.clear()
+            rtree_rows.clear()
+
+    conn.executemany(insert_feature_sql, feature_rows)
+    conn.executemany(insert_rtree_sql, rtree_rows)
+    bounds = (min_x, max_x, min_y, max_y) if has_bounds else None
+    return bounds, srs_id, fid
+
+
+def register_feature_table(
+    conn: sqlite3.Connection,
+    table_name: str,
+    *,
+    srs_id: int,
+    bounds: Envelope | None,
+    geometry_type: str = "GEOMETRY",
+    geometry_column: str = "geom",
+) -> None:
+    """Registers a populated feature table and its R-tree index.
+
+    The R-tree maintenance triggers required by the specification are created
+    last, as they depend on SQL functions (`ST_IsEmpty()`, etc.) that are only
+    available in GeoPackage-aware clients such as GDAL.
+    """
+    if geometry_type not in GEOMETRY_TYPES:
+        raise ValueError(f"Unknown geometry type {geometry_type}.")
+
+    min_x, max_x, min_y, max_y = bounds if bounds is not None else (None,) * 4
+    conn.execute(
+        """
+        INSERT INTO gpkg_contents
+        (table_name, data_type, identifier, last_change,
+         min_x, min_y, max_x, max_y, srs_id)
+        VALUES (?, 'features', ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            table_name,
+            table_name,
+            datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            min_x,
+            min_y,
+            max_x,
+            max_y,
+            srs_id,
+        ),
+    )
+    conn.execute(
+        "INSERT INTO gpkg_geometry_columns VALUES (?, ?, ?, ?, 0, 0)",
+        (table_name, geometry_column, geometry_type, srs_id),
+    )
+    conn.execute(
+        """
+        INSERT INTO gpkg_extensions
+        (table_name, column_name, extension_name, definition, scope)
+        VALUES (?, ?, 'gpkg_rtree_index',
+                'http://www.geopackage.org/spec120/#extension_rtree', 'write-only')
+        """,
+        (table_name, geometry_column),
+    )
+
+    t, c = _quote(table_name), _quote(geometry_column)
+    rtree = _quote(f"rtree_{table_name}_{geometry_column}")
+    prefix = f"rtree_{table_name}_{geometry_column}"
+    values = f"NEW.fid, ST_MinX(NEW.{c}), ST_MaxX(NEW.{c}), ST_MinY(NEW.{c}), ST_MaxY(NEW.{c})"
+    triggers = {
+        "insert": (
+            f"AFTER INSERT ON {t} WHEN (NEW.{c} NOT NULL AND NOT ST_IsEmpty(NEW.{c}))",
+            f"INSERT OR REPLACE INTO {rtree} VALUES ({values});",
+        ),
+        "update1": (
+            f"AFTER UPDATE OF {c} ON {t} WHEN OLD.fid = NEW.fid AND "
+            f"(NEW.{c} NOTNULL AND NOT ST_IsEmpty(NEW.{c}))",
+            f"INSERT OR REPLACE INTO {rtree} VALUES ({values});",
+        ),
+        "update2": (
+            f"AFTER UPDATE OF {c} ON {t} WHEN OLD.fid = NEW.fid AND "
+            f"(NEW.{c} ISNULL OR ST_IsEmpty(NEW.{c}))",
+            f"DELETE FROM {rtree} WHERE id = OLD.fid;",
+        ),
+        "update3": (
+            f"AFTER UPDATE ON {t} WHEN OLD.fid != NEW.fid AND "
+            f"(NEW.{c} NOTNULL AND NOT ST_IsEmpty(NEW.{c}))",
+            f"DELETE FROM {rtree} WHERE id = OLD.fid; "
+            f"INSERT OR REPLACE INTO {rtree} VALUES ({values});",
+        ),
+        "update4": (
+            f"AFTER UPDATE ON {t} WHEN OLD.fid != NEW.fid AND "
+            f"(NEW.{c} ISNULL OR ST_IsEmpty(NEW.{c}))",
+            f"DELETE FROM {rtree} WHERE id IN (OLD.fid, NEW.fid);",
+        ),
+        "delete": (
+            f"AFTER DELETE ON {t} WHEN OLD.{c} NOT NULL",
+            f"DELETE FROM {rtree} WHERE id = OLD.fid;",
+        ),
+    }
+    for suffix, (condition, body) in triggers.items():
+        conn.execute(
+            f"CREATE TRIGGER {_quote(f'{prefix}_{suffix}')} {condition} "
+            f"BEGIN {body} END"
+        )
@@ -1,30 +1,51 @@
 """Entrypoint for Gerry API server."""
 
+import os
 from http import HTTPStatus
 
 from fastapi import FastAPI, Request
-from starlette.responses import StreamingResponse
+from starlette.responses import Response, StreamingResponse
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
+from gerrydb_meta import crud, metrics
+from gerrydb_meta.admission import render_admission
 from gerrydb_meta.api import api_router
+from gerrydb_meta.db import Session, ogr2ogr_db_config, pool_stats
 from gerrydb_meta.exceptions import (
     BulkCreateError,
     BulkPatchError,
     ColumnValueTypeError,
     CreateValueError,
+    RenderLimitError,
 )
+from gerrydb_meta.render_worker import start_workers
 
 from uvicorn.config import logger as log
 
-from io import BytesIO
 import json
-import gzip
+import zlib
+from typing import AsyncIterator
 
 API_PREFIX = "/api/v1"
 
+# Maximum number of bytes of an error response body to read for logging.
+ERROR_LOG_MAX_BYTES = 64 * 1024
+
 app = FastAPI(title="gerrydb-meta", openapi_url=f"{API_PREFIX}/openapi.json")
 
+# Number of background render worker threads to run in each API server
+# process. Renders can also be processed out-of-band with
+# `python -m gerrydb_meta.render_worker`.
+GERRYDB_RENDER_WORKERS = int(os.environ.get("GERRYDB_RENDER_WORKERS", 0))
+
+
+@app.on_event("startup")
+def start_render_workers():  # pragma: no cover
+    if GERRYDB_RENDER_WORKERS > 0:
+        start_workers(GERRYDB_RENDER_WORKERS, Session, ogr2ogr_db_config)
+        log.info("Started %d render worker(s).", GERRYDB_RENDER_WORKERS)
+
 
 @app.exception_handler(CreateValueError)
 def create_value_error(request: Request, exc: CreateValueError):
@@ -77,6 +98,16 @@ def bulk_create_error(request: Request, exc: BulkCreateError):
     )
 
 
+@app.exception_handler(RenderLimitError)
+def render_limit_error(request: Request, exc: RenderLimitError):
+    """Handles renders refused by admission control."""
+    return JSONResponse(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        content={"kind": "Render limit error", "detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # It's best to keep the compression level at 1 for GeoPackages. GZIP has trouble getting good
 # compression ratios on anything since the WKBs used to represent the geometries in the GeoPackage
 # look relatively random. The remaining columns in the SQLite database are not very large, and
@@ -86,49 +117,64 @@ app.add_middleware(GZipMiddleware, compresslevel=1)
 app.include_router(api_router, prefix=API_PREFIX)
 
 
-@app.middleware("http")
-async def log_400_errors(request: Request, call_next):
-    response = await call_next(request)
-
-    body_bytes = b""
-
-    # Have to check the attribute because there is also a _StreamingResponse
-    # class in starlette.middleware.base that is the thing that we actually see sometimes
-    # and it is not the same as the starlette.responses.StreamingResponse class
-    if hasattr(response, "body_iterator"):
-        # If it’s a StreamingResponse, we need to consume .body_iterator
-        # to capture all the bytes, then recreate a new StreamingResponse so downstream still
-        # sees the original body.
-        async for chunk in response.body_iterator:
-            body_bytes += chunk
-
-        # Keep a copy of the original compressed bytes
-        original_body = body_bytes
-
-        # If Content-Encoding: gzip, decompress before inspecting
-        if response.headers.get("Content-Encoding") == "gzip":  # pragma: no cover
-            try:
-                body_bytes = gzip.decompress(body_bytes)
-            except Exception:
-                pass
-
-        # Rebuild the StreamingResponse so the client still gets the same body:
+async def _replay(chunks: list[bytes], body_iterator: AsyncIterator[bytes]):
+    """Yields already-consumed chunks, then the rest of a response body."""
+    for chunk in chunks:
+        yield chunk
+    async for chunk in body_iterator:
+        yield chunk
+
+
+async def _peek_body(response) -> tuple[bytes, Response]:
+    """Reads up to `ERROR_LOG_MAX_BYTES` of a response body for logging.
+
+    Returns:
+        (1) The (decompressed) start of the body.
+        (2) A response that still sends the full body.
+    """
+    if not hasattr(response, "body_iterator"):  # pragma: no cover
+        body_bytes = getattr(response, "body", b"")[:ERROR_LOG_MAX_BYTES]
+    else:
+        # Have to check the attribute because there is also a _StreamingResponse
+        # class in starlette.middleware.base that is the thing that we actually see
+        # sometimes and it is not the same as starlette.responses.StreamingResponse.
+        chunks = []
+        num_bytes = 0
+        body_iterator = response.body_iterator
+        async for chunk in body_iterator:
+            chunks.append(chunk)
+            num_bytes += len(chunk)
+            if num_bytes >= ERROR_LOG_MAX_BYTES:
+                break
+        body_bytes = b"".join(chunks)[:ERROR_LOG_MAX_BYTES]
+
+        # Rebuild the response so the client still gets the same body.
         response = StreamingResponse(
-            BytesIO(original_body),
+            _replay(chunks, body_iterator),
             status_code=response.status_code,
             headers=dict(response.headers),
         )
-    else:  # pragma: no cover
-        if hasattr(response, "body"):
-            body_bytes = response.body
-            if response.headers.get("Content-Encoding") == "gzip":
-                try:
-                    body_bytes = gzip.decompress(body_bytes)
-                except Exception:
-                    pass
-        else:
-            body_bytes = b""
 
+    # If Content-Encoding: gzip, decompress (a prefix of) the body before inspecting.
+    if response.headers.get("Content-Encoding") == "gzip":  # pragma: no cover
+        try:
+            body_bytes = zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(
+                body_bytes, ERROR_LOG_MAX_BYTES
+            )
+        except zlib.error:
+            pass
+    return body_bytes, response
+
+
+@app.middleware("http")
+async def log_400_errors(request: Request, call_next):
+    response = await call_next(request)
+    # Successful responses (including large render downloads) are passed
+    # through without touching their bodies.
+    if not HTTPStatus.BAD_REQUEST <= response.status_code < 500:
+        return response
+
+    body_bytes, response = await _peek_body(response)
     text = body_bytes.decode("utf-8", errors="replace")
     json_body = None
     if response.status_code in (400, 403, 409, 422):
@@ -171,7 +217,11 @@ async def log_400_errors(request: Request, call_next):
                     "string formats for each field you are trying to set."
                 ),
             },
-            headers=response.headers,
+            headers={
+                key: value
+                for key, value in response.headers.items()
+                if key not in ("content-length", "content-encoding")
+            },
         )
 
     return response
@@ -182,6 +232,29 @@ def health_check():  # pragma: no cover
     return {"status": "healthy"}
 
 
+@app.get("/pool")
+def pool_status():  # pragma: no cover
+    """Connection pool counters for this worker process."""
+    return pool_stats.snapshot()
+
+
+@app.get("/renders")
+def render_status():  # pragma: no cover
+    """Render admission counters for this worker process and the job queue."""
+    with Session() as db:
+        queued = {
+            "view": crud.view.num_pending(db),
+            "graph": crud.graph.num_pending(db),
+        }
+    return {**render_admission().snapshot(), "queued": queued}
+
+
+@app.get("/metrics")
+def render_metrics():  # pragma: no cover
+    """Render stage metrics for this worker process, in the Prometheus format."""
+    return Response(metrics.REGISTRY.exposition(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/middlewares")
 def list_middlewares():  # pragma: no cover
     middleware_info = [
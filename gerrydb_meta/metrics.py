@@ -0,0 +1,201 @@
+"""Render metrics in the Prometheus text format.
+
+Each stage of a render (building the render context, each `ogr2ogr` pass,
+inserting metadata, graph edges, and plan assignments, compressing, and
+uploading) is timed with `stage()` and recorded in a histogram labelled by
+the kind of render (`view` or `graph`), the rendered object's path, and the
+stage. Stages that process rows also record their row counts in a second
+histogram. The object being rendered is set once per render with
+`render_target()`, so stages deep in the render pipeline (or in a render
+store) don't need to know what they are rendering.
+
+Like the connection pool counters served from `/pool`, metrics are kept in
+memory for the lifetime of the process, so each API server worker (and each
+standalone render worker) reports its own renders. They are served from
+`/metrics`.
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+)
+ROWS_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()
+    )
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    """A thread-safe Prometheus histogram with a fixed set of label names."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...],
+        buckets: tuple[float, ...],
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # Label values -> (per-bucket counts (the last for +Inf), sum, count).
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.label_names)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def exposition(self) -> list[str]:
+        """Formats the histogram's samples as lines of the text format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = sorted(
+                (key, list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            )
+        for key, counts, total, count in series:
+            labels = dict(zip(self.label_names, key))
+            cumulative = 0
+            for upper, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels({**labels, "le": _format_value(upper)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(
+                f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class Registry:
+    """A collection of metrics served together."""
+
+    def __init__(self):
+        self._metrics: list[Histogram] = []
+
+    def register(self, metric: Histogram) -> Histogram:
+        self._metrics.append(metric)
+        return metric
+
+    def exposition(self) -> str:
+        """Formats all metrics in the Prometheus text format."""
+        return "".join(
+            line + "\n" for metric in self._metrics for line in metric.exposition()
+        )
+
+
+REGISTRY = Registry()
+
+_STAGE_LABELS = ("kind", "target", "stage")
+RENDER_STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "gerrydb_render_stage_seconds",
+        "Time spent in each stage of a render.",
+        _STAGE_LABELS,
+        SECONDS_BUCKETS,
+    )
+)
+RENDER_STAGE_ROWS = REGISTRY.register(
+    Histogram(
+        "gerrydb_render_stage_rows",
+        "Rows processed by each stage of a render.",
+        _STAGE_LABELS,
+        ROWS_BUCKETS,
+    )
+)
+
+# (kind, path) of the view or graph being rendered in the current context.
+_render_target: ContextVar[tuple[str, str]] = ContextVar(
+    "gerrydb_render_target", default=("", "")
+)
+
+
+@contextmanager
+def render_target(kind: str, target: str) -> Iterator[None]:
+    """Labels the stages timed in this context with a rendered view or graph."""
+    token = _render_target.set((kind, target))
+    try:
+        yield
+    finally:
+        _render_target.reset(token)
+
+
+class Stage:
+    """A render stage being timed (see `stage()`)."""
+
+    def __init__(self):
+        self.rows: int | None = None
+
+    def add_rows(self, rows: int) -> None:
+        self.rows = (self.rows or 0) + rows
+
+
+@contextmanager
+def stage(name: str) -> Iterator[Stage]:
+    """Times a render stage.
+
+    Set (or add to) the yielded stage's `rows` to record a row count. A
+    stage is recorded even if it fails.
+    """
+    kind, target = _render_target.get()
+    current = Stage()
+    start = time.perf_counter()
+    try:
+        yield current
+    finally:
+        labels = {"kind": kind, "target": target, "stage": name}
+        RENDER_STAGE_SECONDS.observe(time.perf_counter() - start, **labels)
+        if current.rows is not None:
+            RENDER_STAGE_ROWS.observe(current.rows, **labels)
@@ -21,9 +21,11 @@ from sqlalchemy import (
     Computed,
     LargeBinary,
     MetaData,
+    Select,
     String,
     Text,
     UniqueConstraint,
+    and_,
 )
 from sqlalchemy.dialects import postgresql
 from sqlalchemy.dialects.postgresql import BYTEA
@@ -36,11 +38,20 @@ from gerrydb_meta.enums import (
     ColumnType,
     NamespaceGroup,
     ScopeType,
+    SimplifyLevel,
     ViewRenderStatus,
     GraphRenderStatus,
 )
 
 SCHEMA = "gerrydb"
+
+# Tolerances (in degrees) of simplified geometries (see `GeoBinSimplified`).
+SIMPLIFY_TOLERANCES = {
+    SimplifyLevel.MEDIUM: 0.0001,  # ~10 m
+    SimplifyLevel.COARSE: 0.001,  # ~100 m
+}
+
+
 metadata_obj = MetaData(schema=SCHEMA)
 
 
@@ -357,10 +368,10 @@ class GeoBin(Base):
     geo_bin_id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
-    # We remove the spatial index from the geography column for now because we
-    # are not checking interstections or anything like that with it for now.
+    # The spatial index on the geography column is used to select the
+    # geographies in vector tiles (see `gerrydb_meta.tiles`).
     geography = mapped_column(
-        SqlGeography(srid=4269, spatial_index=False), nullable=True
+        SqlGeography(srid=4269, spatial_index=True), nullable=True
     )
     internal_point = mapped_column(
         SqlGeography(geometry_type="POINT", srid=4269, spatial_index=False),
@@ -393,6 +404,50 @@ class GeoBin(Base):
     )
 
 
+class GeoBinSimplified(Base):
+    """The geography of a `GeoBin` at a simplification level.
+
+    Rows are filled on first use, when a view or graph is rendered at a
+    level (see `gerrydb_meta.crud.view._simplify_geo_bins()`).
+    """
+
+    __tablename__ = "geo_bin_simplified"
+
+    geo_bin_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("geo_bin.geo_bin_id"), primary_key=True
+    )
+    level: Mapped[SimplifyLevel] = mapped_column(
+        SqlEnum(SimplifyLevel), primary_key=True
+    )
+    geography = mapped_column(
+        SqlGeography(srid=4269, spatial_index=False), nullable=True
+    )
+
+
+def simplified_geography(level: SimplifyLevel):
+    """Selects the geography of a `GeoBin` at a simplification level.
+
+    Queries that select simplified geographies must also be joined with
+    `join_simplified_geography()`.
+    """
+    if level == SimplifyLevel.FULL:
+        return GeoBin.geography
+    return GeoBinSimplified.geography
+
+
+def join_simplified_geography(query: Select, level: SimplifyLevel) -> Select:
+    """Joins a query over `GeoBin` with its geographies at a simplification level."""
+    if level == SimplifyLevel.FULL:
+        return query
+    return query.join(
+        GeoBinSimplified,
+        and_(
+            GeoBinSimplified.geo_bin_id == GeoBin.geo_bin_id,
+            GeoBinSimplified.level == level,
+        ),
+    )
+
+
 class GeoVersion(Base):
     __tablename__ = "geo_version"
 
@@ -772,11 +827,29 @@ class GraphRender(Base):
         Integer, ForeignKey("user.user_id"), nullable=False
     )
 
-    path: Mapped[str] = mapped_column(Text, nullable=False)
+    # e.g. local filesystem, S3, ...; unset until the render succeeds.
+    path: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[GraphRenderStatus] = mapped_column(
-        SqlEnum(GraphRenderStatus), nullable=False
+        SqlEnum(GraphRenderStatus), nullable=False, index=True
+    )
+    # Failure reason for background renders.
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Last sign of life from the worker running a background render; running
+    # renders without a recent heartbeat were abandoned (e.g. the worker
+    # crashed) and are claimed again.
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Number of times a background render has been claimed by a worker.
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    simplify: Mapped[SimplifyLevel] = mapped_column(
+        SqlEnum(SimplifyLevel), nullable=False, default=SimplifyLevel.FULL
     )
 
+    graph: Mapped[Graph] = relationship("Graph")
+
 
 class GraphEdge(Base):
     __tablename__ = "graph_edge"
@@ -1000,11 +1073,33 @@ class ViewRender(Base):
     created_by: Mapped[int] = mapped_column(
         Integer, ForeignKey("user.user_id"), nullable=False
     )
-    # e.g. local filesystem, S3, ...
-    path: Mapped[str] = mapped_column(Text, nullable=False)
+    # e.g. local filesystem, S3, ...; unset until the render succeeds.
+    path: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[ViewRenderStatus] = mapped_column(
-        SqlEnum(ViewRenderStatus), nullable=False
-    )
+        SqlEnum(ViewRenderStatus), nullable=False, index=True
+    )
+    # Failure reason for background renders.
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Last sign of life from the worker running a background render; running
+    # renders without a recent heartbeat were abandoned (e.g. the worker
+    # crashed) and are claimed again.
+    heartbeat_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    # Number of times a background render has been claimed by a worker.
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    # Fingerprints of the render's inputs (see `crud.view.ViewRenderManifest`).
+    manifest: Mapped[dict | None] = mapped_column(postgresql.JSONB, nullable=True)
+    # The rendered subset of the view (see `crud.view.ViewRenderSubset`);
+    # unset for full renders.
+    subset: Mapped[dict | None] = mapped_column(postgresql.JSONB, nullable=True)
+    simplify: Mapped[SimplifyLevel] = mapped_column(
+        SqlEnum(SimplifyLevel), nullable=False, default=SimplifyLevel.FULL
+    )
+
+    view: Mapped[View] = relationship("View")
 
 
 class ETag(Base):
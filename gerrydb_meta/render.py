@@ -1,7 +1,13 @@
 """Extended GeoPackage rendering of views."""
 
+import re
 import sqlite3
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from decimal import Decimal
+import shutil
 import tempfile
 import uuid
 from pathlib import Path
@@ -9,10 +15,22 @@ import os, sys, shlex
 import time
 
 import orjson as json
-
-from gerrydb_meta.crud.view import ViewRenderContext
+from sqlalchemy import Connection, CursorResult
+from sqlalchemy.orm import Session
+
+from gerrydb_meta import crud, gpkg, metrics, models
+from gerrydb_meta.crud.base import StreamedRows
+from gerrydb_meta.crud.view import (
+    FULL_RENDER,
+    ViewRenderChanges,
+    ViewRenderContext,
+    ViewRenderManifest,
+    ViewRenderSubset,
+)
 from gerrydb_meta.crud.graph import GraphRenderContext
+from gerrydb_meta.enums import ColumnType, RenderEngine, SimplifyLevel
 from gerrydb_meta.schemas import ObjectMeta, GraphMeta, ViewMeta
+from gerrydb_meta.storage import LocalRenderStore, RenderStore
 from uvicorn.config import logger as log
 
 # For bulk exports, we wrap the command-line utility `ogr2ogr` (distributed with GDAL)
@@ -24,12 +42,52 @@ from uvicorn.config import logger as log
 # security concerns--ideally, ogr2ogr should be granted only read access to the database),
 # but empirical evidence suggests that using `ogr2ogr` is *much* faster and less
 # memory-intensive than loading geographies with SQLAlchemy/GeoAlchemy.
+#
+# Alternatively, the `native` render engine (`RenderEngine.NATIVE`) streams rows
+# over the caller's (pooled) database connection with a server-side cursor and
+# writes the GeoPackage feature tables directly (see `gerrydb_meta.gpkg`).
+# This avoids the subprocess and the separate credential path for `ogr2ogr`,
+# but only supports EPSG projections.
+
+# Postgres type OIDs -> GeoPackage column types. Anything else is exported as TEXT.
+_PG_TYPE_OID_TO_GPKG_TYPE = {
+    16: "BOOLEAN",  # bool
+    20: "INTEGER",  # int8
+    21: "INTEGER",  # int2
+    23: "INTEGER",  # int4
+    700: "REAL",  # float4
+    701: "REAL",  # float8
+    1700: "REAL",  # numeric
+    1082: "DATE",  # date
+    1114: "DATETIME",  # timestamp
+    1184: "DATETIME",  # timestamptz
+}
+_EPSG_REGEX = re.compile(r"^epsg:(\d+)$", re.IGNORECASE)
+NATIVE_BATCH_SIZE = 10_000
+_COLUMN_TYPE_TO_GPKG_TYPE = {
+    ColumnType.FLOAT: "REAL",
+    ColumnType.INT: "INTEGER",
+    ColumnType.BOOL: "BOOLEAN",
+    ColumnType.STR: "TEXT",
+}
+# Layers of cached geometry base GeoPackages (see `render_view_gpkg()`).
+BASE_GEO_LAYER_NAME = "geography"
+BASE_INTERNAL_POINT_LAYER_NAME = "internal_point"
+_BASE_LAYER_NAMESPACE = uuid.UUID("0b9d3c34-1d0a-4c55-9a3e-4f4a4d7e2b61")
+DEFAULT_RENDER_ENGINE = RenderEngine(
+    os.environ.get("GERRYDB_RENDER_ENGINE", RenderEngine.OGR2OGR.value)
+)
 
 
 class RenderError(Exception):
     """Raised when rendering a view fails."""
 
 
+def __quote(identifier: str) -> str:
+    """Quotes a SQLite identifier."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
 def _init_base_graph_gpkg_extensions(conn: sqlite3.Connection, layer_name: str) -> None:
     conn.execute(
         """
@@ -389,6 +447,33 @@ def __validate_geo_and_internal_point_rows_count(
         )
 
 
+def __run_subprocesses(
+    context: ViewRenderContext | GraphRenderContext,
+    subprocess_command_lists: list[list[str]],
+) -> None:
+    """Runs several `ogr2ogr` commands at once and waits for all of them."""
+    with ThreadPoolExecutor(max_workers=len(subprocess_command_lists)) as executor:
+        futures = [
+            executor.submit(__run_subprocess, context, command_list)
+            for command_list in subprocess_command_lists
+        ]
+        # Wait for every command before raising, so no export is left
+        # writing to the render directory.
+        wait(futures)
+    for future in futures:
+        future.result()
+
+
+def __write_query(path: Path, query: str) -> str:
+    """Writes a query to a file.
+
+    Returns:
+        The `ogr2ogr -sql` argument for reading the query from the file.
+    """
+    path.write_text(query, encoding="utf-8")
+    return f"@{path}"
+
+
 def __insert_geopackage_geometries(
     context: ViewRenderContext | GraphRenderContext,
     db_config: str,
@@ -396,60 +481,338 @@ def __insert_geopackage_geometries(
     gpkg_path: Path,
     geo_layer_name: str,
     internal_point_layer_name: str,
+    concurrent: bool = True,
 ) -> None:
-    log.debug("Before ogr2ogr")
-    base_args = [
-        "-f",
-        "GPKG",
-        str(gpkg_path),
-        db_config,
-        *proj_args,
-    ]
+    """Exports the geographic and internal point layers of a render.
 
-    subprocess_command_list = [
-        "ogr2ogr",
-        *base_args,
-        "-sql",
-        context.geo_query,
-        "-nln",
-        geo_layer_name,
-    ]
+    Both exports scan the same GeoVersion/GeoBin joins, so by default they run
+    concurrently: the internal points are written to a scratch GeoPackage
+    (SQLite does not support concurrent writers), which is then merged into
+    the main GeoPackage with a cheap local copy.
+
+    Queries are passed to `ogr2ogr` through files (`-sql @filename`) rather
+    than on the command line, so the length of a query (which grows with the
+    number of columns in a view) is not limited by `ARG_MAX`.
+    """
+    with tempfile.TemporaryDirectory(dir=gpkg_path.parent) as sql_dir:
+        sql_dir = Path(sql_dir)
+        log.debug("Before ogr2ogr")
+        base_args = [
+            "-f",
+            "GPKG",
+            str(gpkg_path),
+            db_config,
+            *proj_args,
+        ]
+
+        geo_command_list = [
+            "ogr2ogr",
+            *base_args,
+            "-sql",
+            __write_query(sql_dir / "geo.sql", context.geo_query),
+            "-nln",
+            geo_layer_name,
+        ]
+        log.debug("View to gpkg subprocess command list %s", str(geo_command_list))
+        __validate_query(shlex.join(geo_command_list))
+
+        internal_point_args = [
+            "-sql",
+            __write_query(
+                sql_dir / "internal_points.sql", context.internal_point_query
+            ),
+            "-nln",
+            internal_point_layer_name,
+            "-skipfailures",  # Empty points are read as a failure
+            "-nlt",
+            "POINT",
+        ]
+
+        if not concurrent:
+            internal_point_command_list = [
+                "ogr2ogr",
+                *base_args,
+                "-update",
+                *internal_point_args,
+            ]
+            log.debug(
+                "Internal point query to gpkg subprocess command list %s",
+                str(internal_point_command_list),
+            )
+            __validate_query(shlex.join(internal_point_command_list))
+
+            start = time.perf_counter()
+            with metrics.stage("ogr2ogr_geography"):
+                __run_subprocess(context, geo_command_list)
+            log.debug("ogr2ogr took %s seconds", time.perf_counter() - start)
+
+            start = time.perf_counter()
+            with metrics.stage("ogr2ogr_internal_points"):
+                __run_subprocess(context, internal_point_command_list)
+            log.debug(
+                "Running internal point query took %s seconds",
+                time.perf_counter() - start,
+            )
+            return
+
+        scratch_gpkg_path = gpkg_path.with_name(
+            f"{gpkg_path.stem}__internal_points{gpkg_path.suffix}"
+        )
+        internal_point_command_list = [
+            "ogr2ogr",
+            "-f",
+            "GPKG",
+            str(scratch_gpkg_path),
+            db_config,
+            *proj_args,
+            *internal_point_args,
+        ]
+        log.debug(
+            "Internal point query to gpkg subprocess command list %s",
+            str(internal_point_command_list),
+        )
+        __validate_query(shlex.join(internal_point_command_list))
+
+        start = time.perf_counter()
+        # Both layers are exported in a single (concurrent) pass.
+        with metrics.stage("ogr2ogr_geography_and_internal_points"):
+            __run_subprocesses(context, [geo_command_list, internal_point_command_list])
+        log.debug(
+            "Concurrent geography and internal point export took %s seconds",
+            time.perf_counter() - start,
+        )
 
-    log.debug("View to gpkg subprocess command list %s", str(subprocess_command_list))
+        # The scratch layer is already projected, so it is copied as-is.
+        merge_command_list = [
+            "ogr2ogr",
+            "-f",
+            "GPKG",
+            "-update",
+            str(gpkg_path),
+            str(scratch_gpkg_path),
+            internal_point_layer_name,
+            "-nln",
+            internal_point_layer_name,
+            "-nlt",
+            "POINT",
+        ]
+        start = time.perf_counter()
+        try:
+            with metrics.stage("ogr2ogr_merge_internal_points"):
+                __run_subprocess(context, merge_command_list)
+        finally:
+            scratch_gpkg_path.unlink(missing_ok=True)
+        log.debug(
+            "Merging internal points took %s seconds", time.perf_counter() - start
+        )
 
-    subprocess_command = shlex.join(subprocess_command_list)
 
-    start = time.perf_counter()
-    __validate_query(subprocess_command)
-    __run_subprocess(context, subprocess_command_list)
-    log.debug("ogr2ogr took %s seconds", time.perf_counter() - start)
-
-    subprocess_command_list = [
-        "ogr2ogr",
-        *base_args,
-        "-update",
-        "-sql",
-        context.internal_point_query,
-        "-nln",
-        internal_point_layer_name,
-        "-skipfailures",  # Empty points are read as a failure
-        "-nlt",
-        "POINT",
+@dataclass(frozen=True)
+class LayerColumn:
+    """An attribute column of a streamed render query."""
+
+    name: str
+    type_code: int  # Postgres type OID
+
+
+def epsg_srid(proj: str | None) -> int | None:
+    """Parses the SRID of an EPSG projection (e.g. `epsg:4269`).
+
+    In-process renders reproject with PostGIS, which only knows about
+    spatial reference systems by SRID.
+
+    Raises:
+        RenderError: The projection is not an EPSG code.
+    """
+    if proj is None:
+        return None
+    match = _EPSG_REGEX.match(proj.strip())
+    if match is None:
+        raise RenderError(
+            f'Projection "{proj}" is not supported by in-process renders. '
+            "Use an EPSG code (e.g. epsg:4269) or the ogr2ogr engine."
+        )
+    return int(match.group(1))
+
+
+def layer_columns(
+    db_conn: Connection, query: str, geometry_column: str
+) -> list[LayerColumn]:
+    """Determines the attribute columns of a render query without running it."""
+    description = (
+        db_conn.exec_driver_sql(f"SELECT * FROM ({query}) AS q LIMIT 0")
+    ).cursor.description
+    return [
+        LayerColumn(name=col.name, type_code=col.type_code)
+        for col in description
+        if col.name != geometry_column
     ]
 
-    log.debug(
-        "Internal point query to gpkg subprocess command list %s",
-        str(subprocess_command_list),
+
+def stream_layer(
+    db_conn: Connection,
+    query: str,
+    columns: list[LayerColumn],
+    *,
+    geometry_column: str,
+    srid: int | None,
+    batch_size: int = NATIVE_BATCH_SIZE,
+) -> CursorResult:
+    """Streams the rows of a render query with a server-side cursor.
+
+    Rows are of the form `(wkb, srid, min_x, max_x, min_y, max_y, *attrs)`,
+    where `attrs` are the values of `columns` and the geometry is (optionally)
+    reprojected to `srid`. The caller is responsible for closing the result.
+    """
+    geom = f'q."{geometry_column}"::geometry'
+    if srid is not None:
+        geom = f"ST_Transform({geom}, {srid})"
+    attr_selects = "".join(
+        ', q."' + col.name.replace('"', '""') + '"' for col in columns
+    )
+    return db_conn.execution_options(
+        stream_results=True, yield_per=batch_size
+    ).exec_driver_sql(
+        f"""
+        SELECT
+            ST_AsBinary(t.geom), ST_SRID(t.geom),
+            ST_XMin(t.geom), ST_XMax(t.geom), ST_YMin(t.geom), ST_YMax(t.geom)
+            {attr_selects}
+        FROM ({query}) AS q
+        CROSS JOIN LATERAL (SELECT {geom} AS geom) AS t
+        """
     )
 
-    subprocess_command = shlex.join(subprocess_command_list)
 
-    start = time.perf_counter()
-    __validate_query(subprocess_command)
-    __run_subprocess(context, subprocess_command_list)
-    log.debug(
-        "Running internal point query took %s seconds", time.perf_counter() - start
+def srs_definition(db_conn: Connection, srid: int) -> tuple[str, str]:
+    """Looks up the authority name and WKT definition of a PostGIS SRID.
+
+    Raises:
+        RenderError: The SRID is not in `spatial_ref_sys`.
+    """
+    row = db_conn.exec_driver_sql(
+        "SELECT auth_name, srtext FROM spatial_ref_sys WHERE srid = %(srid)s",
+        {"srid": srid},
+    ).first()
+    if row is None:
+        raise RenderError(f"Unknown spatial reference system {srid}.")
+    return row.auth_name, row.srtext
+
+
+def __native_value(value):
+    """Converts a Postgres value to a value SQLite can store."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value).decode("utf-8")
+    return value
+
+
+def __export_layer_native(
+    db: Session,
+    conn: sqlite3.Connection,
+    query: str,
+    *,
+    layer_name: str,
+    geometry_column: str,
+    geometry_type: str,
+    srid: int | None,
+) -> int:
+    """Streams the rows of a render query into a GeoPackage feature table.
+
+    Returns:
+        The number of features written.
+    """
+    db_conn = db.connection()
+    columns = layer_columns(db_conn, query, geometry_column)
+    attr_columns = [
+        gpkg.FeatureColumn(
+            name=col.name,
+            sqlite_type=_PG_TYPE_OID_TO_GPKG_TYPE.get(col.type_code, "TEXT"),
+        )
+        for col in columns
+    ]
+    result = stream_layer(
+        db_conn, query, columns, geometry_column=geometry_column, srid=srid
+    )
+
+    features = (
+        gpkg.Feature(
+            attrs=tuple(__native_value(value) for value in row[6:]),
+            wkb=row[0],
+            srs_id=row[1],
+            envelope=None if row[2] is None else (row[2], row[3], row[4], row[5]),
+        )
+        for row in result
+    )
+    gpkg.create_feature_table(conn, layer_name, attr_columns)
+    bounds, srs_id, count = gpkg.insert_features(
+        conn, layer_name, attr_columns, features, batch_size=NATIVE_BATCH_SIZE
     )
+    result.close()
+
+    srs_id = srs_id if srs_id is not None else (srid or 0)
+    if srs_id > 0:
+        organization, definition = srs_definition(db_conn, srs_id)
+        gpkg.add_srs(conn, srs_id, definition, organization=organization)
+    gpkg.register_feature_table(
+        conn,
+        layer_name,
+        srs_id=srs_id,
+        bounds=bounds,
+        geometry_type=geometry_type,
+    )
+    log.debug("Wrote %s features to layer %s", count, layer_name)
+    return count
+
+
+def __insert_geopackage_geometries_native(
+    context: ViewRenderContext | GraphRenderContext,
+    db: Session,
+    proj: str | None,
+    gpkg_path: Path,
+    geo_layer_name: str,
+    internal_point_layer_name: str,
+) -> None:
+    """Exports the geographic and internal point layers of a render in-process."""
+    srid = epsg_srid(proj)
+    conn = sqlite3.connect(gpkg_path)
+    try:
+        gpkg.init_gpkg(conn)
+        start = time.perf_counter()
+        with metrics.stage("native_geography") as stage:
+            stage.rows = __export_layer_native(
+                db,
+                conn,
+                context.geo_query,
+                layer_name=geo_layer_name,
+                geometry_column="geography",
+                geometry_type="GEOMETRY",
+                srid=srid,
+            )
+        log.debug(
+            "Native geography export took %s seconds", time.perf_counter() - start
+        )
+
+        start = time.perf_counter()
+        with metrics.stage("native_internal_points") as stage:
+            stage.rows = __export_layer_native(
+                db,
+                conn,
+                context.internal_point_query,
+                layer_name=internal_point_layer_name,
+                geometry_column="internal_point",
+                geometry_type="POINT",
+                srid=srid,
+            )
+        log.debug(
+            "Native internal point export took %s seconds", time.perf_counter() - start
+        )
+        conn.commit()
+    finally:
+        conn.close()
 
 
 def __update_geo_attrs_gpkg(
@@ -533,58 +896,121 @@ def __insert_graph_edges(
     context: ViewRenderContext | GraphRenderContext,
     conn: sqlite3.Connection,
     geo_layer_name: str,
-):
+) -> int:
+    """Inserts a render's graph edges, returning the number of edges."""
     _init_gpkg_graph_extension(conn, geo_layer_name)
-    conn.executemany(
-        "INSERT INTO gerrydb_graph_edge (path_1, path_2, weights) VALUES (?, ?, ?)",
-        (
-            (edge.path_1, edge.path_2, json.dumps(edge.weights).decode("utf-8"))
-            for edge in context.graph_edges
-        ),
-    )
+    count = 0
+    for edges in context.graph_edges.batches():
+        count += len(edges)
+        conn.executemany(
+            "INSERT INTO gerrydb_graph_edge (path_1, path_2, weights) "
+            "VALUES (?, ?, ?)",
+            (
+                (edge.path_1, edge.path_2, json.dumps(edge.weights).decode("utf-8"))
+                for edge in edges
+            ),
+        )
+    return count
 
 
 def __insert_plan_assignments(
     context: ViewRenderContext,
     conn: sqlite3.Connection,
     geo_layer_name: str,
-):
+) -> int:
+    """Inserts a render's plan assignments, returning the number of rows."""
     _init_gpkg_plans_extension(conn, geo_layer_name, context.plan_labels)
     cols = ["path", *context.plan_labels]
     placeholders = ", ".join(["?"] * len(cols))
 
-    conn.executemany(
-        (
-            f"INSERT INTO gerrydb_plan_assignment ({', '.join(cols)}) "
-            f"VALUES ({placeholders})"
-        ),
-        ([getattr(row, col) for col in cols] for row in context.plan_assignments),
+    count = 0
+    for rows in context.plan_assignments.batches():
+        count += len(rows)
+        conn.executemany(
+            (
+                f"INSERT INTO gerrydb_plan_assignment ({', '.join(cols)}) "
+                f"VALUES ({placeholders})"
+            ),
+            ([getattr(row, col) for col in cols] for row in rows),
+        )
+    return count
+
+
+def __insert_geometries(
+    context: ViewRenderContext | GraphRenderContext,
+    engine: RenderEngine,
+    db_config: str,
+    db: Session | None,
+    proj: str | None,
+    gpkg_path: Path,
+    geo_layer_name: str,
+    internal_point_layer_name: str,
+) -> None:
+    """Exports the geographic and internal point layers with a render engine."""
+    if engine == RenderEngine.NATIVE:
+        if db is None:
+            raise ValueError("The native render engine requires a database session.")
+        __insert_geopackage_geometries_native(
+            context, db, proj, gpkg_path, geo_layer_name, internal_point_layer_name
+        )
+        return
+
+    if proj is not None:
+        proj_args = ["-t_srs", proj]
+    else:
+        proj_args = []  # leave in original projection (conventionally EPSG:4269)
+    __insert_geopackage_geometries(
+        context,
+        db_config,
+        proj_args,
+        gpkg_path,
+        geo_layer_name,
+        internal_point_layer_name,
     )
 
 
-def view_to_gpkg(context: ViewRenderContext, db_config: str) -> tuple[uuid.UUID, Path]:
-    """Renders a view (with metadata) to a GeoPackage."""
-    render_uuid = uuid.uuid4()
+def view_to_gpkg(
+    context: ViewRenderContext,
+    db_config: str,
+    render_uuid: uuid.UUID | None = None,
+    engine: RenderEngine = DEFAULT_RENDER_ENGINE,
+    db: Session | None = None,
+) -> tuple[uuid.UUID, Path]:
+    """Renders a view (with metadata) to a GeoPackage.
+
+    If `render_uuid` is not provided (e.g. by a queued render), a fresh
+    render ID is generated. The native render engine reads geographies over
+    `db` rather than connecting with `db_config`.
+    """
+    render_uuid = render_uuid or uuid.uuid4()
     temp_dir = Path(tempfile.mkdtemp())
     gpkg_path = Path(temp_dir) / f"{render_uuid.hex}.gpkg"
 
     geo_layer_name = context.view.path
     internal_point_layer_name = f"{geo_layer_name}__internal_points"
 
-    if context.view.proj is not None:
-        proj_args = ["-t_srs", context.view.proj]
-    else:
-        proj_args = []  # leave in original projection (conventionally EPSG:4269)
-
-    __insert_geopackage_geometries(
+    __insert_geometries(
         context,
+        engine,
         db_config,
-        proj_args,
+        db,
+        context.view.proj,
         gpkg_path,
         geo_layer_name,
         internal_point_layer_name,
     )
 
+    __finish_view_gpkg(context, gpkg_path, geo_layer_name, internal_point_layer_name)
+    return render_uuid, gpkg_path
+
+
+def __finish_view_gpkg(
+    context: ViewRenderContext,
+    gpkg_path: Path,
+    geo_layer_name: str,
+    internal_point_layer_name: str,
+) -> None:
+    """Adds metadata, graph edges, and plan assignments to a view's layers."""
     conn = sqlite3.connect(gpkg_path)
 
     __validate_geo_and_internal_point_rows_count(
@@ -592,30 +1018,424 @@ def view_to_gpkg(context: ViewRenderContext, db_config: str) -> tuple[uuid.UUID,
         geo_layer_name,
         internal_point_layer_name,
         type="view",
-        expected_count=context.view.num_geos,
+        expected_count=context.num_geos,
     )
 
-    __update_view_metadata_gpkg(
-        conn, geo_layer_name, internal_point_layer_name, context
-    )
-    __update_geo_attrs_gpkg(conn, context)
+    with metrics.stage("metadata") as stage:
+        __update_view_metadata_gpkg(
+            conn, geo_layer_name, internal_point_layer_name, context
+        )
+        __update_geo_attrs_gpkg(conn, context)
+        stage.rows = len(context.geo_meta_ids)
 
     start = time.perf_counter()
     if context.graph_edges is not None:
-        __insert_graph_edges(context, conn, geo_layer_name)
+        with metrics.stage("edges") as stage:
+            stage.rows = __insert_graph_edges(context, conn, geo_layer_name)
     log.debug("Inserting graph edges took %s seconds", time.perf_counter() - start)
 
     start = time.perf_counter()
     if context.plan_assignments is not None:
-        __insert_plan_assignments(context, conn, geo_layer_name)
+        with metrics.stage("plans") as stage:
+            stage.rows = __insert_plan_assignments(context, conn, geo_layer_name)
     log.debug("Inserting plan assignments took %s seconds", time.perf_counter() - start)
 
     conn.commit()
     conn.close()
 
+
+def base_layer_id(
+    manifest: ViewRenderManifest,
+    proj: str | None,
+    engine: RenderEngine,
+    simplify: SimplifyLevel = SimplifyLevel.FULL,
+) -> uuid.UUID | None:
+    """Identifies the geometry base layers of a view render.
+
+    Base layers depend only on the geometry versions in a view (as of the
+    view's timestamp), its projection, the render engine, and the
+    simplification level, so they are shared by views that differ only in
+    their tabular data.
+    """
+    if manifest.geometry is None:
+        return None
+    key = f"{manifest.geometry}|{proj or ''}|{engine.value}"
+    if simplify != SimplifyLevel.FULL:
+        # Full-resolution base layers keep their existing IDs.
+        key += f"|{simplify.value}"
+    return uuid.uuid5(_BASE_LAYER_NAMESPACE, key)
+
+
+def _pin_file(path: Path, pinned_path: Path) -> bool:
+    """Hard-links (or copies) a file to `pinned_path`.
+
+    A pinned copy stays readable even if the original is evicted from a
+    render store by another request or process.
+
+    Returns:
+        Whether the file was pinned (`False` if it no longer exists).
+    """
+    try:
+        os.link(path, pinned_path)
+    except FileNotFoundError:
+        return False
+    except OSError:  # pragma: no cover
+        # e.g. a store on another filesystem.
+        try:
+            shutil.copyfile(path, pinned_path)
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def __base_layers(
+    context: ViewRenderContext,
+    engine: RenderEngine,
+    db_config: str,
+    db: Session,
+    store: LocalRenderStore,
+    base_id: uuid.UUID,
+) -> Path:
+    """Gets the cached geometry base layers of a view, exporting them if needed.
+
+    Returns:
+        A pinned copy of the base layers (see `_pin_file()`) in a temporary
+        directory, which the caller is responsible for removing.
+    """
+    temp_dir = Path(tempfile.mkdtemp())
+    pinned_path = temp_dir / "base.gpkg"
+    cached_path = store.local_path(store.path_for(render_id=base_id, kind="base"))
+    if cached_path is not None and _pin_file(cached_path, pinned_path):
+        log.debug("Using cached base layers %s", base_id.hex)
+        return pinned_path
+
+    base_path = temp_dir / f"{base_id.hex}.gpkg"
+    start = time.perf_counter()
+    __insert_geometries(
+        replace(context, geo_query=context.base_geo_query),
+        engine,
+        db_config,
+        db,
+        context.view.proj,
+        base_path,
+        BASE_GEO_LAYER_NAME,
+        BASE_INTERNAL_POINT_LAYER_NAME,
+    )
+    log.debug(
+        "Exporting base layers %s took %s seconds",
+        base_id.hex,
+        time.perf_counter() - start,
+    )
+    # Pin the export before it is moved into the store, where a concurrent
+    # `put()` could evict it.
+    _pin_file(base_path, pinned_path)
+    store.put(base_path, render_id=base_id, kind="base")
+    return pinned_path
+
+
+def __copy_base_layer(
+    conn: sqlite3.Connection,
+    base_layer_name: str,
+    layer_name: str,
+    columns: list[gpkg.FeatureColumn],
+    values_table: str | None = None,
+) -> None:
+    """Copies a base layer (attached as `base`) to a new feature table.
+
+    If `values_table` is provided, attribute values are joined from it by
+    path, and geographies without values are left out.
+    """
+    geometry_column, geometry_type, srs_id = conn.execute(
+        "SELECT column_name, geometry_type_name, srs_id "
+        "FROM base.gpkg_geometry_columns WHERE table_name = ?",
+        (base_layer_name,),
+    ).fetchone()
+    gpkg.create_feature_table(
+        conn,
+        layer_name,
+        [gpkg.FeatureColumn(name="path", sqlite_type="TEXT"), *columns],
+        geometry_column=geometry_column,
+    )
+
+    table = __quote(layer_name)
+    geom = __quote(geometry_column)
+    column_names = "".join(f", {__quote(col.name)}" for col in columns)
+    select_sql = f"SELECT b.fid, b.{geom}, b.path"
+    select_sql += "".join(f", v.{__quote(col.name)}" for col in columns)
+    select_sql += f" FROM base.{__quote(base_layer_name)} AS b"
+    if values_table is not None:
+        select_sql += f" JOIN temp.{__quote(values_table)} AS v ON v.path = b.path"
+    conn.execute(f"INSERT INTO {table} (fid, {geom}, path{column_names}) {select_sql}")
+
+    # Feature IDs are kept, so the spatial index can be copied as well.
+    rtree = __quote(f"rtree_{layer_name}_{geometry_column}")
+    base_rtree = __quote(f"rtree_{base_layer_name}_{geometry_column}")
+    conn.execute(
+        f"INSERT INTO {rtree} SELECT r.id, r.minx, r.maxx, r.miny, r.maxy "
+        f"FROM base.{base_rtree} AS r JOIN {table} AS t ON t.fid = r.id"
+    )
+    min_x, max_x, min_y, max_y = conn.execute(
+        f"SELECT MIN(minx), MAX(maxx), MIN(miny), MAX(maxy) FROM {rtree}"
+    ).fetchone()
+    gpkg.register_feature_table(
+        conn,
+        layer_name,
+        srs_id=srs_id,
+        bounds=None if min_x is None else (min_x, max_x, min_y, max_y),
+        geometry_type=geometry_type,
+        geometry_column=geometry_column,
+    )
+
+
+def view_to_gpkg_from_base(
+    context: ViewRenderContext,
+    base_path: Path,
+    column_values: StreamedRows,
+    render_uuid: uuid.UUID | None = None,
+) -> tuple[uuid.UUID, Path]:
+    """Renders a view (with metadata) to a GeoPackage from cached base layers.
+
+    Geometries and internal points are copied from the base layers at
+    `base_path`; only the view's tabular data (`column_values`, rows of the
+    form `(path, *values)` in the order of `context.columns`) and metadata
+    are read from the database. Geographies without values in
+    `column_values` are left out of both layers.
+    """
+    render_uuid = render_uuid or uuid.uuid4()
+    temp_dir = Path(tempfile.mkdtemp())
+    gpkg_path = Path(temp_dir) / f"{render_uuid.hex}.gpkg"
+
+    geo_layer_name = context.view.path
+    internal_point_layer_name = f"{geo_layer_name}__internal_points"
+    columns = [
+        gpkg.FeatureColumn(
+            name=col.canonical_ref.path,
+            sqlite_type=_COLUMN_TYPE_TO_GPKG_TYPE.get(col.type, "TEXT"),
+        )
+        for col in context.columns.values()
+    ]
+
+    conn = sqlite3.connect(gpkg_path)
+    try:
+        conn.execute("ATTACH DATABASE ? AS base", (str(base_path),))
+        gpkg.init_gpkg(conn)
+        conn.execute(
+            """
+            INSERT OR IGNORE INTO gpkg_spatial_ref_sys
+            (srs_name, srs_id, organization, organization_coordsys_id,
+             definition, description)
+            SELECT srs_name, srs_id, organization, organization_coordsys_id,
+                   definition, description
+            FROM base.gpkg_spatial_ref_sys
+            """
+        )
+
+        start = time.perf_counter()
+        column_defs = "".join(f", {__quote(col.name)}" for col in columns)
+        conn.execute(
+            "CREATE TEMP TABLE gerrydb_column_values "
+            f"(path TEXT PRIMARY KEY{column_defs})"
+        )
+        placeholders = ", ".join(["?"] * (len(columns) + 1))
+        with metrics.stage("column_values") as stage:
+            for rows in column_values.batches():
+                stage.add_rows(len(rows))
+                conn.executemany(
+                    f"INSERT INTO temp.gerrydb_column_values VALUES ({placeholders})",
+                    (tuple(__native_value(value) for value in row) for row in rows),
+                )
+        log.debug("Loading column values took %s seconds", time.perf_counter() - start)
+
+        __copy_base_layer(
+            conn,
+            BASE_GEO_LAYER_NAME,
+            geo_layer_name,
+            columns,
+            values_table="gerrydb_column_values",
+        )
+        # Internal points are filtered like geographies, so the layers match.
+        __copy_base_layer(
+            conn,
+            BASE_INTERNAL_POINT_LAYER_NAME,
+            internal_point_layer_name,
+            [],
+            values_table="gerrydb_column_values",
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    __finish_view_gpkg(context, gpkg_path, geo_layer_name, internal_point_layer_name)
+    return render_uuid, gpkg_path
+
+
+def update_view_gpkg(
+    context: ViewRenderContext,
+    previous_gpkg_path: Path,
+    changes: ViewRenderChanges,
+    column_values: StreamedRows | None,
+    render_uuid: uuid.UUID | None = None,
+) -> tuple[uuid.UUID, Path]:
+    """Re-renders a view by updating a copy of a previous render of it.
+
+    Only valid if the view's geometries are unchanged since the previous
+    render (see `ViewRenderManifest.changes_since()`): geometries are copied
+    as-is, and only the changed attribute columns (with values from
+    `column_values`, rows of the form `(path, *values)`), geographic
+    metadata, and plan assignments are rewritten.
+    """
+    render_uuid = render_uuid or uuid.uuid4()
+    temp_dir = Path(tempfile.mkdtemp())
+    gpkg_path = Path(temp_dir) / f"{render_uuid.hex}.gpkg"
+    shutil.copyfile(previous_gpkg_path, gpkg_path)
+
+    geo_layer_name = context.view.path
+    conn = sqlite3.connect(gpkg_path)
+    try:
+        start = time.perf_counter()
+        if changes.columns and column_values is not None:
+            quoted_names = [__quote(name) for name in changes.columns]
+            # Geographies without values are absent from `column_values`.
+            conn.execute(
+                f'UPDATE "{geo_layer_name}" SET '
+                + ", ".join(f"{name} = NULL" for name in quoted_names)
+            )
+            update_sql = (
+                f'UPDATE "{geo_layer_name}" SET '
+                + ", ".join(f"{name} = ?" for name in quoted_names)
+                + " WHERE path = ?"
+            )
+            with metrics.stage("column_values") as stage:
+                for rows in column_values.batches():
+                    stage.add_rows(len(rows))
+                    conn.executemany(
+                        update_sql,
+                        (
+                            (*(__native_value(value) for value in row[1:]), row[0])
+                            for row in rows
+                        ),
+                    )
+        log.debug(
+            "Updating %d column(s) took %s seconds",
+            len(changes.columns),
+            time.perf_counter() - start,
+        )
+
+        if changes.geo_attrs:
+            conn.execute("DELETE FROM gerrydb_geo_attrs")
+            conn.execute("DELETE FROM gerrydb_geo_meta")
+            __update_geo_attrs_gpkg(conn, context)
+
+        if changes.plans:
+            conn.execute("DROP TABLE IF EXISTS gerrydb_plan_assignment")
+            conn.execute(
+                "DELETE FROM gpkg_extensions "
+                "WHERE table_name = 'gerrydb_plan_assignment'"
+            )
+            if context.plan_assignments is not None:
+                with metrics.stage("plans") as stage:
+                    stage.rows = __insert_plan_assignments(
+                        context, conn, geo_layer_name
+                    )
+
+        conn.commit()
+    finally:
+        conn.close()
+
     return render_uuid, gpkg_path
 
 
+def render_view_gpkg(
+    db: Session,
+    view: models.View,
+    db_config: str,
+    *,
+    manifest: ViewRenderManifest,
+    previous: models.ViewRender | None = None,
+    store: RenderStore | None = None,
+    base_store: LocalRenderStore | None = None,
+    render_uuid: uuid.UUID | None = None,
+    engine: RenderEngine = DEFAULT_RENDER_ENGINE,
+    subset: ViewRenderSubset = FULL_RENDER,
+    simplify: SimplifyLevel = SimplifyLevel.FULL,
+) -> tuple[uuid.UUID, Path]:
+    """Renders a view, reusing previously exported geometries if possible.
+
+    If `previous` is available locally in `store` and only the view's tabular
+    data has changed since it was rendered (per `manifest`), the previous
+    GeoPackage is updated in place of a full render. Otherwise, if a
+    `base_store` is provided, the view's geometries and internal points are
+    copied from cached base layers (see `base_layer_id()`), which are only
+    exported from the database on a cache miss.
+
+    Only `subset` of the view is rendered, at the `simplify` level;
+    `manifest` and `previous` must be of the same subset and level.
+    """
+    with metrics.stage("context"):
+        context = crud.view.render(db=db, view=view, subset=subset, simplify=simplify)
+
+    changes = previous_path = None
+    if previous is not None and store is not None:
+        changes = manifest.changes_since(previous.manifest)
+        if changes is not None:
+            previous_path = store.local_path(previous.path)
+
+    if previous_path is None:
+        base_id = base_layer_id(manifest, view.proj, engine, simplify)
+        if base_store is not None and base_id is not None:
+            base_path = __base_layers(
+                context, engine, db_config, db, base_store, base_id
+            )
+            try:
+                return view_to_gpkg_from_base(
+                    context,
+                    base_path,
+                    crud.view.column_values(
+                        db=db, view=view, columns=context.columns, subset=subset
+                    ),
+                    render_uuid=render_uuid,
+                )
+            finally:
+                shutil.rmtree(base_path.parent, ignore_errors=True)
+        return view_to_gpkg(
+            context=context,
+            db_config=db_config,
+            render_uuid=render_uuid,
+            engine=engine,
+            db=db,
+        )
+
+    log.debug(
+        "Updating render %s of view %s in place (changed columns: %s)",
+        previous.render_id.hex,
+        view.path,
+        changes.columns,
+    )
+    changed_columns = {
+        alias: col
+        for alias, col in context.columns.items()
+        if col.canonical_ref.path in changes.columns
+    }
+    # Align the changed columns with the order of `column_values`.
+    changes = replace(
+        changes,
+        columns=[col.canonical_ref.path for col in changed_columns.values()],
+    )
+    return update_view_gpkg(
+        context,
+        previous_path,
+        changes,
+        column_values=(
+            crud.view.column_values(
+                db=db, view=view, columns=changed_columns, subset=subset
+            )
+            if changed_columns
+            else None
+        ),
+        render_uuid=render_uuid,
+    )
+
+
 def __update_graph_metadata_gpkg(
     conn: sqlite3.Connection,
     geo_layer_name: str,
@@ -645,9 +1465,13 @@ def __update_graph_metadata_gpkg(
 
 
 def graph_to_gpkg(
-    context: GraphRenderContext, db_config: str
+    context: GraphRenderContext,
+    db_config: str,
+    render_uuid: uuid.UUID | None = None,
+    engine: RenderEngine = DEFAULT_RENDER_ENGINE,
+    db: Session | None = None,
 ) -> tuple[uuid.UUID, Path]:
-    render_uuid = uuid.uuid4()
+    render_uuid = render_uuid or uuid.uuid4()
     temp_dir = Path(tempfile.mkdtemp())
     gpkg_path = Path(temp_dir) / f"{render_uuid.hex}.gpkg"
 
@@ -656,15 +1480,12 @@ def graph_to_gpkg(
     geo_layer_name = f"{context.graph.path}__geometry"
     internal_point_layer_name = f"{context.graph.path}__internal_points"
 
-    if context.graph.proj is not None:
-        proj_args = ["-t_srs", context.graph.proj]
-    else:
-        proj_args = []  # leave in original projection (conventionally EPSG:4269)
-
-    __insert_geopackage_geometries(
+    __insert_geometries(
         context,
+        engine,
         db_config,
-        proj_args,
+        db,
+        context.graph.proj,
         gpkg_path,
         geo_layer_name,
         internal_point_layer_name,
@@ -676,14 +1497,17 @@ def graph_to_gpkg(
         conn, geo_layer_name, internal_point_layer_name, type="graph"
     )
 
-    __update_graph_metadata_gpkg(
-        conn, geo_layer_name, internal_point_layer_name, context
-    )
-    __update_geo_attrs_gpkg(conn, context)
+    with metrics.stage("metadata") as stage:
+        __update_graph_metadata_gpkg(
+            conn, geo_layer_name, internal_point_layer_name, context
+        )
+        __update_geo_attrs_gpkg(conn, context)
+        stage.rows = len(context.geo_meta_ids)
 
     start = time.perf_counter()
     if context.graph_edges is not None:
-        __insert_graph_edges(context, conn, geo_layer_name)
+        with metrics.stage("edges") as stage:
+            stage.rows = __insert_graph_edges(context, conn, geo_layer_name)
     log.debug("Inserting graph edges took %s seconds", time.perf_counter() - start)
 
     conn.commit()
@@ -0,0 +1,382 @@
+"""Streamed renders of views.
+
+A GeoPackage has to be written in full before the first byte can be sent.
+The formats here can be written incrementally, so a streamed render starts
+sending features as soon as the first rows come off the database cursor:
+
+  * FlatGeobuf (`fgb`), without a spatial index (see `gerrydb_meta.fgb`).
+  * GeoParquet (`parquet`), one row group per batch of rows. Requires the
+    optional `pyarrow` and `pyproj` packages.
+  * Newline-delimited GeoJSON (`ndjson`): a header line followed by one
+    GeoJSON feature per line.
+
+The view metadata written to the `gerrydb_view_meta`, `gerrydb_geo_meta`,
+`gerrydb_geo_attrs`, and `gpkg_data_columns` tables of a GeoPackage render
+is embedded in each format's metadata section (the FlatGeobuf header's
+`metadata`, the Parquet file's `gerrydb` key-value metadata, or the NDJSON
+header line). Streamed renders only include the view's geographic layer;
+internal points, graph edges, and plan assignments are only available in
+GeoPackage renders.
+"""
+
+import io
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable, Iterator, Sequence
+
+import orjson as json
+import shapely
+from sqlalchemy.orm import Session
+
+from gerrydb_meta import fgb, models
+from gerrydb_meta.crud.view import ViewRenderContext
+from gerrydb_meta.enums import RenderFormat
+from gerrydb_meta.render import (
+    LayerColumn,
+    RenderError,
+    epsg_srid,
+    layer_columns,
+    srs_definition,
+    stream_layer,
+)
+from gerrydb_meta.schemas import ObjectMeta, ViewMeta
+
+STREAM_BATCH_SIZE = 5_000
+
+MEDIA_TYPES = {
+    RenderFormat.FLATGEOBUF: "application/flatgeobuf",
+    RenderFormat.GEOPARQUET: "application/vnd.apache.parquet",
+    RenderFormat.NDJSON: "application/x-ndjson",
+}
+
+# Postgres type OIDs -> FlatGeobuf column types. Anything else is a string.
+_PG_TYPE_OID_TO_FGB_TYPE = {
+    16: fgb.ColumnType.BOOL,  # bool
+    20: fgb.ColumnType.LONG,  # int8
+    21: fgb.ColumnType.INT,  # int2
+    23: fgb.ColumnType.INT,  # int4
+    114: fgb.ColumnType.JSON,  # json
+    700: fgb.ColumnType.DOUBLE,  # float4
+    701: fgb.ColumnType.DOUBLE,  # float8
+    1082: fgb.ColumnType.DATETIME,  # date
+    1114: fgb.ColumnType.DATETIME,  # timestamp
+    1184: fgb.ColumnType.DATETIME,  # timestamptz
+    1700: fgb.ColumnType.DOUBLE,  # numeric
+    3802: fgb.ColumnType.JSON,  # jsonb
+}
+
+# Rows of `gerrydb_meta.render.stream_layer()` are of the form
+# (wkb, srid, min_x, max_x, min_y, max_y, *attrs).
+Row = Sequence
+_ATTRS_START = 6
+
+
+@dataclass(frozen=True)
+class _SpatialRef:
+    srid: int
+    organization: str
+    definition: str  # WKT
+
+
+@dataclass(frozen=True)
+class ViewStream:
+    """A streamed render of a view."""
+
+    format: RenderFormat
+    media_type: str
+    filename: str
+    chunks: Iterator[bytes]
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _text(value) -> str:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default).decode("utf-8")
+    return str(value)
+
+
+def view_metadata(context: ViewRenderContext) -> dict:
+    """Collects the metadata of a view render as a JSON-serializable dict."""
+    return {
+        "gerrydb_view_meta": ViewMeta.from_attributes(context.view).model_dump(),
+        "gerrydb_geo_meta": {
+            str(meta_id): ObjectMeta.from_attributes(meta).model_dump()
+            for meta_id, meta in context.geo_meta.items()
+        },
+        "gerrydb_geo_attrs": {
+            path: {
+                "meta_id": str(meta_id),
+                "valid_from": context.geo_valid_from_dates[path],
+            }
+            for path, meta_id in context.geo_meta_ids.items()
+        },
+        "gerrydb_data_columns": {
+            alias: col.description for alias, col in context.columns.items()
+        },
+    }
+
+
+def _ndjson_chunks(
+    columns: list[LayerColumn],
+    metadata: dict,
+    spatial_ref: _SpatialRef,
+    batches: Iterator[Sequence[Row]],
+) -> Iterator[bytes]:
+    header = {
+        "type": "FeatureCollection",
+        "features": [],
+        "crs": {
+            "type": "name",
+            "properties": {
+                "name": (
+                    f"urn:ogc:def:crs:{spatial_ref.organization}::{spatial_ref.srid}"
+                )
+            },
+        },
+        **metadata,
+    }
+    yield json.dumps(header, default=_json_default) + b"\n"
+
+    names = [col.name for col in columns]
+    for rows in batches:
+        geoms = shapely.from_wkb([row[0] for row in rows])
+        geoms[shapely.is_empty(geoms)] = None
+        geojson = shapely.to_geojson(geoms)
+        lines = []
+        for row, geom_json in zip(rows, geojson):
+            properties = json.dumps(
+                dict(zip(names, row[_ATTRS_START:])), default=_json_default
+            )
+            geom_bytes = b"null" if geom_json is None else geom_json.encode("utf-8")
+            lines.append(
+                b'{"type":"Feature","geometry":'
+                + geom_bytes
+                + b',"properties":'
+                + properties
+                + b"}\n"
+            )
+        yield b"".join(lines)
+
+
+def _fgb_chunks(
+    name: str,
+    columns: list[LayerColumn],
+    descriptions: dict[str, str],
+    metadata: dict,
+    spatial_ref: _SpatialRef,
+    batches: Iterator[Sequence[Row]],
+) -> Iterator[bytes]:
+    fgb_columns = [
+        fgb.Column(
+            name=col.name,
+            type=_PG_TYPE_OID_TO_FGB_TYPE.get(col.type_code, fgb.ColumnType.STRING),
+            description=descriptions.get(col.name),
+        )
+        for col in columns
+    ]
+    yield fgb.header(
+        name,
+        fgb_columns,
+        crs=fgb.Crs(
+            org=spatial_ref.organization,
+            code=spatial_ref.srid,
+            wkt=spatial_ref.definition,
+        ),
+        metadata=json.dumps(metadata, default=_json_default).decode("utf-8"),
+    )
+
+    for rows in batches:
+        geoms = shapely.from_wkb([row[0] for row in rows])
+        yield b"".join(
+            fgb.feature(fgb_columns, geom, tuple(row[_ATTRS_START:]))
+            for row, geom in zip(rows, geoms)
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that buffers writes until they are drained."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_chunks(
+    columns: list[LayerColumn],
+    descriptions: dict[str, str],
+    metadata: dict,
+    spatial_ref: _SpatialRef,
+    batches: Iterator[Sequence[Row]],
+) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyproj import CRS
+
+    pg_type_oid_to_arrow_type = {
+        16: pa.bool_(),
+        20: pa.int64(),
+        21: pa.int32(),
+        23: pa.int32(),
+        700: pa.float64(),
+        701: pa.float64(),
+        1082: pa.date32(),
+        1114: pa.timestamp("us"),
+        1184: pa.timestamp("us", tz="UTC"),
+        1700: pa.float64(),
+    }
+    fields = [
+        pa.field(
+            col.name,
+            pg_type_oid_to_arrow_type.get(col.type_code, pa.string()),
+            metadata=(
+                {"description": descriptions[col.name]}
+                if descriptions.get(col.name)
+                else None
+            ),
+        )
+        for col in columns
+    ]
+    geo_metadata = {
+        "version": "1.1.0",
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": [],
+                "crs": CRS.from_wkt(spatial_ref.definition).to_json_dict(),
+            }
+        },
+    }
+    schema = pa.schema(
+        [*fields, pa.field("geometry", pa.binary())],
+        metadata={
+            "geo": json.dumps(geo_metadata),
+            "gerrydb": json.dumps(metadata, default=_json_default),
+        },
+    )
+    converters = [
+        (
+            _text
+            if pa.types.is_string(field.type)
+            else (float if pa.types.is_floating(field.type) else None)
+        )
+        for field in fields
+    ]
+
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for rows in batches:
+            arrays = []
+            for idx, (field, convert) in enumerate(zip(fields, converters)):
+                values = [row[_ATTRS_START + idx] for row in rows]
+                if convert is not None:
+                    values = [None if v is None else convert(v) for v in values]
+                arrays.append(pa.array(values, type=field.type))
+            arrays.append(
+                pa.array([None if row[0] is None else bytes(row[0]) for row in rows])
+            )
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def stream_view(
+    context: ViewRenderContext,
+    db: Session,
+    session_factory: Callable[[], Session],
+    format: RenderFormat,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> ViewStream:
+    """Renders a view to a streaming format.
+
+    The view's columns, spatial reference system, and metadata are resolved
+    eagerly with `db`, so that errors surface before the response starts.
+    Rows are streamed with a server-side cursor on a fresh session from
+    `session_factory`, as the request's session may be closed before the
+    response is sent.
+
+    Raises:
+        RenderError: The view's projection is not an EPSG code, or the format
+            is not a streaming format.
+    """
+    if format not in MEDIA_TYPES:
+        raise RenderError(f'Format "{format.value}" cannot be streamed.')
+    if format == RenderFormat.GEOPARQUET:
+        try:
+            import pyarrow  # noqa: F401
+            import pyproj  # noqa: F401
+        except ImportError:  # pragma: no cover
+            raise RenderError(
+                "GeoParquet renders require the pyarrow and pyproj packages."
+            )
+
+    srid = epsg_srid(context.view.proj)
+    db_conn = db.connection()
+    columns = layer_columns(db_conn, context.geo_query, "geography")
+    crs_srid = srid if srid is not None else models.GeoBin.geography.type.srid
+    organization, definition = srs_definition(db_conn, crs_srid)
+    spatial_ref = _SpatialRef(
+        srid=crs_srid, organization=organization, definition=definition
+    )
+    metadata = view_metadata(context)
+    descriptions = {alias: col.description for alias, col in context.columns.items()}
+    geo_query = context.geo_query
+
+    def batches() -> Iterator[Sequence[Row]]:
+        with session_factory() as stream_db:
+            result = stream_layer(
+                stream_db.connection(),
+                geo_query,
+                columns,
+                geometry_column="geography",
+                srid=srid,
+                batch_size=batch_size,
+            )
+            try:
+                yield from result.partitions()
+            finally:
+                result.close()
+
+    if format == RenderFormat.FLATGEOBUF:
+        chunks = _fgb_chunks(
+            context.view.path,
+            columns,
+            descriptions,
+            metadata,
+            spatial_ref,
+            batches(),
+        )
+    elif format == RenderFormat.GEOPARQUET:
+        chunks = _parquet_chunks(
+            columns, descriptions, metadata, spatial_ref, batches()
+        )
+    else:
+        chunks = _ndjson_chunks(columns, metadata, spatial_ref, batches())
+
+    return ViewStream(
+        format=format,
+        media_type=MEDIA_TYPES[format],
+        filename=f"{context.view.path}.{format.value}",
+        chunks=chunks,
+    )
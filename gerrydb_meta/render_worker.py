@@ -0,0 +1,245 @@
+"""Background workers for queued view and graph renders.
+
+Renders requested with `?background=true` are added to the job queue
+(the `view_render` and `graph_render` tables) with a `PENDING` status.
+Workers claim pending renders with `SELECT ... FOR UPDATE SKIP LOCKED`,
+so any number of workers (in any number of processes) can drain the
+queue concurrently without claiming the same render twice.
+
+Workers can run inside the API server (see `GERRYDB_RENDER_WORKERS`) or
+as a standalone process:
+
+    python -m gerrydb_meta.render_worker --workers 2
+"""
+
+import threading
+import time
+import traceback
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+import click
+from sqlalchemy.orm import Session
+from uvicorn.config import logger as log
+
+from gerrydb_meta import crud, metrics, models, storage
+from gerrydb_meta.crud.view import ViewRenderSubset
+from gerrydb_meta.render import graph_to_gpkg, render_view_gpkg
+
+DEFAULT_POLL_INTERVAL = 2.0  # seconds
+# Should be well under `crud.view.RENDER_STALE_AFTER`.
+HEARTBEAT_INTERVAL = 30.0  # seconds
+
+
+def _store(gpkg_path: Path, render_id: uuid.UUID, kind: str) -> str:
+    """Moves a rendered GeoPackage to the render store, if available."""
+    store = storage.render_store()
+    if store is None:  # pragma: no cover
+        return str(gpkg_path)
+    return store.put(gpkg_path, render_id=render_id, kind=kind)
+
+
+def _target(obj: models.View | models.Graph) -> str:
+    """Labels a rendered view or graph in render metrics."""
+    return f"{obj.namespace.path}/{obj.path}"
+
+
+def _run_view_render(
+    db: Session, render: models.ViewRender, db_config: str
+) -> dict:  # pragma: no cover
+    subset = ViewRenderSubset.from_key(render.subset)
+    manifest = crud.view.render_manifest(db=db, view=render.view, subset=subset)
+    store = storage.render_store()
+    with metrics.render_target("view", _target(render.view)):
+        _, gpkg_path = render_view_gpkg(
+            db,
+            render.view,
+            db_config,
+            manifest=manifest,
+            previous=crud.view.get_cached_render(
+                db=db,
+                view=render.view,
+                store=store,
+                subset=subset,
+                simplify=render.simplify,
+            ),
+            store=store,
+            base_store=storage.base_layer_store(),
+            render_uuid=render.render_id,
+            subset=subset,
+            simplify=render.simplify,
+        )
+        path = _store(gpkg_path, render.render_id, "view")
+    return {"path": path, "manifest": manifest}
+
+
+def _run_graph_render(
+    db: Session, render: models.GraphRender, db_config: str
+) -> dict:  # pragma: no cover
+    with metrics.render_target("graph", _target(render.graph)):
+        with metrics.stage("context"):
+            render_ctx = crud.graph.render(
+                db=db, graph=render.graph, simplify=render.simplify
+            )
+        _, gpkg_path = graph_to_gpkg(
+            context=render_ctx,
+            db_config=db_config,
+            render_uuid=render.render_id,
+            db=db,
+        )
+        path = _store(gpkg_path, render.render_id, "graph")
+    return {"path": path}
+
+
+@contextmanager
+def _heartbeat(
+    session_factory: Callable[[], Session],
+    crud_obj: crud.CRBase,
+    render_id: uuid.UUID,
+    interval: float,
+) -> Iterator[None]:
+    """Records heartbeats for a claimed render in a background thread.
+
+    Heartbeats are committed on their own sessions, as the render's session
+    is busy (and its transaction open) until the render finishes.
+    """
+    stopped = threading.Event()
+
+    def beat() -> None:
+        while not stopped.wait(interval):
+            try:
+                with session_factory() as db:
+                    crud_obj.heartbeat(db, render_id=render_id)
+                    db.commit()
+            except Exception:  # pragma: no cover
+                log.exception("Failed to record a heartbeat for %s.", render_id.hex)
+
+    thread = threading.Thread(target=beat, name="gerrydb-render-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def process_next_render(
+    session_factory: Callable[[], Session],
+    db_config: str,
+    heartbeat_interval: float = HEARTBEAT_INTERVAL,
+) -> bool:
+    """Claims and runs the oldest pending render, if any.
+
+    Returns:
+        Whether a render was claimed.
+    """
+    with session_factory() as db:
+        render = crud.view.claim_render(db)
+        crud_obj, run = crud.view, _run_view_render
+        if render is None:
+            render = crud.graph.claim_render(db)
+            crud_obj, run = crud.graph, _run_graph_render
+        if render is None:
+            db.rollback()
+            return False
+        # Commit the claim (and release the row lock) before rendering, which
+        # can take minutes.
+        db.commit()
+
+        render_id = render.render_id
+        log.info("Claimed %s render %s", type(render).__name__, render_id.hex)
+        start = time.perf_counter()
+        try:
+            # Keyword arguments for `finish_render()`.
+            with _heartbeat(session_factory, crud_obj, render_id, heartbeat_interval):
+                finished = run(db, render, db_config)
+            crud_obj.finish_render(db, render=render, **finished)
+            db.commit()
+        except Exception:  # pragma: no cover
+            log.exception("Render %s failed.", render_id.hex)
+            db.rollback()
+            render = crud_obj.get_render(db, render_id=render_id)
+            crud_obj.fail_render(db, render=render, error=traceback.format_exc(limit=5))
+            db.commit()
+            return True
+        log.info(
+            "Finished render %s in %.2fs", render_id.hex, time.perf_counter() - start
+        )
+    return True
+
+
+class RenderWorker(threading.Thread):
+    """Polls the render job queue in a background thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        db_config: str,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        super().__init__(name="gerrydb-render-worker", daemon=True)
+        self.session_factory = session_factory
+        self.db_config = db_config
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:  # pragma: no cover
+        while not self._stop_event.is_set():
+            try:
+                claimed = process_next_render(self.session_factory, self.db_config)
+            except Exception:
+                log.exception("Render worker failed to poll the job queue.")
+                claimed = False
+            if not claimed:
+                self._stop_event.wait(self.poll_interval)
+
+    def stop(self) -> None:
+        """Asks the worker to exit after its current render."""
+        self._stop_event.set()
+
+
+def start_workers(
+    num_workers: int,
+    session_factory: Callable[[], Session],
+    db_config: str,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+) -> list[RenderWorker]:
+    """Starts `num_workers` render worker threads."""
+    workers = [
+        RenderWorker(session_factory, db_config, poll_interval)
+        for _ in range(num_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+@click.command()
+@click.option("--workers", default=1, show_default=True, help="Worker threads.")
+@click.option(
+    "--poll-interval",
+    default=DEFAULT_POLL_INTERVAL,
+    show_default=True,
+    help="Seconds to wait between polls when the job queue is empty.",
+)
+def main(workers: int, poll_interval: float):  # pragma: no cover
+    """Runs render workers until interrupted."""
+    from gerrydb_meta.db import Session as SessionLocal
+    from gerrydb_meta.db import ogr2ogr_db_config
+
+    running = start_workers(workers, SessionLocal, ogr2ogr_db_config, poll_interval)
+    log.info("Started %d render worker(s).", len(running))
+    try:
+        while any(worker.is_alive() for worker in running):
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for worker in running:
+            worker.stop()
+        for worker in running:
+            worker.join()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
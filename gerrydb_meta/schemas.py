@@ -2,7 +2,7 @@
 
 from datetime import datetime
 from typing import Any
-from typing import Annotated, Optional, Mapping
+from typing import Annotated, Literal, Optional, Mapping
 from uuid import UUID
 from pydantic import (
     AnyUrl,
@@ -11,6 +11,7 @@ from pydantic import (
     Field,
     ConfigDict,
     AliasPath,
+    StrictBytes,
 )
 
 from gerrydb_meta import enums, models
@@ -239,6 +240,31 @@ class ColumnValue(BaseModel):
     value: Any
 
 
+class ColumnArray(BaseModel):
+    """Values of a column for many geographies, in columnar form.
+
+    `values` is either an array of values or, for numeric and boolean
+    columns, a buffer of fixed-width values with a NumPy `dtype` (e.g.
+    `"<f8"` for little-endian 64-bit floats).
+    """
+
+    values: list[Any] | StrictBytes
+    dtype: Optional[str] = None
+
+
+class ColumnValues(ColumnArray):
+    """Values of a column, with one value per geography path."""
+
+    paths: list[NamespacedGerryPath]
+
+
+class ColumnValuesBatch(BaseModel):
+    """Values of several columns, with one value per geography path in each."""
+
+    paths: list[NamespacedGerryPath]
+    columns: dict[GerryPath, ColumnArray]
+
+
 class GeoLayerBase(BaseModel):
     """Base model for geographic layer metadata."""
 
@@ -657,3 +683,38 @@ class ViewMeta(ViewBase):
             proj=obj.proj,
             graph=None if obj.graph is None else GraphMeta.from_attributes(obj.graph),
         )
+
+
+class RenderStatus(BaseModel):
+    """Job queue status of a view or graph render."""
+
+    render_id: UUID
+    kind: Literal["view", "graph"]
+    namespace: NameStr
+    path: NameStr
+    status: enums.ViewRenderStatus | enums.GraphRenderStatus
+    created_at: datetime
+    error: Optional[str] = None
+    # Number of pending renders ahead of this one (pending renders only).
+    queue_position: Optional[int] = None
+
+    @classmethod
+    def from_attributes(
+        cls,
+        obj: models.ViewRender | models.GraphRender,
+        queue_position: int | None = None,
+    ):
+        if isinstance(obj, models.ViewRender):
+            kind, target = "view", obj.view
+        else:
+            kind, target = "graph", obj.graph
+        return cls(
+            render_id=obj.render_id,
+            kind=kind,
+            namespace=target.namespace.path,
+            path=target.path,
+            status=obj.status,
+            created_at=obj.created_at,
+            error=obj.error,
+            queue_position=queue_position,
+        )
@@ -0,0 +1,547 @@
+"""Storage for rendered view and graph GeoPackages.
+
+Renders are expensive, so successful renders are cached in a `RenderStore`
+and served from there on repeat requests:
+
+  * `GCSRenderStore` uploads gzipped GeoPackages to a Google Cloud Storage
+    bucket and serves them via short-lived signed URLs. It is used when
+    `GCS_BUCKET` and `GCS_KEY_PATH` are set.
+  * `LocalRenderStore` keeps GeoPackages in a directory on local disk
+    (`GERRYDB_RENDER_CACHE_DIR`) with a byte budget
+    (`GERRYDB_RENDER_CACHE_BYTES`); the least recently used renders are
+    evicted when the budget is exceeded.
+
+Renders are compressed once, when they are stored, rather than on every
+download: the GCS store uploads a gzipped copy, and the local store keeps
+precompressed copies (`GERRYDB_RENDER_ENCODINGS`; gzip by default, zstd if
+the optional `zstandard` package is installed) next to each GeoPackage.
+Clients that send a matching `Accept-Encoding` header are served the stored
+bytes as-is.
+
+Vector tiles (see `gerrydb_meta.tiles`) are cached separately, in a
+`LocalTileStore` (`GERRYDB_TILE_CACHE_DIR`, `GERRYDB_TILE_CACHE_BYTES`).
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+from google.cloud import storage
+from google.oauth2.service_account import Credentials
+from uvicorn.config import logger as log
+
+from gerrydb_meta import metrics
+
+GPKG_MEDIA_TYPE = "application/geopackage+sqlite3"
+GCS_URI_SCHEME = "gs"
+SIGNED_URL_EXPIRATION = timedelta(minutes=15)
+
+DEFAULT_RENDER_CACHE_DIR = Path(tempfile.gettempdir()) / "gerrydb-renders"
+DEFAULT_RENDER_CACHE_BYTES = 5 * 1024**3
+DEFAULT_RENDER_ENCODINGS = "gzip"
+DEFAULT_BASE_LAYER_CACHE_DIR = Path(tempfile.gettempdir()) / "gerrydb-base-layers"
+DEFAULT_BASE_LAYER_CACHE_BYTES = 2 * 1024**3
+DEFAULT_TILE_CACHE_DIR = Path(tempfile.gettempdir()) / "gerrydb-tiles"
+DEFAULT_TILE_CACHE_BYTES = 1024**3
+# Tiles are small and numerous, so the tile cache is evicted down to this
+# fraction of its budget rather than rescanned on every write.
+TILE_CACHE_LOW_WATER = 0.9
+
+# Content codings for precompressed renders, in order of preference.
+ENCODING_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+# See the notes on `GZipMiddleware` in `gerrydb_meta.main`: WKB geometries
+# barely compress, so higher levels cost much more time for little gain.
+GZIP_LEVEL = 1
+ZSTD_LEVEL = 3
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class GCSContext:
+    """Google Cloud Storage client and credentials for render uploads."""
+
+    bucket_name: str
+    credentials: Credentials
+    client: storage.Client
+
+
+def is_gcs_uri(path: str | None) -> bool:
+    """Determines whether a render path refers to a Google Cloud Storage blob."""
+    return path is not None and urlparse(path).scheme == GCS_URI_SCHEME
+
+
+def gcs_context() -> GCSContext | None:  # pragma: no cover
+    """Loads a Google Cloud Storage context from the environment, if configured."""
+    bucket_name = os.getenv("GCS_BUCKET")
+    key_path = os.getenv("GCS_KEY_PATH")
+    if bucket_name is None or key_path is None:
+        return None
+
+    try:
+        credentials = Credentials.from_service_account_file(key_path)
+        client = storage.Client(credentials=credentials)
+    except Exception:
+        log.exception("Failed to initialize Google Cloud Storage context.")
+        return None
+    return GCSContext(bucket_name=bucket_name, credentials=credentials, client=client)
+
+
+def signed_url(context: GCSContext, path: str) -> str:  # pragma: no cover
+    """Generates a short-lived download URL for a `gs://` render path."""
+    render_path = urlparse(path)
+    bucket = context.client.bucket(render_path.netloc)
+    blob = bucket.get_blob(render_path.path[1:])
+    return blob.generate_signed_url(
+        version="v4",
+        expiration=SIGNED_URL_EXPIRATION,
+        method="GET",
+        # see https://stackoverflow.com/a/64245028
+        service_account_email=context.credentials.service_account_email,
+        access_token=context.credentials.token,
+    )
+
+
+def compress_render(gpkg_path: Path, encoding: str) -> Path:
+    """Writes a compressed copy of a rendered GeoPackage next to it.
+
+    Returns:
+        The path of the compressed copy.
+    """
+    dest = gpkg_path.with_name(gpkg_path.name + ENCODING_SUFFIXES[encoding])
+    # Stage the file under a temporary name so other processes never
+    # serve a partially compressed render.
+    staging = dest.with_name(dest.name + ".partial")
+    with (
+        metrics.stage("compression"),
+        open(gpkg_path, "rb") as src_fp,
+        open(staging, "wb") as dest_fp,
+    ):
+        if encoding == "zstd":
+            import zstandard
+
+            zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(src_fp, dest_fp)
+        else:
+            with gzip.GzipFile(
+                fileobj=dest_fp, mode="wb", compresslevel=GZIP_LEVEL, mtime=0
+            ) as gzip_fp:
+                shutil.copyfileobj(src_fp, gzip_fp, COPY_CHUNK_SIZE)
+    os.replace(staging, dest)
+    return dest
+
+
+def negotiate_encodings(
+    accept_encoding: str | None, encodings: tuple[str, ...]
+) -> list[str]:
+    """Finds the stored encodings acceptable to a client, in order of preference.
+
+    Args:
+        accept_encoding: The client's `Accept-Encoding` header.
+        encodings: Encodings available on the server.
+    """
+    if not accept_encoding:
+        return []
+
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    default_quality = accepted.get("*", 0.0)
+    return [
+        encoding
+        for encoding in ENCODING_SUFFIXES
+        if encoding in encodings and accepted.get(encoding, default_quality) > 0
+    ]
+
+
+def upload_render(
+    context: GCSContext, *, gpkg_path: Path, render_id: uuid.UUID, kind: str
+) -> str:  # pragma: no cover
+    """Uploads a gzipped GeoPackage to Google Cloud Storage.
+
+    Returns:
+        The `gs://` path of the uploaded render.
+    """
+    bucket = context.client.bucket(context.bucket_name)
+    gzipped_path = compress_render(gpkg_path, "gzip")
+
+    blob_path = f"{render_id.hex}.gpkg.gz"
+    blob = bucket.blob(blob_path)
+    blob.content_encoding = "gzip"
+    blob.metadata = {f"gerrydb-{kind}-render-id": render_id.hex}
+    with metrics.stage("upload"):
+        blob.upload_from_filename(gzipped_path, content_type=GPKG_MEDIA_TYPE)
+    gzipped_path.unlink(missing_ok=True)
+    return f"{GCS_URI_SCHEME}://{context.bucket_name}/{blob_path}"
+
+
+class RenderStore(ABC):
+    """Cache of rendered GeoPackages, addressed by render path."""
+
+    # Encodings of precompressed copies served by `encoded_path()`.
+    encodings: tuple[str, ...] = ()
+
+    @abstractmethod
+    def put(self, gpkg_path: Path, *, render_id: uuid.UUID, kind: str) -> str:
+        """Adds a rendered GeoPackage to the store.
+
+        Args:
+            gpkg_path: Path of a freshly rendered GeoPackage. The store may
+                move or delete the file.
+            render_id: ID of the render.
+            kind: Kind of render (`view` or `graph`).
+
+        Returns:
+            The path of the render in the store (saved as the render's path).
+        """
+
+    @abstractmethod
+    def contains(self, path: str) -> bool:
+        """Determines whether a render path can be served from the store."""
+
+    def url(self, path: str) -> str | None:
+        """Returns an external download URL for a render path, if supported."""
+        return None
+
+    def local_path(self, path: str) -> Path | None:
+        """Returns the local filesystem path for a render path, if supported."""
+        return None
+
+    def encoded_path(self, path: str, encoding: str) -> Path | None:
+        """Returns the local path of a precompressed render, if available."""
+        return None
+
+
+class GCSRenderStore(RenderStore):
+    """Render store backed by a Google Cloud Storage bucket."""
+
+    def __init__(self, context: GCSContext):
+        self.context = context
+
+    def put(
+        self, gpkg_path: Path, *, render_id: uuid.UUID, kind: str
+    ) -> str:  # pragma: no cover
+        return upload_render(
+            self.context, gpkg_path=gpkg_path, render_id=render_id, kind=kind
+        )
+
+    def contains(self, path: str) -> bool:
+        return is_gcs_uri(path)
+
+    def url(self, path: str) -> str | None:  # pragma: no cover
+        return signed_url(self.context, path)
+
+
+class LocalRenderStore(RenderStore):
+    """Render store backed by a directory on local disk.
+
+    Renders are evicted in least recently used order (by modification time,
+    which is bumped whenever a render is served) once the total size of the
+    directory exceeds `max_bytes`. The most recently added render is never
+    evicted, even if it is larger than the budget on its own.
+
+    Precompressed copies of each render (one per encoding in `encodings`)
+    are stored alongside it and evicted with it.
+
+    The directory may be shared by several API server processes.
+    """
+
+    def __init__(
+        self,
+        root: Path | str,
+        max_bytes: int,
+        encodings: tuple[str, ...] = (),
+    ):
+        self.root = Path(root).resolve()
+        self.max_bytes = max_bytes
+        self.encodings = encodings
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _resolve(self, path: str) -> Path | None:
+        resolved = Path(path).resolve()
+        return resolved if resolved.parent == self.root else None
+
+    def path_for(self, *, render_id: uuid.UUID, kind: str) -> str:
+        """Returns the path a render is (or would be) stored at."""
+        return str(self.root / f"{kind}-{render_id.hex}.gpkg")
+
+    def put(self, gpkg_path: Path, *, render_id: uuid.UUID, kind: str) -> str:
+        dest = Path(self.path_for(render_id=render_id, kind=kind))
+        # Stage the file under a temporary name so other processes never
+        # serve a partially copied render.
+        staging = dest.with_suffix(".gpkg.partial")
+        with metrics.stage("upload"):
+            shutil.move(gpkg_path, staging)
+            os.replace(staging, dest)
+        try:
+            gpkg_path.parent.rmdir()  # clean up the (now empty) render directory.
+        except OSError:
+            pass
+        for encoding in self.encodings:
+            compress_render(dest, encoding)
+
+        self.evict(keep=dest)
+        return str(dest)
+
+    def contains(self, path: str) -> bool:
+        resolved = self._resolve(path)
+        return resolved is not None and resolved.is_file()
+
+    def local_path(self, path: str) -> Path | None:
+        resolved = self._resolve(path)
+        if resolved is None:
+            return None
+        try:
+            os.utime(resolved)  # mark as recently used.
+        except FileNotFoundError:
+            return None
+        return resolved
+
+    def encoded_path(self, path: str, encoding: str) -> Path | None:
+        if encoding not in self.encodings:
+            return None
+        resolved = self.local_path(path)
+        if resolved is None:
+            return None
+        encoded = resolved.with_name(resolved.name + ENCODING_SUFFIXES[encoding])
+        return encoded if encoded.is_file() else None
+
+    def size(self) -> int:
+        """Total size of cached renders in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self) -> list[tuple[float, Path, int]]:
+        """Lists renders with their precompressed copies.
+
+        Returns:
+            (modification time, path, total size in bytes) for each render.
+        """
+        sizes = {}
+        mtimes = {}
+        for entry in os.scandir(self.root):
+            name = entry.name
+            for suffix in ENCODING_SUFFIXES.values():
+                name = name.removesuffix(suffix)
+            if not name.endswith(".gpkg"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # pragma: no cover
+                continue  # evicted by another process.
+            path = self.root / name
+            sizes[path] = sizes.get(path, 0) + stat.st_size
+            if name == entry.name:
+                mtimes[path] = stat.st_mtime
+        # Precompressed copies without a GeoPackage are evicted first.
+        return [(mtimes.get(path, 0), path, size) for path, size in sizes.items()]
+
+    @staticmethod
+    def _encoded_variants(path: Path) -> list[Path]:
+        return [
+            path.with_name(path.name + suffix) for suffix in ENCODING_SUFFIXES.values()
+        ]
+
+    def evict(self, keep: Path | None = None) -> list[Path]:
+        """Evicts least recently used renders until the store is within budget.
+
+        Returns:
+            The paths of evicted renders.
+        """
+        evicted = []
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, _, size in entries)
+            for _, path, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                for variant in (path, *self._encoded_variants(path)):
+                    try:
+                        variant.unlink()
+                    except FileNotFoundError:
+                        pass
+                total -= size
+                evicted.append(path)
+
+        if evicted:
+            log.info("Evicted %d cached render(s) from %s.", len(evicted), self.root)
+        return evicted
+
+
+class LocalTileStore:
+    """Cache of vector tiles in a directory on local disk, addressed by key.
+
+    Tiles are evicted in least recently used order (by modification time,
+    which is bumped whenever a tile is served) once the total size of the
+    directory exceeds `max_bytes`.
+
+    The directory may be shared by several API server processes.
+    """
+
+    def __init__(self, root: Path | str, max_bytes: int):
+        self.root = Path(root).resolve()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None  # bytes, estimated since the last scan.
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        # Tiles are spread over subdirectories to keep directories small.
+        return self.root / key[:2] / f"{key}.mvt"
+
+    def get(self, key: str) -> bytes | None:
+        """Gets a cached tile, if available."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used.
+        except FileNotFoundError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """Adds a tile to the cache."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Stage the tile under a unique temporary name so other processes
+        # never serve a partially written tile.
+        staging = path.with_name(f"{path.name}.{uuid.uuid4().hex}.partial")
+        staging.write_bytes(data)
+        os.replace(staging, path)
+
+        with self._lock:
+            self._size = self.size() if self._size is None else self._size + len(data)
+            over_budget = self._size > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def _entries(self) -> list[tuple[float, Path, int]]:
+        """Lists tiles as (modification time, path, size in bytes)."""
+        entries = []
+        for path in self.root.glob("*/*.mvt"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # pragma: no cover
+                continue  # evicted by another process.
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def size(self) -> int:
+        """Total size of cached tiles in bytes."""
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self) -> list[Path]:
+        """Evicts least recently used tiles until the cache is within budget.
+
+        Returns:
+            The paths of evicted tiles.
+        """
+        evicted = []
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, _, size in entries)
+            target = self.max_bytes * TILE_CACHE_LOW_WATER
+            for _, path, size in entries:
+                if total <= target:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted.append(path)
+            self._size = total
+
+        if evicted:
+            log.info("Evicted %d cached tile(s) from %s.", len(evicted), self.root)
+        return evicted
+
+
+@lru_cache(maxsize=None)
+def render_store() -> RenderStore | None:
+    """Loads the process-wide render store from the environment.
+
+    Google Cloud Storage is preferred when configured; otherwise renders are
+    cached on local disk unless `GERRYDB_RENDER_CACHE_BYTES` is 0.
+    """
+    context = gcs_context()
+    if context is not None:
+        return GCSRenderStore(context)
+
+    max_bytes = int(
+        os.environ.get("GERRYDB_RENDER_CACHE_BYTES", DEFAULT_RENDER_CACHE_BYTES)
+    )
+    if max_bytes <= 0:
+        return None
+    root = os.environ.get("GERRYDB_RENDER_CACHE_DIR", DEFAULT_RENDER_CACHE_DIR)
+    return LocalRenderStore(root, max_bytes, render_encodings())
+
+
+@lru_cache(maxsize=None)
+def base_layer_store() -> LocalRenderStore | None:
+    """Loads the process-wide store of geometry base layers from the environment.
+
+    Base layers are intermediate GeoPackages shared by renders of views with
+    the same geometries (see `gerrydb_meta.render.render_view_gpkg()`). They
+    are always cached on local disk, unless `GERRYDB_BASE_LAYER_CACHE_BYTES`
+    is 0.
+    """
+    max_bytes = int(
+        os.environ.get("GERRYDB_BASE_LAYER_CACHE_BYTES", DEFAULT_BASE_LAYER_CACHE_BYTES)
+    )
+    if max_bytes <= 0:
+        return None
+    root = os.environ.get("GERRYDB_BASE_LAYER_CACHE_DIR", DEFAULT_BASE_LAYER_CACHE_DIR)
+    return LocalRenderStore(root, max_bytes)
+
+
+@lru_cache(maxsize=None)
+def tile_store() -> LocalTileStore | None:
+    """Loads the process-wide vector tile cache from the environment.
+
+    Tiles are always cached on local disk, unless `GERRYDB_TILE_CACHE_BYTES`
+    is 0.
+    """
+    max_bytes = int(
+        os.environ.get("GERRYDB_TILE_CACHE_BYTES", DEFAULT_TILE_CACHE_BYTES)
+    )
+    if max_bytes <= 0:
+        return None
+    root = os.environ.get("GERRYDB_TILE_CACHE_DIR", DEFAULT_TILE_CACHE_DIR)
+    return LocalTileStore(root, max_bytes)
+
+
+def render_encodings() -> tuple[str, ...]:
+    """Loads the encodings of precompressed renders from the environment."""
+    encodings = []
+    raw = os.environ.get("GERRYDB_RENDER_ENCODINGS", DEFAULT_RENDER_ENCODINGS)
+    for encoding in raw.split(","):
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        if encoding not in ENCODING_SUFFIXES:
+            raise ValueError(f'Unknown render encoding "{encoding}".')
+        if encoding == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:  # pragma: no cover
+                log.warning("zstandard is not installed; not storing zstd renders.")
+                continue
+        encodings.append(encoding)
+    return tuple(encodings)
@@ -0,0 +1,158 @@
+"""Mapbox Vector Tiles of views and geographic layers.
+
+Tiles are built in the database with `ST_AsMVT()`, from only the
+geographies whose bounding boxes intersect the tile, so serving a web map
+never requires a full render. Built tiles are cached in a `LocalTileStore`
+(see `gerrydb_meta.storage.tile_store()`).
+
+A tile's cache key is derived from a `source` that identifies the version
+of the data in the tile (a view's render manifest, or an immutable
+`GeoSetVersion`), so a cache hit is a store lookup and never queries the
+tile's features.
+"""
+
+import uuid
+from dataclasses import dataclass
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from gerrydb_meta import models
+from gerrydb_meta.storage import LocalTileStore
+
+MVT_MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+TILE_EXTENT = 4096
+TILE_BUFFER = 64  # in tile coordinates
+MAX_ZOOM = 22
+WEB_MERCATOR_SRID = 3857
+SEARCH_SEGMENT_LENGTH = 1.0  # in degrees
+
+_TILE_NAMESPACE = uuid.UUID("9b0b7f5e-6a51-4f0e-8d49-2c3c7d6f1f0e")
+
+
+class TileError(Exception):
+    """Raised when a tile cannot be built."""
+
+
+@dataclass(frozen=True)
+class Tile:
+    """A built (or cached) vector tile."""
+
+    data: bytes
+    key: str  # cache key, also used as an ETag
+
+
+def _world():
+    """The Web Mercator bounds of the world (the z=0 tile)."""
+    return func.ST_MakeEnvelope(
+        -20037508.342789244,
+        -20037508.342789244,
+        20037508.342789244,
+        20037508.342789244,
+        WEB_MERCATOR_SRID,
+    )
+
+
+def _envelope(z: int, x: int, y: int, margin: float = 0.0):
+    """The Web Mercator bounds of a tile, optionally padded by `margin` tiles."""
+    return func.ST_TileEnvelope(z, x, y, _world(), margin)
+
+
+def _validate(z: int, x: int, y: int) -> None:
+    if not 0 <= z <= MAX_ZOOM:
+        raise TileError(f"Zoom level must be between 0 and {MAX_ZOOM}.")
+    if not (0 <= x < 2**z and 0 <= y < 2**z):
+        raise TileError(f"Tile ({x}, {y}) is out of bounds at zoom level {z}.")
+
+
+def _search_area(z: int, x: int, y: int):
+    """The area around a tile to select geographies from, as a geography.
+
+    Returns `None` for tiles at least 180° wide, which are not searched:
+    the edges of a geography are geodesics, so such a tile's edges would
+    take the short way around the globe. Smaller tiles are clipped to the
+    bounds of the world (so padding never crosses the antimeridian) and
+    segmentized, so their edges follow parallels rather than geodesics.
+    """
+    if z < 2:
+        return None
+    envelope = func.ST_ClipByBox2D(
+        _envelope(z, x, y, TILE_BUFFER / TILE_EXTENT), func.Box2D(_world())
+    )
+    return func.geography(
+        func.ST_Segmentize(
+            func.ST_Transform(envelope, models.GeoBin.geography.type.srid),
+            SEARCH_SEGMENT_LENGTH,
+        )
+    )
+
+
+def _in_tile(features: Select, z: int, x: int, y: int) -> Select:
+    """Restricts a query over `GeoBin` to the geographies near a tile.
+
+    The `&&` operator uses the spatial index on `geo_bin.geography`.
+    """
+    search_area = _search_area(z, x, y)
+    if search_area is None:
+        return features
+    return features.where(models.GeoBin.geography.op("&&")(search_area))
+
+
+def _build(
+    db: Session, features: Select, layer_name: str, z: int, x: int, y: int
+) -> bytes:
+    geom = func.ST_AsMVTGeom(
+        func.ST_Transform(func.geometry(models.GeoBin.geography), WEB_MERCATOR_SRID),
+        _envelope(z, x, y),
+        TILE_EXTENT,
+        TILE_BUFFER,
+    ).label("geom")
+    tile_rows = features.add_columns(geom).subquery("tile_rows")
+    data = db.execute(
+        select(
+            func.ST_AsMVT(tile_rows.table_valued(), layer_name, TILE_EXTENT, "geom")
+        ).where(tile_rows.c.geom.is_not(None))
+    ).scalar()
+    return b"" if data is None else bytes(data)
+
+
+def get_tile(
+    db: Session,
+    features: Select,
+    *,
+    layer_name: str,
+    source: str,
+    z: int,
+    x: int,
+    y: int,
+    store: LocalTileStore | None = None,
+) -> Tile:
+    """Gets a vector tile, building it if it isn't cached.
+
+    Args:
+        db: Database session.
+        features: Query over `GeoBin` that selects a `path` column and the
+            attributes of each feature (but not its geometry).
+        layer_name: Name of the tile's (only) layer.
+        source: Identifies the view or layer that `features` comes from,
+            any parameters that `features` depends on, and the version of its
+            data. Tiles with the same source (and coordinates) are
+            interchangeable.
+        z, x, y: Tile coordinates (in the XYZ scheme).
+        store: Tile cache.
+
+    Raises:
+        TileError: The tile coordinates are invalid.
+    """
+    _validate(z, x, y)
+    key = uuid.uuid5(_TILE_NAMESPACE, f"{source}|{layer_name}|{z}/{x}/{y}").hex
+
+    if store is not None:
+        data = store.get(key)
+        if data is not None:
+            return Tile(data=data, key=key)
+
+    data = _build(db, _in_tile(features, z, x, y), layer_name, z, x, y)
+    if store is not None:
+        store.put(key, data)
+    return Tile(data=data, key=key)
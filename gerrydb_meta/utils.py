@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from sqlalchemy import text
 from gerrydb_meta import models
 
@@ -6,3 +8,13 @@ def create_column_value_partition_text(column_id: int):
     table_name = models.ColumnValue.__table__.name
     sql = f"CREATE TABLE IF NOT EXISTS {models.SCHEMA}.{table_name}_{column_id} PARTITION OF {models.SCHEMA}.{table_name} FOR VALUES IN ({column_id})"
     return text(sql)
+
+
+def create_column_value_partitions_text(column_ids: Iterable[int]):
+    """Creates the partitions of several columns in a single statement batch."""
+    return text(
+        ";\n".join(
+            create_column_value_partition_text(column_id).text
+            for column_id in column_ids
+        )
+    )
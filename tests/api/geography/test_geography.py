@@ -192,6 +192,84 @@ def test_api_geography_create__twice(ctx_public_namespace_read_write, unit_box_m
     ), create_twice_response.json()
 
 
+def test_api_geography_create_stream(ctx_public_namespace_read_write, unit_box_wkb):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+    geos = [{"path": f"box_{idx}", "geography": unit_box_wkb} for idx in range(5)]
+
+    create_response = ctx.client.post(
+        f"{GEOS_ROOT}/{namespace}/stream?batch_size=2",
+        headers=headers(ctx),
+        content=msgpack.dumps(geos),
+    )
+    assert create_response.status_code == HTTPStatus.CREATED, msgpack.loads(
+        create_response.content
+    )
+    assert msgpack.loads(create_response.content) == {"count": 5}
+
+    all_response = ctx.client.get(f"{GEOS_ROOT}/{namespace}")
+    assert all_response.status_code == HTTPStatus.OK, all_response.json()
+    assert sorted(geo["path"] for geo in all_response.json()) == [
+        geo["path"] for geo in geos
+    ]
+
+
+def test_api_geography_create_stream__bulk_load(
+    ctx_public_namespace_read_write, unit_box_wkb
+):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+    geos = [{"path": f"box_{idx}", "geography": unit_box_wkb} for idx in range(5)]
+
+    create_response = ctx.client.post(
+        f"{GEOS_ROOT}/{namespace}/stream?batch_size=2&bulk_load=true",
+        headers=headers(ctx),
+        content=msgpack.dumps(geos),
+    )
+    assert create_response.status_code == HTTPStatus.CREATED, msgpack.loads(
+        create_response.content
+    )
+    assert msgpack.loads(create_response.content) == {"count": 5}
+
+    read_response = ctx.client.get(f"{GEOS_ROOT}/{namespace}/box_3")
+    assert read_response.status_code == HTTPStatus.OK, read_response.json()
+
+
+def test_api_geography_create_stream__invalid(
+    ctx_public_namespace_read_write, unit_box_wkb
+):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    truncated_response = ctx.client.post(
+        f"{GEOS_ROOT}/{namespace}/stream",
+        headers=headers(ctx),
+        content=msgpack.dumps([{"path": "box", "geography": unit_box_wkb}])[:-1],
+    )
+    assert (
+        truncated_response.status_code == HTTPStatus.BAD_REQUEST
+    ), truncated_response.json()
+
+    # A bad geography in a later batch rolls back the whole upload.
+    invalid_response = ctx.client.post(
+        f"{GEOS_ROOT}/{namespace}/stream?batch_size=1",
+        headers=headers(ctx),
+        content=msgpack.dumps(
+            [
+                {"path": "box", "geography": unit_box_wkb},
+                {"path": "box_2", "geography": "not bytes"},
+            ]
+        ),
+    )
+    assert (
+        invalid_response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    ), invalid_response.json()
+    assert invalid_response.json()["detail"][0]["loc"][:2] == ["body", 1]
+
+    all_response = ctx.client.get(f"{GEOS_ROOT}/{namespace}")
+    assert all_response.json() == []
+
+
 def test_api_geography_create_patch(ctx_public_namespace_read_write, unit_box_msgpack):
     ctx = ctx_public_namespace_read_write
     namespace = ctx.namespace.path
@@ -612,3 +612,56 @@ def test_write_success_private_match(monkeypatch, private_ns):
         base_namespace="private_ns",
     )
     assert out is private_ns
+
+
+def _chunked(data: bytes, size: int) -> list[bytes]:
+    return [data[idx : idx + size] for idx in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024])
+def test_msgpack_array_batches(chunk_size):
+    items = [{"path": f"geo_{idx}", "geography": bytes(idx)} for idx in range(10)]
+    data = msgpack.packb(items)
+
+    batches = list(msgpack_array_batches(_chunked(data, chunk_size), 4))
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert [item for batch in batches for item in batch] == items
+
+
+def test_msgpack_array_batches_empty_array():
+    assert list(msgpack_array_batches([msgpack.packb([])], 4)) == []
+
+
+@pytest.mark.parametrize(
+    "data, match",
+    [
+        (b"", "truncated"),
+        (msgpack.packb([1, 2, 3])[:-1], "truncated"),
+        (msgpack.packb([1, 2, 3]) + b"\x01", "after MessagePack array"),
+        (msgpack.packb({"path": "geo"}), "Unexpected type"),
+    ],
+)
+def test_msgpack_array_batches_invalid(data, match):
+    with pytest.raises(ValueError, match=match):
+        list(msgpack_array_batches(_chunked(data, 2), 2))
+
+
+def test_request_chunks_sync_endpoint():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+
+    @app.post("/count")
+    def count(request: Request):
+        return sum(
+            len(batch)
+            for batch in msgpack_array_batches(request_chunks(request), batch_size=3)
+        )
+
+    def body():
+        data = msgpack.packb(list(range(100)))
+        yield from _chunked(data, 16)
+
+    response = TestClient(app).post("/count", content=body())
+    assert response.json() == 100
@@ -2,6 +2,8 @@
 
 from http import HTTPStatus
 
+import msgpack
+import numpy as np
 import pytest
 
 from gerrydb_meta.enums import ColumnType
@@ -9,6 +11,8 @@ from gerrydb_meta.main import API_PREFIX
 from tests.api import create_column, create_geo, get_column_values
 
 COLUMNS_ROOT = f"{API_PREFIX}/columns"
+COLUMNAR_VALUES_ROOT = f"{API_PREFIX}/__column_values"
+MSGPACK_HEADERS = {"content-type": "application/msgpack"}
 
 
 @pytest.mark.parametrize(
@@ -200,3 +204,176 @@ def test_api_column_value_set__update(ctx_public_namespace_read_write):
     ), put_again_response.json()
 
     assert get_column_values(ctx, col_obj) == {"geo": 2}
+
+
+@pytest.mark.parametrize(
+    "typed_vals",
+    [
+        (ColumnType.INT, [-1, 1], None),
+        (ColumnType.FLOAT, [1, 3.141592653589793], None),
+        (ColumnType.BOOL, [True, False], None),
+        (ColumnType.STR, ["", "abc"], None),
+        (ColumnType.INT, np.array([-1, 1], dtype="<i8").tobytes(), "<i8"),
+        (ColumnType.FLOAT, np.array([1.0, 0.5], dtype="<f4").tobytes(), "<f4"),
+    ],
+    ids=("int", "float", "bool", "str", "int_buffer", "float_buffer"),
+)
+def test_api_column_value_set_columnar(ctx_public_namespace_read_write, typed_vals):
+    col_type, values, dtype = typed_vals
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    col_obj = create_column(ctx, "col", col_type=col_type)
+    create_geo(ctx, "geo1")
+    create_geo(ctx, "geo2")
+
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}/col",
+        content=msgpack.dumps(
+            {
+                "paths": [f"/{namespace}/geo1", "geo2"],
+                "values": values,
+                "dtype": dtype,
+            }
+        ),
+        headers=MSGPACK_HEADERS,
+    )
+    assert put_response.status_code == HTTPStatus.NO_CONTENT, put_response.json()
+
+    expected = values if dtype is None else np.frombuffer(values, dtype=dtype).tolist()
+    assert get_column_values(ctx, col_obj) == {"geo1": expected[0], "geo2": expected[1]}
+
+
+def test_api_column_value_set_columnar__bad_values(ctx_public_namespace_read_write):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    create_column(ctx, "col", col_type=ColumnType.INT)
+    create_geo(ctx, "geo1")
+    create_geo(ctx, "geo2")
+
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}/col",
+        content=msgpack.dumps({"paths": ["geo1", "geo2"], "values": [1, "abc"]}),
+        headers=MSGPACK_HEADERS,
+    )
+
+    err = put_response.json()
+    assert put_response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, err
+    assert "Type errors" in err["detail"]
+
+
+def test_api_column_value_set_columnar__not_msgpack(ctx_public_namespace_read_write):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    create_column(ctx, "col")
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}/col",
+        json={"paths": [], "values": []},
+    )
+    assert put_response.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+def test_api_column_value_set_batch(ctx_public_namespace_read_write):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    int_col = create_column(ctx, "int_col", col_type=ColumnType.INT)
+    float_col = create_column(ctx, "float_col", col_type=ColumnType.FLOAT)
+    str_col = create_column(ctx, "str_col", aliases=["name"], col_type=ColumnType.STR)
+    create_geo(ctx, "geo1")
+    create_geo(ctx, "geo2")
+
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}",
+        content=msgpack.dumps(
+            {
+                "paths": ["geo1", f"/{namespace}/geo2"],
+                "columns": {
+                    "int_col": {"values": [1, 2]},
+                    "float_col": {
+                        "values": np.array([0.5, 1.5], dtype="<f8").tobytes(),
+                        "dtype": "<f8",
+                    },
+                    "name": {"values": ["a", "b"]},
+                },
+            }
+        ),
+        headers=MSGPACK_HEADERS,
+    )
+    assert put_response.status_code == HTTPStatus.NO_CONTENT, put_response.json()
+
+    assert get_column_values(ctx, int_col) == {"geo1": 1, "geo2": 2}
+    assert get_column_values(ctx, float_col) == {"geo1": 0.5, "geo2": 1.5}
+    assert get_column_values(ctx, str_col) == {"geo1": "a", "geo2": "b"}
+
+
+def test_api_column_value_set_batch__bad_values(ctx_public_namespace_read_write):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    int_col = create_column(ctx, "int_col", col_type=ColumnType.INT)
+    create_column(ctx, "bool_col", col_type=ColumnType.BOOL)
+    create_geo(ctx, "geo")
+
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}",
+        content=msgpack.dumps(
+            {
+                "paths": ["geo"],
+                "columns": {"int_col": {"values": [1]}, "bool_col": {"values": [1]}},
+            }
+        ),
+        headers=MSGPACK_HEADERS,
+    )
+
+    err = put_response.json()
+    assert put_response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY, err
+    assert "Type errors" in err["detail"]
+    assert len(err["errors"]) == 1
+    assert "bool_col" in err["errors"][0]
+    assert get_column_values(ctx, int_col) == {}
+
+
+def test_api_column_value_set_batch__alias_of_same_column(
+    ctx_public_namespace_read_write,
+):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    create_column(ctx, "col", aliases=["col_alias"])
+    create_geo(ctx, "geo")
+
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}",
+        content=msgpack.dumps(
+            {
+                "paths": ["geo"],
+                "columns": {"col": {"values": [1]}, "col_alias": {"values": [2]}},
+            }
+        ),
+        headers=MSGPACK_HEADERS,
+    )
+
+    assert put_response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert "same column" in put_response.json()["detail"]
+
+
+def test_api_column_value_set_batch__nonexistent_col(
+    ctx_public_namespace_read_write,
+):
+    ctx = ctx_public_namespace_read_write
+    namespace = ctx.namespace.path
+
+    create_geo(ctx, "geo")
+    put_response = ctx.client.put(
+        f"{COLUMNAR_VALUES_ROOT}/{namespace}",
+        content=msgpack.dumps(
+            {"paths": ["geo"], "columns": {"missing": {"values": [1]}}}
+        ),
+        headers=MSGPACK_HEADERS,
+    )
+
+    assert put_response.status_code == HTTPStatus.NOT_FOUND
+    assert "Column not found" in put_response.json()["detail"]
@@ -55,3 +55,27 @@ def test_bad_path_lenghts():
         normalize_path(
             "greece/atlantis/underworld", case_sensitive_uid=True, path_length=2
         )
+
+
+def test_streamed_rows_batches():
+    from sqlalchemy import column, create_engine, select, table, text
+    from sqlalchemy.orm import Session
+
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        db.execute(text("CREATE TABLE edge (path_1 TEXT, path_2 TEXT)"))
+        db.execute(
+            text("INSERT INTO edge VALUES (:a, :b)"),
+            [{"a": str(idx), "b": str(idx + 1)} for idx in range(7)],
+        )
+        query = (
+            select(column("path_1"), column("path_2"))
+            .select_from(table("edge"))
+            .order_by(column("path_1"))
+        )
+        rows = StreamedRows(db, query, batch_size=3)
+
+        assert [len(batch) for batch in rows.batches()] == [3, 3, 1]
+        # Rows are re-fetched each time they are iterated.
+        assert [row.path_2 for row in rows] == [str(idx + 1) for idx in range(7)]
+        assert [row.path_2 for row in rows] == [str(idx + 1) for idx in range(7)]
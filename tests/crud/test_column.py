@@ -1,8 +1,13 @@
 """Tests for GerryDB CRUD operations on column metadata."""
 
+import struct
+
+import numpy as np
 import pytest
 from gerrydb_meta import crud, schemas
+from gerrydb_meta.crud.column import _copy_value_rows, column_values_array
 from gerrydb_meta.enums import ColumnKind, ColumnType
+from gerrydb_meta.exceptions import ColumnValueTypeError
 from gerrydb_meta import models
 
 
@@ -275,6 +280,352 @@ def test_crud_column_set_values__error_dup_geo(db_with_meta):
         )
 
 
+def test_crud_column_set_columnar_values__error_dup_geo(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    geos, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(path="central_atlantis"),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    col, _ = crud.column.create(
+        db=db,
+        obj_in=schemas.ColumnCreate(
+            canonical_path="geo_identifier",
+            description="an identifier number for the region",
+            kind=ColumnKind.IDENTIFIER,
+            type=ColumnType.INT,
+        ),
+        obj_meta=meta,
+        namespace=ns,
+    )
+
+    with pytest.raises(
+        ValueError,
+        match="Duplicate geography path 'central_atlantis' found.",
+    ):
+        crud.column.set_columnar_values(
+            db=db,
+            col=col,
+            geos=[geo for geo, _ in geos] + [geos[0][0]],
+            values=[100, 101, 200],
+            dtype=None,
+            obj_meta=meta,
+        )
+
+
+@pytest.mark.parametrize(
+    "col_type,values,dtype,expected",
+    [
+        (ColumnType.INT, [-1, 1], None, [-1, 1]),
+        (ColumnType.FLOAT, [1, 2.5], None, [1.0, 2.5]),
+        (ColumnType.STR, ["", "abc"], None, ["", "abc"]),
+        (ColumnType.BOOL, [True, False], None, [True, False]),
+        (ColumnType.INT, [], None, []),
+        (ColumnType.INT, np.array([1, 2], dtype="<u4").tobytes(), "<u4", [1, 2]),
+        (ColumnType.FLOAT, np.array([0.5], dtype=">f8").tobytes(), ">f8", [0.5]),
+        (ColumnType.FLOAT, np.array([3], dtype="<i2").tobytes(), "<i2", [3.0]),
+        (ColumnType.BOOL, np.array([True], dtype="?").tobytes(), "?", [True]),
+    ],
+)
+def test_column_values_array(col_type, values, dtype, expected):
+    array = column_values_array(col_type, values, dtype)
+    assert array.tolist() == expected
+    assert all(type(value) is type(exp) for value, exp in zip(array.tolist(), expected))
+
+
+@pytest.mark.parametrize(
+    "col_type,values,dtype",
+    [
+        (ColumnType.INT, [1, 1.5], None),
+        (ColumnType.INT, [1, None], None),
+        (ColumnType.INT, [[1], [1, 2]], None),
+        (ColumnType.INT, np.array([2**63], dtype="<u8").tobytes(), "<u8"),
+        (ColumnType.FLOAT, [1.0, "abc"], None),
+        (ColumnType.STR, ["abc", 1], None),
+        (ColumnType.BOOL, [1, 0], None),
+        (ColumnType.FLOAT, b"abc", "<f8"),
+        (ColumnType.FLOAT, b"abcdefgh", None),
+        (ColumnType.FLOAT, b"abcdefgh", "O"),
+        (ColumnType.FLOAT, b"abcdefgh", "not-a-dtype"),
+        (ColumnType.STR, b"abcdefgh", "u1"),
+    ],
+)
+def test_column_values_array__type_error(col_type, values, dtype):
+    with pytest.raises(ColumnValueTypeError):
+        column_values_array(col_type, values, dtype)
+
+
+@pytest.mark.parametrize(
+    "col_type,values,value_format",
+    [
+        (ColumnType.INT, [-1, 2**40], "!q"),
+        (ColumnType.FLOAT, [0.5, -2.0], "!d"),
+        (ColumnType.BOOL, [True, False], "!?"),
+        (ColumnType.STR, ["", "Atlântida"], None),
+    ],
+)
+def test_copy_value_rows(col_type, values, value_format):
+    col = models.DataColumn(col_id=7, type=col_type)
+    buf = _copy_value_rows(
+        col, np.array([3, 4], dtype=np.int32), column_values_array(col_type, values)
+    )
+
+    rows = []
+    offset = 0
+    while offset < len(buf):
+        (num_fields,) = struct.unpack_from("!h", buf, offset)
+        offset += 2
+        fields = []
+        for _ in range(num_fields):
+            (size,) = struct.unpack_from("!i", buf, offset)
+            fields.append(buf[offset + 4 : offset + 4 + size])
+            offset += 4 + size
+        col_id, geo_id, value = fields
+        rows.append(
+            (
+                struct.unpack("!i", col_id)[0],
+                struct.unpack("!i", geo_id)[0],
+                (
+                    value.decode("utf-8")
+                    if value_format is None
+                    else struct.unpack(value_format, value)[0]
+                ),
+            )
+        )
+    assert rows == [(7, 3, values[0]), (7, 4, values[1])]
+
+
+def test_crud_column_set_columnar_values(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    geos, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(path="central_atlantis"),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    col, _ = crud.column.create(
+        db=db,
+        obj_in=schemas.ColumnCreate(
+            canonical_path="population",
+            description="total population",
+            kind=ColumnKind.COUNT,
+            type=ColumnType.FLOAT,
+        ),
+        obj_meta=meta,
+        namespace=ns,
+    )
+
+    crud.column.set_columnar_values(
+        db=db,
+        col=col,
+        geos=[geo for geo, _ in geos],
+        values=np.array([10, 20], dtype="<i4").tobytes(),
+        dtype="<i4",
+        obj_meta=meta,
+    )
+
+    values = {
+        value.geo_id: value.val_float
+        for value in db.query(models.ColumnValue).filter(
+            models.ColumnValue.col_id == col.col_id
+        )
+    }
+    assert values == {geos[0][0].geo_id: 10.0, geos[1][0].geo_id: 20.0}
+
+    # Only changed values are superseded.
+    crud.column.set_columnar_values(
+        db=db,
+        col=col,
+        geos=[geo for geo, _ in geos],
+        values=[10.0, 30.0],
+        dtype=None,
+        obj_meta=meta,
+    )
+    versions = sorted(
+        (value.geo_id, value.val_float, value.valid_to is None)
+        for value in db.query(models.ColumnValue).filter(
+            models.ColumnValue.col_id == col.col_id
+        )
+    )
+    assert versions == [
+        (geos[0][0].geo_id, 10.0, True),
+        (geos[1][0].geo_id, 20.0, False),
+        (geos[1][0].geo_id, 30.0, True),
+    ]
+
+    with pytest.raises(ColumnValueTypeError, match="Expected 2 column values"):
+        crud.column.set_columnar_values(
+            db=db,
+            col=col,
+            geos=[geo for geo, _ in geos],
+            values=[1.0],
+            dtype=None,
+            obj_meta=meta,
+        )
+
+
+def test_crud_column_set_columnar_values_bulk(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    geos, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(path="central_atlantis"),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    cols = {}
+    for path, col_type in (("population", ColumnType.INT), ("mayor", ColumnType.STR)):
+        cols[path], _ = crud.column.create(
+            db=db,
+            obj_in=schemas.ColumnCreate(
+                canonical_path=path,
+                description=path,
+                kind=ColumnKind.OTHER,
+                type=col_type,
+            ),
+            obj_meta=meta,
+            namespace=ns,
+        )
+
+    with pytest.raises(ColumnValueTypeError) as exc_info:
+        crud.column.set_columnar_values_bulk(
+            db=db,
+            geos=[geo for geo, _ in geos],
+            columns=[
+                (cols["population"], [1.5, 2.5], None),
+                (cols["mayor"], ["Poseidon"], None),
+            ],
+            obj_meta=meta,
+        )
+    assert len(exc_info.value.errors) == 2
+    col_ids = [col.col_id for col in cols.values()]
+    assert (
+        db.query(models.ColumnValue)
+        .filter(models.ColumnValue.col_id.in_(col_ids))
+        .count()
+        == 0
+    )
+
+    crud.column.set_columnar_values_bulk(
+        db=db,
+        geos=[geo for geo, _ in geos],
+        columns=[
+            (cols["population"], np.array([100, 200], dtype="<i8").tobytes(), "<i8"),
+            (cols["mayor"], ["Poseidon", "Atlas"], None),
+        ],
+        obj_meta=meta,
+    )
+
+    values = {
+        (value.col_id, value.geo_id): value.val_int or value.val_str
+        for value in db.query(models.ColumnValue).filter(
+            models.ColumnValue.col_id.in_(col_ids)
+        )
+    }
+    central_id, western_id = (geo.geo_id for geo, _ in geos)
+    assert values == {
+        (cols["population"].col_id, central_id): 100,
+        (cols["population"].col_id, western_id): 200,
+        (cols["mayor"].col_id, central_id): "Poseidon",
+        (cols["mayor"].col_id, western_id): "Atlas",
+    }
+
+    # Only changed values are superseded, in every column.
+    crud.column.set_columnar_values_bulk(
+        db=db,
+        geos=[geo for geo, _ in geos],
+        columns=[
+            (cols["population"], [100, 300], None),
+            (cols["mayor"], ["Triton", "Atlas"], None),
+        ],
+        obj_meta=meta,
+    )
+    current = {
+        (value.col_id, value.geo_id): value.val_int or value.val_str
+        for value in db.query(models.ColumnValue).filter(
+            models.ColumnValue.col_id.in_(col_ids),
+            models.ColumnValue.valid_to.is_(None),
+        )
+    }
+    assert current == {
+        (cols["population"].col_id, central_id): 100,
+        (cols["population"].col_id, western_id): 300,
+        (cols["mayor"].col_id, central_id): "Triton",
+        (cols["mayor"].col_id, western_id): "Atlas",
+    }
+    assert (
+        db.query(models.ColumnValue)
+        .filter(models.ColumnValue.col_id.in_(col_ids))
+        .count()
+        == 6
+    )
+
+
+def test_crud_column_set_columnar_values_bulk__error_dup_geo(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    geos, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(path="central_atlantis"),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    cols = []
+    for path in ("population", "households"):
+        col, _ = crud.column.create(
+            db=db,
+            obj_in=schemas.ColumnCreate(
+                canonical_path=path,
+                description=path,
+                kind=ColumnKind.COUNT,
+                type=ColumnType.INT,
+            ),
+            obj_meta=meta,
+            namespace=ns,
+        )
+        cols.append(col)
+
+    with pytest.raises(
+        ValueError,
+        match="Duplicate geography path 'western_atlantis' found.",
+    ):
+        crud.column.set_columnar_values_bulk(
+            db=db,
+            geos=[geo for geo, _ in geos] + [geos[1][0]],
+            columns=[(col, [1, 2, 3], None) for col in cols],
+            obj_meta=meta,
+        )
+    assert (
+        db.query(models.ColumnValue)
+        .filter(models.ColumnValue.col_id.in_([col.col_id for col in cols]))
+        .count()
+        == 0
+    )
+
+
 def test_crud_column_update_col_of_each_type(db_with_meta):
     db, meta = db_with_meta
 
@@ -1,7 +1,12 @@
+import hashlib
+import struct
+
 from gerrydb_meta import crud, schemas
+from gerrydb_meta.crud.geography import _copy_stage_rows, _geo_bin_lookup
+from gerrydb_meta.geo_hash import geometry_hashes
 from gerrydb_meta.exceptions import *
-from shapely import Point, Polygon
-from shapely import wkb
+from shapely import MultiPolygon, Point, Polygon
+from shapely import to_wkb, wkb
 from shapely.geometry import box
 from geoalchemy2 import WKBElement
 import pytest
@@ -135,6 +140,308 @@ def test_crud_geography_create_bulk_already_exist_fail(db_with_meta):
     assert str(e.value) == "Cannot create geographies that already exist."
 
 
+def test_crud_geography_create_bulk_stream(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+
+    batches = [
+        [
+            schemas.GeographyCreate(path="central_atlantis", geography=square.wkb),
+            schemas.GeographyCreate(path="western_atlantis", geography=None),
+        ],
+        # Geometries shared across batches share a GeoBin.
+        [schemas.GeographyCreate(path="eastern_atlantis", geography=square.wkb)],
+    ]
+    num_created, etag = crud.geography.create_bulk_stream(
+        db=db,
+        batches=iter(batches),
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+
+    assert num_created == 3
+    assert etag == crud.geography.etag(db, ns)
+    geos = {
+        geo.path: geo
+        for geo in crud.geography._CRGeography__get_existing_geos(
+            db,
+            obj_paths=["central_atlantis", "western_atlantis", "eastern_atlantis"],
+            namespace=ns,
+        )
+    }
+    assert len(geos) == 3
+    assert (
+        geos["central_atlantis"].versions[0].geo_bin_id
+        == geos["eastern_atlantis"].versions[0].geo_bin_id
+    )
+
+
+def test_crud_geography_create_bulk_stream_rolls_back(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+
+    def batches():
+        yield [schemas.GeographyCreate(path="central_atlantis")]
+        # Duplicates of geographies in earlier batches are caught.
+        yield [schemas.GeographyCreate(path="central_atlantis")]
+
+    with pytest.raises(BulkCreateError) as e:
+        crud.geography.create_bulk_stream(
+            db=db,
+            batches=batches(),
+            obj_meta=meta,
+            geo_import=geo_import,
+            namespace=ns,
+        )
+
+    assert e.value.paths == ["central_atlantis"]
+    assert (
+        crud.geography._CRGeography__get_existing_paths(
+            db, obj_paths=["central_atlantis"], namespace=ns
+        )
+        == []
+    )
+
+
+def test_copy_stage_rows():
+    buf = _copy_stage_rows(
+        [
+            schemas.GeographyCreate(path="central_atlantis", geography=square.wkb),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        start=3,
+    ).getvalue()
+
+    assert buf.startswith(b"PGCOPY\n\xff\r\n\x00" + bytes(8))
+    assert buf.endswith(b"\xff\xff")
+
+    def fields(offset):
+        (num_fields,) = struct.unpack_from("!h", buf, offset)
+        offset += 2
+        values = []
+        for _ in range(num_fields):
+            (length,) = struct.unpack_from("!i", buf, offset)
+            offset += 4
+            if length < 0:
+                values.append(None)
+            else:
+                values.append(buf[offset : offset + length])
+                offset += length
+        return values, offset
+
+    first, offset = fields(19)
+    second, offset = fields(offset)
+    assert offset == len(buf) - 2
+    assert first == [
+        struct.pack("!i", 3),
+        b"central_atlantis",
+        hashlib.md5(square.wkb).digest(),
+        square.wkb,
+        None,
+    ]
+    assert second == [
+        struct.pack("!i", 4),
+        b"western_atlantis",
+        hashlib.md5(Polygon().wkb).digest(),
+        None,
+        None,
+    ]
+
+
+def test_crud_geography_geo_bin_lookup(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    geos, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(path="central_atlantis", geography=square.wkb),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    square_hash, empty_hash = geometry_hashes([square.wkb, None])
+    missing_hash = hashlib.md5(b"atlantis").digest()
+
+    assert dict(
+        db.execute(_geo_bin_lookup([square_hash, empty_hash, missing_hash])).all()
+    ) == {
+        version.geo_bin_id: hsh
+        for (_, version), hsh in zip(geos, [square_hash, empty_hash])
+    }
+    assert db.execute(_geo_bin_lookup([])).all() == []
+
+
+def test_crud_geography_geo_bin_lookup_uses_index(db_with_meta):
+    db, _ = db_with_meta
+    conn = db.connection()
+    stmt = _geo_bin_lookup([hashlib.md5(b"atlantis").digest()]).compile(
+        dialect=conn.dialect
+    )
+    # `geo_bin` is nearly empty in tests, so the planner would rightly prefer
+    # a sequential scan; disabling them checks that an index scan is possible.
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = "\n".join(
+        row[0] for row in conn.exec_driver_sql(f"EXPLAIN {stmt.string}", stmt.params)
+    )
+
+    assert "geo_bin_geometry_hash" in plan
+    assert "Seq Scan on geo_bin" not in plan
+
+
+def test_crud_geography_geometry_hashes_match_database(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+
+    wkbs = [
+        square.wkb,
+        MultiPolygon([box(1, -1, 3, 1), box(4, -1, 6, 1)]).wkb,
+        # Big-endian WKB is hashed as it is stored (little-endian).
+        to_wkb(box(-3, -1, -1, 1), byte_order=0),
+        None,
+    ]
+    geos, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(path=f"atlantis_{idx}", geography=geography)
+            for idx, geography in enumerate(wkbs)
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+
+    assert [bytes(version.geo_bin.geometry_hash) for _, version in geos] == (
+        geometry_hashes(wkbs)
+    )
+
+
+def test_crud_geography_copy_bulk(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+
+    # An existing GeoBin is reused by geographies loaded with `COPY`.
+    (existing_geo,), _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[schemas.GeographyCreate(path="old_atlantis", geography=square.wkb)],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+
+    batches = [
+        [
+            schemas.GeographyCreate(
+                path="central_atlantis",
+                geography=square.wkb,
+                internal_point=internal_point.wkb,
+            ),
+            schemas.GeographyCreate(path="western_atlantis"),
+        ],
+        [
+            schemas.GeographyCreate(
+                path="eastern_atlantis",
+                geography=box(1, -1, 3, 1).wkb,
+                internal_point=Point(2, 0).wkb,
+            )
+        ],
+    ]
+    num_created, etag = crud.geography.copy_bulk(
+        db=db,
+        batches=iter(batches),
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+
+    assert num_created == 3
+    assert etag == crud.geography.etag(db, ns)
+    geos = {
+        geo.path: geo
+        for geo in crud.geography._CRGeography__get_existing_geos(
+            db,
+            obj_paths=["central_atlantis", "western_atlantis", "eastern_atlantis"],
+            namespace=ns,
+        )
+    }
+    assert len(geos) == 3
+    central, western, eastern = (
+        geos[path].versions[0]
+        for path in ("central_atlantis", "western_atlantis", "eastern_atlantis")
+    )
+    assert central.geo_bin_id == existing_geo[1].geo_bin_id
+    assert central.import_id == geo_import.import_id
+    assert wkb.loads(bytes(eastern.geography.data)).equals(box(1, -1, 3, 1))
+    assert wkb.loads(bytes(eastern.internal_point.data)).equals(Point(2, 0))
+    assert wkb.loads(bytes(western.geography.data)).is_empty
+    assert wkb.loads(bytes(western.internal_point.data)).is_empty
+
+
+def test_crud_geography_copy_bulk_duplicate_paths_fail(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+
+    with pytest.raises(BulkCreateError) as e:
+        crud.geography.copy_bulk(
+            db=db,
+            batches=[
+                [schemas.GeographyCreate(path="central_atlantis")],
+                [schemas.GeographyCreate(path="central_atlantis")],
+            ],
+            obj_meta=meta,
+            geo_import=geo_import,
+            namespace=ns,
+        )
+
+    assert e.value.paths == ["central_atlantis"]
+    assert str(e.value) == "Cannot create geographies with duplicate paths."
+
+
+def test_crud_geography_copy_bulk_already_exist_fail(db_with_meta):
+    db, meta = db_with_meta
+    ns = make_atlantis_ns(db, meta)
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    crud.geography.create_bulk(
+        db=db,
+        objs_in=[schemas.GeographyCreate(path="central_atlantis")],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+
+    with pytest.raises(BulkCreateError) as e:
+        crud.geography.copy_bulk(
+            db=db,
+            batches=[
+                [
+                    schemas.GeographyCreate(path="central_atlantis"),
+                    schemas.GeographyCreate(path="western_atlantis"),
+                ]
+            ],
+            obj_meta=meta,
+            geo_import=geo_import,
+            namespace=ns,
+        )
+
+    assert e.value.paths == ["central_atlantis"]
+    assert str(e.value) == "Cannot create geographies that already exist."
+    assert (
+        crud.geography._CRGeography__get_existing_paths(
+            db, obj_paths=["western_atlantis"], namespace=ns
+        )
+        == []
+    )
+
+
 def test_crud_geography_create_bulk_wkb_fail(db_with_meta):
     with pytest.raises(Exception) as e:
         db, meta = db_with_meta
@@ -1,12 +1,22 @@
 import networkx as nx
 from gerrydb_meta import crud, schemas
-from gerrydb_meta.enums import ColumnKind, ColumnType
+from gerrydb_meta.enums import ColumnKind, ColumnType, ViewRenderStatus
 from shapely import Point, Polygon
 import pytest
 from gerrydb_meta import models
 from gerrydb_meta.exceptions import CreateValueError
+from gerrydb_meta.crud.view import (
+    MAX_RENDER_ATTEMPTS,
+    ViewRenderChanges,
+    ViewRenderManifest,
+    ViewRenderSubset,
+    _with_column_values,
+)
+from gerrydb_meta.storage import LocalRenderStore
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql
 
 square_corners = [(-1, -1), (1, -1), (1, 1), (-1, 1)]
 
@@ -579,9 +589,33 @@ def test_view_render(db_with_meta):
         ("central_atlantis", "1"),
         ("western_atlantis", "2"),
     ]
+    assert set(view_render_context.geo_meta_ids) == {
+        "central_atlantis",
+        "western_atlantis",
+    }
+    assert view_render_context.geo_valid_from_dates.keys() == (
+        view_render_context.geo_meta_ids.keys()
+    )
+
+    # The view's set versions and geographies are resolved in a single query
+    # (shared by the plan assignments), and plan assignments and graph edges
+    # are only read when they're iterated.
+    statements = []
+
+    def record_statement(conn, cursor, statement, *args):
+        statements.append(statement)
 
+    conn = db.connection()
+    event.listen(conn, "before_cursor_execute", record_statement)
+    try:
+        crud.view.render(db=db, view=view)
+    finally:
+        event.remove(conn, "before_cursor_execute", record_statement)
+    assert sum("view_geo_set_versions" in statement for statement in statements) == 1
+    assert len(statements) <= 5
 
-def test_view_make_and_get_cached_render(db_with_meta_and_user):
+
+def test_view_make_and_get_cached_render(db_with_meta_and_user, tmp_path):
     db, meta, user = db_with_meta_and_user
 
     ns = make_atlantis_ns(db, meta)
@@ -782,6 +816,191 @@ def test_view_make_and_get_cached_render(db_with_meta_and_user):
 
     assert retrieved_cashed_render == cashed_render
 
+    # Renders that are not in the render store are not served from cache.
+    store = LocalRenderStore(tmp_path / "renders", max_bytes=2**20)
+    assert crud.view.get_cached_render(db=db, view=view, store=store) is None
+
+    gpkg_path = tmp_path / "mayor_power.gpkg"
+    gpkg_path.write_bytes(b"gpkg")
+    stored_render = crud.view.cache_render(
+        db=db,
+        view=view,
+        created_by=user,
+        render_id=uuid.uuid4(),
+        path=gpkg_path,
+        store=store,
+    )
+    assert store.contains(stored_render.path)
+    assert crud.view.get_cached_render(db=db, view=view, store=store) == stored_render
+
+
+def _make_mayors_view(db, meta) -> models.View:
+    """Creates a view of a single geography with one column."""
+    ns = make_atlantis_ns(db, meta)
+
+    geo_import, _ = crud.geo_import.create(db=db, obj_meta=meta, namespace=ns)
+    geo, _ = crud.geography.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.GeographyCreate(
+                path="central_atlantis",
+                geography=None,
+                internal_point=None,
+            ),
+        ],
+        obj_meta=meta,
+        geo_import=geo_import,
+        namespace=ns,
+    )
+    geo_layer, _ = crud.geo_layer.create(
+        db=db,
+        obj_in=schemas.GeoLayerCreate(
+            path="atlantis_blocks",
+            description="The legendary city of Atlantis",
+            source_url="https://en.wikipedia.org/wiki/Atlantis",
+        ),
+        obj_meta=meta,
+        namespace=ns,
+    )
+    loc, _ = crud.locality.create_bulk(
+        db=db,
+        objs_in=[
+            schemas.LocalityCreate(
+                canonical_path="atlantis_locality",
+                parent_path=None,
+                name="Atlantis",
+                aliases=None,
+            ),
+        ],
+        obj_meta=meta,
+    )
+    crud.geo_layer.map_locality(
+        db=db,
+        layer=geo_layer,
+        locality=loc[0],
+        geographies=[geo[0] for geo in geo],
+        obj_meta=meta,
+    )
+    mayor_col, _ = crud.column.create(
+        db=db,
+        obj_in=schemas.ColumnCreate(
+            canonical_path="mayor",
+            description="the mayor of the city",
+            kind=ColumnKind.IDENTIFIER,
+            type=ColumnType.STR,
+        ),
+        obj_meta=meta,
+        namespace=ns,
+    )
+    crud.column.set_values(
+        db=db, col=mayor_col, values=[(geo[0][0], "Poseidon")], obj_meta=meta
+    )
+    col_set, _ = crud.column_set.create(
+        db=db,
+        obj_in=schemas.ColumnSetCreate(
+            path="mayors", description="mayors", columns=["mayor"]
+        ),
+        obj_meta=meta,
+        namespace=ns,
+    )
+    view_template, _ = crud.view_template.create(
+        db=db,
+        obj_in=schemas.ViewTemplateCreate(
+            path="mayor_template", description="mayors", members=["mayors"]
+        ),
+        resolved_members=[col_set],
+        obj_meta=meta,
+        namespace=ns,
+    )
+    view, _ = crud.view.create(
+        db=db,
+        obj_in=schemas.ViewCreate(
+            path="mayors",
+            description="mayors",
+            template="mayor_template",
+            locality="atlantis_locality",
+            layer="atlantis_blocks",
+        ),
+        obj_meta=meta,
+        namespace=ns,
+        template=view_template,
+        locality=loc[0],
+        layer=geo_layer,
+    )
+    return view
+
+
+def test_view_render_queue(db_with_meta_and_user):
+    db, meta, user = db_with_meta_and_user
+    view = _make_mayors_view(db, meta)
+
+    assert crud.view.get_queued_render(db=db, view=view) is None
+    assert crud.view.claim_render(db) is None
+
+    render_uuid = uuid.uuid4()
+    queued = crud.view.queue_render(
+        db=db, view=view, created_by=user, render_id=render_uuid
+    )
+    assert queued.status == ViewRenderStatus.PENDING
+    assert queued.path is None
+    assert crud.view.queue_position(db, render=queued) == 0
+    assert crud.view.get_queued_render(db=db, view=view) == queued
+    assert crud.view.get_cached_render(db=db, view=view) is None
+
+    claimed = crud.view.claim_render(db)
+    assert claimed.render_id == render_uuid
+    assert claimed.status == ViewRenderStatus.RUNNING
+    assert claimed.view == view
+    # Running renders are not handed out twice.
+    assert crud.view.claim_render(db) is None
+    assert crud.view.get_queued_render(db=db, view=view) == claimed
+
+    finished = crud.view.finish_render(db, render=claimed, path="/tmp/mayors.gpkg")
+    assert finished.status == ViewRenderStatus.SUCCEEDED
+    assert crud.view.get_queued_render(db=db, view=view) is None
+    assert crud.view.get_cached_render(db=db, view=view) == finished
+    assert crud.view.get_render(db, render_id=render_uuid) == finished
+
+    failed_render = crud.view.queue_render(
+        db=db, view=view, created_by=user, render_id=uuid.uuid4()
+    )
+    crud.view.claim_render(db)
+    crud.view.fail_render(db, render=failed_render, error="ogr2ogr exploded")
+    assert failed_render.status == ViewRenderStatus.FAILED
+    assert failed_render.error == "ogr2ogr exploded"
+    assert crud.view.get_cached_render(db=db, view=view) == finished
+    assert crud.view.get_queued_render(db=db, view=view) is None
+
+
+def test_view_render_queue_reclaims_abandoned_renders(db_with_meta_and_user):
+    db, meta, user = db_with_meta_and_user
+    view = _make_mayors_view(db, meta)
+    render_uuid = uuid.uuid4()
+    crud.view.queue_render(db=db, view=view, created_by=user, render_id=render_uuid)
+
+    claimed = crud.view.claim_render(db)
+    assert claimed.attempts == 1
+    # A render with a recent heartbeat is still running.
+    crud.view.heartbeat(db, render_id=render_uuid)
+    assert crud.view.claim_render(db) is None
+
+    for attempt in range(2, MAX_RENDER_ATTEMPTS + 1):
+        # The worker stops sending heartbeats (e.g. it was killed).
+        claimed.heartbeat_at = datetime.now(timezone.utc) - timedelta(hours=1)
+        db.flush()
+        claimed = crud.view.claim_render(db)
+        assert claimed.render_id == render_uuid
+        assert claimed.status == ViewRenderStatus.RUNNING
+        assert claimed.attempts == attempt
+
+    claimed.heartbeat_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.flush()
+    assert crud.view.claim_render(db) is None
+    failed = crud.view.get_render(db, render_id=render_uuid)
+    assert failed.status == ViewRenderStatus.FAILED
+    assert "abandoned" in failed.error
+    assert crud.view.get_queued_render(db=db, view=view) is None
+
 
 from unittest.mock import patch
 import logging
@@ -1361,3 +1580,123 @@ def test_view_create_cols_multiple_namespaces(db_with_meta, caplog):
     assert view.loc == loc
     assert view.layer == geo_layer
     assert view.template_version == view_template
+
+
+def _manifest(**kwargs):
+    fields = {
+        "geometry": "geo",
+        "columns": {"aland": "a", "awater": "b"},
+        "geo_meta": "meta",
+        "geo_valid_from": "dates",
+        "plans": {"plan": "p"},
+    }
+    fields.update(kwargs)
+    return ViewRenderManifest(**fields)
+
+
+def test_view_render_manifest_changes_since():
+    previous = _manifest().to_dict()
+    assert _manifest().changes_since(previous) == ViewRenderChanges(
+        columns=[], geo_attrs=False, plans=False
+    )
+    assert _manifest(
+        columns={"aland": "a", "awater": "c"}, geo_meta="meta2"
+    ).changes_since(previous) == ViewRenderChanges(
+        columns=["awater"], geo_attrs=True, plans=False
+    )
+    assert _manifest(plans={"plan": "q"}).changes_since(previous) == ViewRenderChanges(
+        columns=[], geo_attrs=False, plans=True
+    )
+
+    # Renders with different geometries or columns can't be updated in place.
+    assert _manifest(geometry="geo2").changes_since(previous) is None
+    assert _manifest(columns={"aland": "a"}).changes_since(previous) is None
+    assert _manifest().changes_since(None) is None
+
+
+def test_view_render_subset_key():
+    assert ViewRenderSubset().key() is None
+    assert ViewRenderSubset.from_key(None) == ViewRenderSubset()
+
+    subset = ViewRenderSubset(
+        columns=("b", "a", "b"), paths=("23005", "23001"), bbox=(-71, 43, -70, 44)
+    )
+    key = subset.key()
+    assert key == {
+        "columns": ["a", "b"],
+        "paths": ["23001", "23005"],
+        "bbox": [-71.0, 43.0, -70.0, 44.0],
+    }
+    # Equivalent subsets share a key (and thus cached renders).
+    assert ViewRenderSubset.from_key(key).key() == key
+    assert (
+        ViewRenderSubset(columns=("a",)).key() != ViewRenderSubset(paths=("a",)).key()
+    )
+
+
+def test_view_render_subset_restricts_columns_and_geographies():
+    columns = {"aland": object(), "awater": object(), "pop": object()}
+    assert ViewRenderSubset().select_columns(columns) is columns
+    assert list(ViewRenderSubset(columns=("pop", "aland")).select_columns(columns)) == [
+        "aland",
+        "pop",
+    ]
+
+    query = ViewRenderSubset(paths=("23001",), bbox=(-71, 43, -70, 44)).restrict(
+        select(models.Geography.path)
+        .select_from(models.GeoVersion)
+        .join(models.Geography, models.Geography.geo_id == models.GeoVersion.geo_id)
+        .join(models.GeoBin, models.GeoBin.geo_bin_id == models.GeoVersion.geo_bin_id),
+        models.Geography.path,
+    )
+    sql = str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+    assert "gerrydb.geography.path IN ('23001')" in sql
+    assert (
+        "gerrydb.geo_bin.geography && "
+        "geography(ST_MakeEnvelope(-71, 43, -70, 44, 4269))"
+    ) in sql
+
+
+def test_with_column_values_joins_partitions():
+    at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    columns = {
+        "aland": models.DataColumn(
+            col_id=3,
+            type=ColumnType.INT,
+            canonical_ref=models.ColumnRef(path="aland"),
+        ),
+        "share": models.DataColumn(
+            col_id=7,
+            type=ColumnType.FLOAT,
+            canonical_ref=models.ColumnRef(path="share"),
+        ),
+    }
+    query = _with_column_values(
+        select(models.Geography.path), models.Geography.geo_id, at, columns
+    )
+    sql = str(
+        query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert [col.name for col in query.selected_columns] == ["path", "aland", "share"]
+    assert "gerrydb.column_value_3.val_int AS aland" in sql
+    assert "gerrydb.column_value_7.val_float AS share" in sql
+    assert (
+        "LEFT OUTER JOIN gerrydb.column_value_3 ON "
+        "gerrydb.column_value_3.geo_id = gerrydb.geography.geo_id"
+    ) in sql
+    assert "col_id" not in sql
+    assert "GROUP BY" not in sql
+
+    # Without columns, the query is unchanged.
+    assert "column_value" not in str(
+        _with_column_values(
+            select(models.Geography.path), models.Geography.geo_id, at, {}
+        )
+    )
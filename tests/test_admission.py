@@ -0,0 +1,85 @@
+"""Tests for render admission control."""
+
+import json
+
+import pytest
+
+from gerrydb_meta.admission import RenderAdmission, release_after
+from gerrydb_meta.exceptions import RenderLimitError
+from gerrydb_meta.main import render_limit_error
+
+
+def test_render_admission_unlimited(tmp_path):
+    admission = RenderAdmission(slot_dir=tmp_path)
+    tickets = [admission.acquire() for _ in range(10)]
+    assert admission.snapshot()["in_flight"] == 10
+    for ticket in tickets:
+        ticket.release()
+    assert admission.snapshot() == {
+        "worker_limit": 0,
+        "host_limit": 0,
+        "in_flight": 0,
+        "admitted": 10,
+        "rejected": 0,
+    }
+
+
+def test_render_admission_worker_limit(tmp_path):
+    admission = RenderAdmission(worker_limit=2, slot_dir=tmp_path, retry_after=5)
+    first = admission.acquire()
+    with admission.admit():
+        with pytest.raises(RenderLimitError, match="per worker") as exc_info:
+            admission.acquire()
+        assert exc_info.value.retry_after == 5
+
+    # Released slots (including from blocks that fail) can be reused.
+    with pytest.raises(ValueError):
+        with admission.admit():
+            raise ValueError
+    with admission.admit():
+        pass
+    first.release()
+    first.release()  # no-op
+
+    assert admission.snapshot() == {
+        "worker_limit": 2,
+        "host_limit": 0,
+        "in_flight": 0,
+        "admitted": 4,
+        "rejected": 1,
+    }
+
+
+def test_render_admission_host_limit(tmp_path):
+    # Workers on the same host share slots through the slot directory.
+    worker_a = RenderAdmission(host_limit=2, slot_dir=tmp_path)
+    worker_b = RenderAdmission(host_limit=2, slot_dir=tmp_path)
+
+    ticket_a = worker_a.acquire()
+    ticket_b = worker_b.acquire()
+    with pytest.raises(RenderLimitError, match="per host"):
+        worker_a.acquire()
+    assert worker_a.snapshot()["in_flight"] == 1
+    assert worker_a.snapshot()["rejected"] == 1
+
+    ticket_b.release()
+    worker_a.acquire().release()
+    ticket_a.release()
+    assert worker_a.snapshot()["in_flight"] == 0
+    assert worker_b.snapshot()["in_flight"] == 0
+
+
+def test_release_after(tmp_path):
+    admission = RenderAdmission(worker_limit=1, slot_dir=tmp_path)
+    chunks = release_after(iter([b"a", b"b"]), admission.acquire())
+    assert next(chunks) == b"a"
+    assert admission.snapshot()["in_flight"] == 1
+    assert list(chunks) == [b"b"]
+    assert admission.snapshot()["in_flight"] == 0
+
+
+def test_render_limit_error_response():
+    response = render_limit_error(None, RenderLimitError("Too many.", retry_after=7))
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "7"
+    assert json.loads(response.body)["detail"] == "Too many."
@@ -0,0 +1,107 @@
+"""Tests for process-wide database connection pooling."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from gerrydb_meta.db import (
+    DEFAULT_POOL_MAX_OVERFLOW,
+    DEFAULT_POOL_SIZE,
+    PoolStats,
+    pool_config_from_env,
+)
+
+
+def test_pool_config_defaults():
+    config = pool_config_from_env({})
+    assert config["poolclass"] is QueuePool
+    assert config["pool_size"] == DEFAULT_POOL_SIZE
+    assert config["max_overflow"] == DEFAULT_POOL_MAX_OVERFLOW
+    assert config["pool_pre_ping"] is True
+    assert "connect_args" not in config
+
+
+def test_pool_config_from_env():
+    config = pool_config_from_env(
+        {
+            "GERRYDB_POOL_SIZE": "10",
+            "GERRYDB_POOL_MAX_OVERFLOW": "2",
+            "GERRYDB_POOL_TIMEOUT": "2.5",
+            "GERRYDB_POOL_RECYCLE": "-1",
+            "GERRYDB_POOL_PRE_PING": "false",
+            "GERRYDB_STATEMENT_TIMEOUT": "60000",
+        }
+    )
+    assert config["pool_size"] == 10
+    assert config["max_overflow"] == 2
+    assert config["pool_timeout"] == 2.5
+    assert config["pool_recycle"] == -1
+    assert config["pool_pre_ping"] is False
+    assert config["connect_args"] == {"options": "-c statement_timeout=60000"}
+
+
+def test_pool_config_bad_value():
+    with pytest.raises(ValueError):
+        pool_config_from_env({"GERRYDB_POOL_SIZE": "lots"})
+
+
+def test_pool_stats_counts_checkouts_and_overflow():
+    engine = create_engine(
+        "sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1
+    )
+    stats = PoolStats(engine)
+
+    first = engine.connect()
+    first.execute(text("SELECT 1"))
+    # The pool only holds one connection, so this one comes from overflow.
+    second = engine.connect()
+    second.execute(text("SELECT 1"))
+
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["connects"] == 2
+    assert snapshot["checked_out"] == 2
+    assert snapshot["overflow_checkouts"] == 1
+    assert snapshot["max_overflow_in_use"] == 1
+
+    second.close()
+    first.close()
+
+    # Connections are reused rather than reopened.
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    snapshot = stats.snapshot()
+    assert snapshot["checkins"] == 3
+    assert snapshot["checkouts"] == 3
+    assert snapshot["connects"] == 2
+    engine.dispose()
+
+
+def test_pool_stats_records_waits():
+    engine = create_engine(
+        "sqlite://", poolclass=QueuePool, pool_size=1, max_overflow=1
+    )
+    stats = PoolStats(engine)
+
+    # Opening the pool's first connection is not a wait.
+    with stats.time_checkout():
+        first = engine.connect()
+    assert stats.snapshot()["waits"] == 0
+
+    # The pool's only connection is checked out, so this checkout waits.
+    with stats.time_checkout():
+        second = engine.connect()
+    assert stats.snapshot()["waits"] == 1
+    second.close()
+    first.close()
+
+    # An idle connection is available.
+    with stats.time_checkout():
+        engine.connect().close()
+    stats.record_wait(0.5)
+
+    snapshot = stats.snapshot()
+    assert snapshot["waits"] == 2
+    assert snapshot["wait_seconds_max"] == 0.5
+    assert snapshot["wait_seconds_total"] >= 0.5
+    engine.dispose()
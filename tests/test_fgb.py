@@ -0,0 +1,88 @@
+"""Tests for the minimal FlatGeobuf writer."""
+
+from datetime import date
+
+import geopandas as gpd
+from shapely.geometry import LineString, MultiPolygon, Point, Polygon
+
+from gerrydb_meta import fgb
+
+NAD83_WKT = (
+    'GEOGCS["NAD83",DATUM["North_American_Datum_1983",'
+    'SPHEROID["GRS 1980",6378137,298.257222101]],'
+    'PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433],'
+    'AUTHORITY["EPSG","4269"]]'
+)
+
+COLUMNS = [
+    fgb.Column(name="path", type=fgb.ColumnType.STRING, description="Path"),
+    fgb.Column(name="total pop", type=fgb.ColumnType.LONG),
+    fgb.Column(name="share", type=fgb.ColumnType.DOUBLE),
+    fgb.Column(name="is_urban", type=fgb.ColumnType.BOOL),
+    fgb.Column(name="valid_from", type=fgb.ColumnType.DATETIME),
+    fgb.Column(name="count", type=fgb.ColumnType.INT),
+]
+
+
+def _write_layer(path, geoms, metadata=None):
+    with open(path, "wb") as fgb_fp:
+        fgb_fp.write(
+            fgb.header(
+                "layer",
+                COLUMNS,
+                crs=fgb.Crs(org="EPSG", code=4269, wkt=NAD83_WKT),
+                metadata=metadata,
+            )
+        )
+        for idx, geom in enumerate(geoms):
+            fgb_fp.write(
+                fgb.feature(
+                    COLUMNS,
+                    geom,
+                    (
+                        str(idx),
+                        idx * 10**10,
+                        idx / 2,
+                        idx % 2 == 0,
+                        date(2020, 1, 1),
+                        None if idx % 2 else idx,
+                    ),
+                )
+            )
+
+
+def test_fgb_write_layer(tmp_path):
+    path = tmp_path / "test.fgb"
+    square = Polygon(
+        [(0, 0), (4, 0), (4, 4), (0, 4)], [[(1, 1), (2, 1), (2, 2), (1, 2)]]
+    )
+    geoms = [
+        square,
+        MultiPolygon([square, Polygon([(10, 10), (11, 10), (11, 11)])]),
+        Point(1, 2),
+        LineString([(0, 0), (1, 1)]),
+    ]
+    _write_layer(path, geoms, metadata='{"gerrydb_view_meta": {}}')
+
+    gdf = gpd.read_file(path)
+    assert gdf.crs.to_epsg() == 4269
+    assert list(gdf["path"]) == ["0", "1", "2", "3"]
+    assert list(gdf["total pop"]) == [0, 10**10, 2 * 10**10, 3 * 10**10]
+    assert list(gdf["share"]) == [0, 0.5, 1, 1.5]
+    assert list(gdf["is_urban"]) == [True, False, True, False]
+    assert list(gdf["valid_from"].dt.year) == [2020] * 4
+    assert gdf["count"].isna().tolist() == [False, True, False, True]
+    for actual, expected in zip(gdf.geometry, geoms):
+        assert actual.equals(expected)
+    assert b'{"gerrydb_view_meta": {}}' in path.read_bytes()
+
+
+def test_fgb_write_null_and_empty_geometries(tmp_path):
+    path = tmp_path / "test.fgb"
+    _write_layer(path, [None, Polygon(), Point(1, 1)])
+
+    gdf = gpd.read_file(path)
+    assert list(gdf["path"]) == ["0", "1", "2"]
+    assert gdf.geometry.iloc[0] is None
+    assert gdf.geometry.iloc[1] is None
+    assert gdf.geometry.iloc[2].equals(Point(1, 1))
@@ -0,0 +1,52 @@
+"""Tests for batch geometry hashing."""
+
+import hashlib
+
+import shapely
+from shapely.geometry import MultiPolygon, Point, Polygon, box
+
+from gerrydb_meta import geo_hash
+from gerrydb_meta.geo_hash import EMPTY_POLYGON_WKB, geometry_hashes
+
+GEOMETRIES = [
+    box(0, 0, 1, 1),
+    box(-70.5, 43.25, -70.25, 43.5),
+    MultiPolygon([box(0, 0, 1, 1), box(2, 2, 3, 3)]),
+    # A geometry large enough that hashing it releases the GIL.
+    Point(0, 0).buffer(1, quad_segs=256),
+]
+
+
+def test_geometry_hashes():
+    wkbs = [geom.wkb for geom in GEOMETRIES]
+    assert geometry_hashes(wkbs + [None, b""]) == [
+        *(hashlib.md5(wkb).digest() for wkb in wkbs),
+        hashlib.md5(EMPTY_POLYGON_WKB).digest(),
+        hashlib.md5(EMPTY_POLYGON_WKB).digest(),
+    ]
+
+
+def test_geometry_hashes_big_endian():
+    ndr_wkbs = [shapely.to_wkb(geom, byte_order=1) for geom in GEOMETRIES]
+    xdr_wkbs = [shapely.to_wkb(geom, byte_order=0) for geom in GEOMETRIES]
+    assert xdr_wkbs != ndr_wkbs
+    assert geometry_hashes(xdr_wkbs) == geometry_hashes(ndr_wkbs)
+
+
+def test_geometry_hashes_parallel(monkeypatch):
+    wkbs = [Point(idx, 0).buffer(1, quad_segs=64).wkb for idx in range(100)]
+    expected = [hashlib.md5(wkb).digest() for wkb in wkbs]
+
+    monkeypatch.setattr(geo_hash, "HASH_THREADS", 2)
+    monkeypatch.setattr(geo_hash, "PARALLEL_HASH_MIN_BYTES", 0)
+    chunk_sizes = []
+    md5_digests = geo_hash._md5_digests
+
+    def _md5_digests(chunk):
+        chunk_sizes.append(len(chunk))
+        return md5_digests(chunk)
+
+    monkeypatch.setattr(geo_hash, "_md5_digests", _md5_digests)
+    assert geometry_hashes(wkbs) == expected
+    assert len(chunk_sizes) > 1
+    assert sum(chunk_sizes) == len(wkbs)
@@ -0,0 +1,123 @@
+"""Tests for the minimal GeoPackage writer."""
+
+import sqlite3
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import Point, Polygon
+
+from gerrydb_meta import gpkg
+
+NAD83_WKT = (
+    'GEOGCS["NAD83",DATUM["North_American_Datum_1983",'
+    'SPHEROID["GRS 1980",6378137,298.257222101]],'
+    'PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433],'
+    'AUTHORITY["EPSG","4269"]]'
+)
+
+COLUMNS = [
+    gpkg.FeatureColumn(name="path", sqlite_type="TEXT"),
+    gpkg.FeatureColumn(name="total pop", sqlite_type="INTEGER"),
+    gpkg.FeatureColumn(name="share", sqlite_type="REAL"),
+    gpkg.FeatureColumn(name="is_urban", sqlite_type="BOOLEAN"),
+]
+
+
+def _feature(path, geom, *attrs):
+    if geom is None:
+        return gpkg.Feature(attrs=(path, *attrs), wkb=None, srs_id=None, envelope=None)
+    minx, miny, maxx, maxy = geom.bounds
+    envelope = None if geom.is_empty else (minx, maxx, miny, maxy)
+    return gpkg.Feature(
+        attrs=(path, *attrs), wkb=geom.wkb, srs_id=4269, envelope=envelope
+    )
+
+
+def _write_layer(path, features, *, geometry_type="GEOMETRY", batch_size=10_000):
+    with sqlite3.connect(path) as conn:
+        gpkg.init_gpkg(conn)
+        gpkg.add_srs(conn, 4269, NAD83_WKT)
+        gpkg.create_feature_table(conn, "layer", COLUMNS)
+        bounds, srs_id, count = gpkg.insert_features(
+            conn, "layer", COLUMNS, features, batch_size=batch_size
+        )
+        gpkg.register_feature_table(
+            conn,
+            "layer",
+            srs_id=srs_id if srs_id is not None else 0,
+            bounds=bounds,
+            geometry_type=geometry_type,
+        )
+    return bounds, srs_id, count
+
+
+def test_gpkg_write_layer(tmp_path):
+    path = tmp_path / "test.gpkg"
+    square = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+    features = [
+        _feature("a", square, 10, 0.5, True),
+        _feature("b", Point(2, 3), 20, 0.25, False),
+    ]
+    bounds, srs_id, count = _write_layer(path, iter(features), batch_size=1)
+
+    assert bounds == (0, 2, 0, 3)
+    assert srs_id == 4269
+    assert count == 2
+
+    gdf = gpd.read_file(path, layer="layer")
+    assert gdf.crs.to_epsg() == 4269
+    assert list(gdf["path"]) == ["a", "b"]
+    assert list(gdf["total pop"]) == [10, 20]
+    assert list(gdf["share"]) == [0.5, 0.25]
+    assert list(gdf["is_urban"]) == [True, False]
+    assert gdf.geometry.iloc[0].equals(square)
+    assert gdf.geometry.iloc[1].equals(Point(2, 3))
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA application_id").fetchone()[0] == (
+            gpkg.GPKG_APPLICATION_ID
+        )
+        assert conn.execute(
+            "SELECT min_x, max_x, min_y, max_y FROM gpkg_contents "
+            "WHERE table_name = 'layer'"
+        ).fetchone() == (0, 2, 0, 3)
+        assert conn.execute("SELECT COUNT(*) FROM rtree_layer_geom").fetchone() == (2,)
+
+
+def test_gpkg_write_layer_spatial_filter(tmp_path):
+    path = tmp_path / "test.gpkg"
+    features = [
+        _feature(str(idx), Point(idx, idx), idx, 0.0, False) for idx in range(10)
+    ]
+    _write_layer(path, features, geometry_type="POINT", batch_size=3)
+
+    gdf = gpd.read_file(path, layer="layer", bbox=(1.5, 1.5, 4.5, 4.5))
+    assert sorted(gdf["path"]) == ["2", "3", "4"]
+
+
+def test_gpkg_write_layer_null_and_empty_geometries(tmp_path):
+    path = tmp_path / "test.gpkg"
+    features = [
+        _feature("null", None, 1, 0.0, False),
+        _feature("empty", Polygon(), 2, 0.0, False),
+    ]
+    bounds, srs_id, count = _write_layer(path, features)
+
+    assert bounds is None
+    assert srs_id == 4269
+    assert count == 2
+
+    gdf = gpd.read_file(path, layer="layer")
+    assert list(gdf["path"]) == ["null", "empty"]
+    assert gdf.geometry.iloc[0] is None
+    assert gdf.geometry.iloc[1].is_empty
+
+
+def test_gpkg_register_unknown_geometry_type(tmp_path):
+    with sqlite3.connect(tmp_path / "test.gpkg") as conn:
+        gpkg.init_gpkg(conn)
+        gpkg.create_feature_table(conn, "layer", COLUMNS)
+        with pytest.raises(ValueError, match="Unknown geometry type"):
+            gpkg.register_feature_table(
+                conn, "layer", srs_id=0, bounds=None, geometry_type="CIRCLE"
+            )
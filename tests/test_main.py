@@ -0,0 +1,103 @@
+"""Tests for the API server's middleware."""
+
+import asyncio
+import gzip
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from starlette.responses import Response, StreamingResponse
+
+from gerrydb_meta.main import ERROR_LOG_MAX_BYTES, log_400_errors
+
+
+def _request() -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+            "headers": [],
+            "server": ("testserver", 80),
+            "scheme": "http",
+        }
+    )
+
+
+class _Body:
+    """Async response body that records how many chunks have been read."""
+
+    def __init__(self, chunks: list[bytes]):
+        self.chunks = chunks
+        self.num_read = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self.num_read == len(self.chunks):
+            raise StopAsyncIteration
+        self.num_read += 1
+        return self.chunks[self.num_read - 1]
+
+
+async def _read(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+def _run_middleware(response):
+    async def call_next(request):
+        return response
+
+    return asyncio.run(log_400_errors(_request(), call_next))
+
+
+def test_log_400_errors_passes_through_success():
+    body = _Body([b"x" * 1024] * 16)
+    response = StreamingResponse(body, status_code=200)
+
+    assert _run_middleware(response) is response
+    assert body.num_read == 0
+
+
+def test_log_400_errors_caps_inspected_bytes():
+    chunk = b"x" * 1024
+    num_chunks = 2 * ERROR_LOG_MAX_BYTES // len(chunk)
+    body = _Body([b'{"detail": "bad request"}', *([chunk] * num_chunks)])
+    response = StreamingResponse(body, status_code=400)
+
+    logged_response = _run_middleware(response)
+    assert logged_response.status_code == 400
+    assert body.num_read <= ERROR_LOG_MAX_BYTES // len(chunk) + 1
+
+    full_body = asyncio.run(_read(logged_response))
+    assert body.num_read == num_chunks + 1
+    assert full_body == b'{"detail": "bad request"}' + chunk * num_chunks
+
+
+def test_log_400_errors_logs_detail(caplog):
+    body = _Body([b'{"detail": ', b'"Namespace not found."}'])
+    response = StreamingResponse(body, status_code=403)
+
+    logged_response = _run_middleware(response)
+    assert asyncio.run(_read(logged_response)) == (
+        b'{"detail": "Namespace not found."}'
+    )
+    assert "Namespace not found." in caplog.text
+
+
+def test_gzip_middleware_passes_through_encoded_responses():
+    compressed = gzip.compress(b"\0" * 10_000)
+    test_app = FastAPI()
+    test_app.add_middleware(GZipMiddleware, compresslevel=1)
+
+    @test_app.get("/encoded")
+    def encoded():
+        return Response(compressed, headers={"Content-Encoding": "gzip"})
+
+    response = TestClient(test_app).get("/encoded", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    # httpx decodes the body once; a second layer of gzip would remain.
+    assert response.content == b"\0" * 10_000
@@ -0,0 +1,71 @@
+"""Tests for render metrics."""
+
+import pytest
+
+from gerrydb_meta import metrics
+from gerrydb_meta.metrics import Histogram, Registry
+
+
+def test_histogram_exposition():
+    histogram = Histogram("test_seconds", "Test histogram.", ("stage",), (1, 0.1))
+    histogram.observe(0.05, stage="a")
+    histogram.observe(0.1, stage="a")
+    histogram.observe(5, stage="a")
+    histogram.observe(0.5, stage='b"\\')
+
+    assert histogram.exposition() == [
+        "# HELP test_seconds Test histogram.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{stage="a",le="0.1"} 2',
+        'test_seconds_bucket{stage="a",le="1.0"} 2',
+        'test_seconds_bucket{stage="a",le="+Inf"} 3',
+        'test_seconds_sum{stage="a"} 5.15',
+        'test_seconds_count{stage="a"} 3',
+        'test_seconds_bucket{stage="b\\"\\\\",le="0.1"} 0',
+        'test_seconds_bucket{stage="b\\"\\\\",le="1.0"} 1',
+        'test_seconds_bucket{stage="b\\"\\\\",le="+Inf"} 1',
+        'test_seconds_sum{stage="b\\"\\\\"} 0.5',
+        'test_seconds_count{stage="b\\"\\\\"} 1',
+    ]
+
+
+def test_registry_exposition():
+    registry = Registry()
+    registry.register(Histogram("first", "First.", (), (1,)))
+    second = registry.register(Histogram("second", "Second.", (), (1,)))
+    second.observe(2)
+
+    assert registry.exposition() == (
+        "# HELP first First.\n"
+        "# TYPE first histogram\n"
+        "# HELP second Second.\n"
+        "# TYPE second histogram\n"
+        'second_bucket{le="1.0"} 0\n'
+        'second_bucket{le="+Inf"} 1\n'
+        "second_sum 2.0\n"
+        "second_count 1\n"
+    )
+
+
+def test_stage_records_render_target_and_rows(monkeypatch):
+    seconds = Histogram("seconds", "", metrics._STAGE_LABELS, (1,))
+    rows = Histogram("rows", "", metrics._STAGE_LABELS, (10,))
+    monkeypatch.setattr(metrics, "RENDER_STAGE_SECONDS", seconds)
+    monkeypatch.setattr(metrics, "RENDER_STAGE_ROWS", rows)
+
+    with metrics.render_target("view", "ns/view"):
+        with metrics.stage("edges") as stage:
+            stage.add_rows(3)
+            stage.add_rows(4)
+        with metrics.stage("context"):
+            pass
+    with pytest.raises(ValueError):
+        with metrics.stage("upload"):
+            raise ValueError
+
+    assert set(seconds._series) == {
+        ("view", "ns/view", "edges"),
+        ("view", "ns/view", "context"),
+        ("", "", "upload"),
+    }
+    assert rows._series == {("view", "ns/view", "edges"): [[1, 0], 7.0, 1]}
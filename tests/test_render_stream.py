@@ -0,0 +1,141 @@
+"""Tests for the streaming view render formats."""
+
+from datetime import date
+from decimal import Decimal
+
+import geopandas as gpd
+import orjson as json
+import pytest
+from shapely.geometry import Point, Polygon
+
+from gerrydb_meta.render import LayerColumn
+from gerrydb_meta.render_stream import (
+    _fgb_chunks,
+    _ndjson_chunks,
+    _parquet_chunks,
+    _SpatialRef,
+)
+
+NAD83_WKT = (
+    'GEOGCS["NAD83",DATUM["North_American_Datum_1983",'
+    'SPHEROID["GRS 1980",6378137,298.257222101]],'
+    'PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433],'
+    'AUTHORITY["EPSG","4269"]]'
+)
+SPATIAL_REF = _SpatialRef(srid=4269, organization="EPSG", definition=NAD83_WKT)
+
+COLUMNS = [
+    LayerColumn(name="path", type_code=25),  # text
+    LayerColumn(name="total_pop", type_code=20),  # int8
+    LayerColumn(name="share", type_code=1700),  # numeric
+    LayerColumn(name="valid_from", type_code=1082),  # date
+    LayerColumn(name="extra", type_code=3802),  # jsonb
+]
+METADATA = {"gerrydb_view_meta": {"path": "test_view"}}
+
+
+def _row(path, geom, *attrs):
+    bounds = (None,) * 4 if geom.is_empty else geom.bounds
+    min_x, min_y, max_x, max_y = bounds
+    return (geom.wkb, 4269, min_x, max_x, min_y, max_y, path, *attrs)
+
+
+def _batches():
+    """Rows from `stream_layer()`, in two batches."""
+    return iter(
+        [
+            [
+                _row(
+                    str(idx),
+                    Point(idx, idx),
+                    idx,
+                    Decimal("0.5"),
+                    date(2020, 1, 1),
+                    {"idx": idx},
+                )
+                for idx in range(3)
+            ],
+            [_row("empty", Polygon(), None, None, None, None)],
+        ]
+    )
+
+
+def test_ndjson_chunks():
+    chunks = list(_ndjson_chunks(COLUMNS, METADATA, SPATIAL_REF, _batches()))
+    assert len(chunks) == 3  # header + one chunk per batch
+
+    header, *features = [
+        json.loads(line) for line in b"".join(chunks).decode("utf-8").splitlines()
+    ]
+    assert header["type"] == "FeatureCollection"
+    assert header["crs"]["properties"]["name"] == "urn:ogc:def:crs:EPSG::4269"
+    assert header["gerrydb_view_meta"] == {"path": "test_view"}
+
+    assert len(features) == 4
+    assert features[1] == {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [1.0, 1.0]},
+        "properties": {
+            "path": "1",
+            "total_pop": 1,
+            "share": 0.5,
+            "valid_from": "2020-01-01",
+            "extra": {"idx": 1},
+        },
+    }
+    assert features[3]["geometry"] is None
+
+
+def test_fgb_chunks(tmp_path):
+    chunks = list(
+        _fgb_chunks(
+            "test_view",
+            COLUMNS,
+            {"total_pop": "Total population"},
+            METADATA,
+            SPATIAL_REF,
+            _batches(),
+        )
+    )
+    assert len(chunks) == 3  # header + one chunk per batch
+
+    path = tmp_path / "test_view.fgb"
+    path.write_bytes(b"".join(chunks))
+    gdf = gpd.read_file(path)
+    assert gdf.crs.to_epsg() == 4269
+    assert list(gdf["path"]) == ["0", "1", "2", "empty"]
+    assert list(gdf["total_pop"][:3]) == [0, 1, 2]
+    assert list(gdf["share"][:3]) == [0.5, 0.5, 0.5]
+    assert gdf.geometry.iloc[1].equals(Point(1, 1))
+    assert gdf.geometry.iloc[3] is None
+    assert b'"gerrydb_view_meta":{"path":"test_view"}' in chunks[0]
+
+
+def test_parquet_chunks(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    pytest.importorskip("pyproj")
+
+    chunks = list(
+        _parquet_chunks(
+            COLUMNS,
+            {"total_pop": "Total population"},
+            METADATA,
+            SPATIAL_REF,
+            _batches(),
+        )
+    )
+    # One chunk per row group, then the footer.
+    assert len(chunks) == 3
+
+    path = tmp_path / "test_view.parquet"
+    path.write_bytes(b"".join(chunks))
+    assert pq.ParquetFile(path).num_row_groups == 2
+    assert json.loads(pq.read_schema(path).metadata[b"gerrydb"]) == METADATA
+
+    gdf = gpd.read_parquet(path)
+    assert gdf.crs.to_epsg() == 4269
+    assert list(gdf["path"]) == ["0", "1", "2", "empty"]
+    assert list(gdf["share"][:3]) == [0.5, 0.5, 0.5]
+    assert gdf["extra"][0] == '{"idx":0}'
+    assert gdf.geometry.iloc[1].equals(Point(1, 1))
+    assert gdf.geometry.iloc[3].is_empty
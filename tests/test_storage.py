@@ -0,0 +1,220 @@
+"""Tests for render artifact storage."""
+
+import gzip
+import os
+import uuid
+from pathlib import Path
+
+from gerrydb_meta.api.render import render_artifact_response
+from gerrydb_meta.storage import (
+    LocalRenderStore,
+    LocalTileStore,
+    base_layer_store,
+    is_gcs_uri,
+    negotiate_encodings,
+    tile_store,
+)
+
+
+def _make_render(tmp_path, name: str, size: int):
+    render_dir = tmp_path / f"render-{name}"
+    render_dir.mkdir()
+    gpkg_path = render_dir / f"{name}.gpkg"
+    gpkg_path.write_bytes(b"\0" * size)
+    return gpkg_path
+
+
+def test_is_gcs_uri():
+    assert is_gcs_uri("gs://bucket/abc.gpkg.gz")
+    assert not is_gcs_uri("/tmp/tmpabc/abc.gpkg")
+    assert not is_gcs_uri(None)
+
+
+def test_local_render_store_put(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=1000)
+    render_id = uuid.uuid4()
+    gpkg_path = _make_render(tmp_path, "a", 100)
+
+    path = store.put(gpkg_path, render_id=render_id, kind="view")
+
+    assert store.contains(path)
+    assert store.local_path(path).read_bytes() == b"\0" * 100
+    assert render_id.hex in path
+    # The render is moved into the store, and its scratch directory is removed.
+    assert not gpkg_path.parent.exists()
+    assert store.size() == 100
+    assert path == store.path_for(render_id=render_id, kind="view")
+
+
+def test_local_render_store_rejects_foreign_paths(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=1000)
+    outside = _make_render(tmp_path, "outside", 10)
+
+    assert not store.contains(str(outside))
+    assert not store.contains(str(tmp_path / "store" / ".." / "render-outside"))
+    assert not store.contains("gs://bucket/abc.gpkg.gz")
+    assert store.local_path(str(outside)) is None
+
+
+def test_local_render_store_evicts_least_recently_used(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=250)
+    paths = {}
+    for idx, name in enumerate("ab"):
+        paths[name] = store.put(
+            _make_render(tmp_path, name, 100), render_id=uuid.uuid4(), kind="view"
+        )
+        # Backdate renders regardless of filesystem timestamp resolution.
+        os.utime(paths[name], (idx, idx))
+
+    # Serving `a` makes `b` the least recently used render.
+    store.local_path(paths["a"])
+    paths["c"] = store.put(
+        _make_render(tmp_path, "c", 100), render_id=uuid.uuid4(), kind="view"
+    )
+
+    assert store.contains(paths["a"])
+    assert not store.contains(paths["b"])
+    assert store.contains(paths["c"])
+    assert store.size() == 200
+
+
+def test_local_render_store_keeps_newest_render_over_budget(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=50)
+    old_path = store.put(
+        _make_render(tmp_path, "old", 40), render_id=uuid.uuid4(), kind="graph"
+    )
+    os.utime(old_path, (0, 0))
+    new_path = store.put(
+        _make_render(tmp_path, "new", 100), render_id=uuid.uuid4(), kind="graph"
+    )
+
+    assert not store.contains(old_path)
+    assert store.contains(new_path)
+
+
+def test_negotiate_encodings():
+    encodings = ("gzip", "zstd")
+    assert negotiate_encodings(None, encodings) == []
+    assert negotiate_encodings("gzip", encodings) == ["gzip"]
+    assert negotiate_encodings("gzip, deflate, br, zstd", encodings) == [
+        "zstd",
+        "gzip",
+    ]
+    assert negotiate_encodings("gzip;q=0, zstd;q=0.5", encodings) == ["zstd"]
+    assert negotiate_encodings("*", encodings) == ["zstd", "gzip"]
+    assert negotiate_encodings("*, zstd;q=0", encodings) == ["gzip"]
+    assert negotiate_encodings("zstd", ("gzip",)) == []
+    assert negotiate_encodings("identity", encodings) == []
+
+
+def test_local_render_store_precompresses(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=10_000, encodings=("gzip",))
+    path = store.put(
+        _make_render(tmp_path, "a", 1000), render_id=uuid.uuid4(), kind="view"
+    )
+
+    gzip_path = store.encoded_path(path, "gzip")
+    assert gzip_path is not None
+    assert gzip.decompress(gzip_path.read_bytes()) == b"\0" * 1000
+    assert store.encoded_path(path, "zstd") is None
+    assert store.size() == 1000 + gzip_path.stat().st_size
+
+
+def test_local_render_store_evicts_precompressed_copies(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=1500, encodings=("gzip",))
+    old_path = store.put(
+        _make_render(tmp_path, "old", 1000), render_id=uuid.uuid4(), kind="view"
+    )
+    os.utime(old_path, (0, 0))
+    new_path = store.put(
+        _make_render(tmp_path, "new", 1000), render_id=uuid.uuid4(), kind="view"
+    )
+
+    assert not store.contains(old_path)
+    assert not Path(old_path + ".gz").exists()
+    assert store.encoded_path(new_path, "gzip") is not None
+
+
+def test_render_artifact_response_encoding(tmp_path):
+    store = LocalRenderStore(tmp_path / "store", max_bytes=10_000, encodings=("gzip",))
+    path = store.put(
+        _make_render(tmp_path, "a", 1000), render_id=uuid.uuid4(), kind="view"
+    )
+
+    response = render_artifact_response(
+        store, path, headers={"ETag": "abc"}, accept_encoding="gzip, deflate"
+    )
+    assert response.path == store.encoded_path(path, "gzip")
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == "abc"
+
+    response = render_artifact_response(
+        store, path, headers={"ETag": "abc"}, accept_encoding=None
+    )
+    assert response.path == Path(path)
+    assert "Content-Encoding" not in response.headers
+
+
+def test_base_layer_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERRYDB_BASE_LAYER_CACHE_DIR", str(tmp_path / "base"))
+    monkeypatch.setenv("GERRYDB_BASE_LAYER_CACHE_BYTES", "1000")
+    base_layer_store.cache_clear()
+    try:
+        store = base_layer_store()
+        assert store.root == (tmp_path / "base").resolve()
+        assert store.max_bytes == 1000
+        # Base layers are intermediate files, so they are never precompressed.
+        assert store.encodings == ()
+
+        monkeypatch.setenv("GERRYDB_BASE_LAYER_CACHE_BYTES", "0")
+        base_layer_store.cache_clear()
+        assert base_layer_store() is None
+    finally:
+        base_layer_store.cache_clear()
+
+
+def test_local_tile_store_put_and_get(tmp_path):
+    store = LocalTileStore(tmp_path / "tiles", max_bytes=1000)
+    key = uuid.uuid4().hex
+
+    assert store.get(key) is None
+    store.put(key, b"tile")
+    assert store.get(key) == b"tile"
+    assert store.size() == 4
+    assert not list((tmp_path / "tiles").glob("*/*.partial"))
+
+
+def test_local_tile_store_evicts_least_recently_used(tmp_path):
+    store = LocalTileStore(tmp_path / "tiles", max_bytes=250)
+    keys = {name: uuid.uuid4().hex for name in "abc"}
+    for idx, name in enumerate("ab"):
+        store.put(keys[name], b"\0" * 100)
+        # Backdate tiles regardless of filesystem timestamp resolution.
+        path = store._path(keys[name])
+        os.utime(path, (idx, idx))
+
+    # Serving `a` makes `b` the least recently used tile.
+    assert store.get(keys["a"]) is not None
+    store.put(keys["c"], b"\0" * 100)
+
+    assert store.get(keys["a"]) is not None
+    assert store.get(keys["b"]) is None
+    assert store.get(keys["c"]) is not None
+    assert store.size() == 200
+
+
+def test_tile_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("GERRYDB_TILE_CACHE_DIR", str(tmp_path / "tiles"))
+    monkeypatch.setenv("GERRYDB_TILE_CACHE_BYTES", "1000")
+    tile_store.cache_clear()
+    try:
+        store = tile_store()
+        assert store.root == (tmp_path / "tiles").resolve()
+        assert store.max_bytes == 1000
+
+        monkeypatch.setenv("GERRYDB_TILE_CACHE_BYTES", "0")
+        tile_store.cache_clear()
+        assert tile_store() is None
+    finally:
+        tile_store.cache_clear()
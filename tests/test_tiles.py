@@ -0,0 +1,106 @@
+"""Tests for vector tiles of views and geographic layers."""
+
+import pytest
+from sqlalchemy import func, select
+
+from gerrydb_meta import crud, models
+from gerrydb_meta.storage import LocalTileStore
+from gerrydb_meta.tiles import TileError, _search_area, get_tile
+from tests.test_render import _me_bench_view
+
+
+@pytest.mark.parametrize(
+    "z, x, y",
+    [(-1, 0, 0), (23, 0, 0), (2, 4, 0), (2, 0, -1)],
+)
+def test_get_tile_rejects_invalid_coordinates(z, x, y):
+    with pytest.raises(TileError):
+        get_tile(
+            None,
+            select(models.Geography.path),
+            layer_name="layer",
+            source="test",
+            z=z,
+            x=x,
+            y=y,
+        )
+
+
+def test_get_view_tile(db, me_2010_gdf, tmp_path, monkeypatch):
+    view, render_ctx = _me_bench_view(db, me_2010_gdf)
+    store = LocalTileStore(tmp_path / "tiles", max_bytes=10**6)
+    features = crud.view.tile_features(db=db, view=view, columns=render_ctx.columns)
+
+    # Maine is (mostly) in tile (4, 4, 5).
+    tile = get_tile(
+        db, features, layer_name="counties", source="me", z=4, x=4, y=5, store=store
+    )
+    assert b"counties" in tile.data
+    assert b"aland" in tile.data
+    assert store.get(tile.key) == tile.data
+
+    # Repeat requests are served from the cache, without querying features.
+    def build(*args, **kwargs):
+        raise AssertionError("Tile should be cached.")
+
+    monkeypatch.setattr("gerrydb_meta.tiles._build", build)
+    monkeypatch.setattr("gerrydb_meta.tiles._in_tile", build)
+    assert (
+        get_tile(
+            db,
+            features,
+            layer_name="counties",
+            source="me",
+            z=4,
+            x=4,
+            y=5,
+            store=store,
+        )
+        == tile
+    )
+    monkeypatch.undo()
+
+    # Tiles away from Maine are empty.
+    empty = get_tile(
+        db, features, layer_name="counties", source="me", z=4, x=0, y=0, store=store
+    )
+    assert empty.data == b""
+    assert empty.key != tile.key
+
+
+@pytest.mark.parametrize("z, x, y", [(0, 0, 0), (1, 0, 0)])
+def test_get_view_tile_low_zoom(db, me_2010_gdf, z, x, y):
+    view, render_ctx = _me_bench_view(db, me_2010_gdf)
+    features = crud.view.tile_features(db=db, view=view, columns=render_ctx.columns)
+
+    tile = get_tile(db, features, layer_name="counties", source="me", z=z, x=x, y=y)
+    assert b"counties" in tile.data
+    assert b"aland" in tile.data
+
+
+@pytest.mark.parametrize(
+    "z, x, y, inside, outside",
+    [
+        # Western and eastern edge tiles (padding must not cross the antimeridian).
+        (3, 0, 3, (-170, 10), (170, 10)),
+        (3, 7, 3, (170, 10), (-170, 10)),
+        (10, 0, 511, (-179.9, 0.1), (179.9, 0.1)),
+        (10, 1023, 511, (179.9, 0.1), (-179.9, 0.1)),
+        # Points near the middle of a tile's bottom edge (edges follow parallels).
+        (2, 1, 0, (-45, 67), (-45, 60)),
+    ],
+)
+def test_search_area_edge_tiles(db, z, x, y, inside, outside):
+    search_area = _search_area(z, x, y)
+
+    def covers(lon, lat):
+        point = func.geography(func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4269))
+        return db.execute(select(func.ST_Covers(search_area, point))).scalar()
+
+    assert covers(*inside)
+    assert not covers(*outside)
+
+
+@pytest.mark.parametrize("z", [0, 1])
+def test_search_area_skipped_for_wide_tiles(z):
+    assert _search_area(z, 0, 0) is None